@@ -0,0 +1,85 @@
+"""
+Measure the cold start of a short-lived script: the import time of
+`pygocron.pygocron`(by `python -X importtime`) and the latency of constructing a
+client and making its first call against a fake gocron server.
+
+    $ python benchmarks/bench_import.py --runs 10 --max-import-ms 80
+
+Exits with status 1 when the median import time exceeds `--max-import-ms`,
+so it can run as a regression check.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from pygocron.testing import FakeGocronServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_CALL = """
+import sys, time
+start = time.perf_counter()
+from pygocron.pygocron import PyGoCron
+pgc = PyGoCron(sys.argv[1], sys.argv[2], sys.argv[3])
+constructed = time.perf_counter()
+pgc.get_nodes()
+print(constructed - start, time.perf_counter() - constructed)
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def import_time_ms(module: str = "pygocron.pygocron") -> float:
+    """
+    Cumulative import time of `module` in a fresh interpreter
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(), stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} not found in the importtime output")
+
+
+def first_call_ms(server: FakeGocronServer) -> tuple:
+    """
+    (import + construct, first call) latency in a fresh interpreter
+    """
+    stdout = subprocess.run(
+        [sys.executable, "-c", FIRST_CALL, server.address, server.username, server.password],
+        env=_env(), stdout=subprocess.PIPE, universal_newlines=True, check=True,
+    ).stdout
+    construct, call = map(float, stdout.split())
+    return construct * 1000, call * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    imports = [import_time_ms() for _ in range(args.runs)]
+    with FakeGocronServer() as server:
+        first_calls = [first_call_ms(server) for _ in range(args.runs)]
+
+    import_ms = statistics.median(imports)
+    print(f"import pygocron.pygocron:  {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"import + construct:        {statistics.median(c for c, _ in first_calls):8.1f} ms")
+    print(f"first call (login + call): {statistics.median(c for _, c in first_calls):8.1f} ms")
+    if import_ms > args.max_import_ms:
+        print(f"FAIL: import time is over {args.max_import_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
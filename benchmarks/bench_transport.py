@@ -0,0 +1,50 @@
+"""
+Compare calls per second of one-connection-per-call `requests.get` against
+the pooled keep-alive transport used by `PyGoCron`.
+
+    $ python benchmarks/bench_transport.py --calls 2000
+"""
+import argparse
+import time
+from urllib.parse import urljoin
+
+import requests
+
+from pygocron.pygocron import PyGoCron
+from pygocron.testing import FakeGocronServer
+
+
+def bench_unpooled(pgc: PyGoCron, calls: int) -> float:
+    url = urljoin(pgc._base_url, "api/task")
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.get(url, headers=pgc._headers, params={"page_size": 50, "page": 1})
+    return calls / (time.perf_counter() - start)
+
+
+def bench_pooled(pgc: PyGoCron, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        pgc.get_tasks()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+
+    with FakeGocronServer() as server:
+        with PyGoCron(server.address, server.username, server.password) as pgc:
+            after = bench_pooled(pgc, args.calls)
+            pooled_connections = server.state.connections
+            before = bench_unpooled(pgc, args.calls)
+            connections = server.state.connections - pooled_connections
+
+    print(f"before (requests.get):   {before:8.1f} calls/s, {connections} connections")
+    print(f"after  (pooled session): {after:8.1f} calls/s, {pooled_connections} connections")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
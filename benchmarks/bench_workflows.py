@@ -0,0 +1,156 @@
+"""
+Throughput of the common client workflows against the in-process fake gocron
+server: bulk create, run-and-wait, listing and bulk delete.
+
+    $ python benchmarks/bench_workflows.py --tasks 500 --latency 0.002 --output result.json
+    $ python benchmarks/bench_workflows.py --baseline result.json --tolerance 0.2
+
+Results are written as JSON. With `--baseline`, exits with status 1 when the
+ops/s of a workflow drops more than `--tolerance` below the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from pygocron.governor import Governor
+from pygocron.pygocron import PyGoCron
+from pygocron.testing import FakeGocronServer
+from pygocron.tracker import RunTracker
+
+TAG = "bench"
+
+
+def _measure(server: FakeGocronServer, operations: int, fn) -> dict:
+    requests = server.state.requests
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    return {
+        "operations": operations,
+        "seconds": round(seconds, 4),
+        "ops_per_sec": round(operations / seconds, 2),
+        "requests": server.state.requests - requests,
+    }
+
+
+def bench_create(pgc: PyGoCron, server: FakeGocronServer, args) -> dict:
+    specs = [
+        {"name": f"bench-{i}", "spec": "0 0 0 * * *", "command": f"echo {i}", "tag": TAG}
+        for i in range(args.tasks)
+    ]
+
+    def create():
+        failed = [r for r in pgc.create_tasks(specs, max_workers=_workers(args)) if r.error]
+        assert not failed, failed[:3]
+
+    return _measure(server, args.tasks, create)
+
+
+def bench_run_and_wait(pgc: PyGoCron, server: FakeGocronServer, args) -> dict:
+    task_ids = [task["id"] for task in pgc.iter_tasks(tag=TAG)][:args.runs]
+
+    def run_and_wait():
+        tracker = RunTracker(pgc, ((task_id, pgc.run_task(task_id)) for task_id in task_ids))
+        for _ in tracker.watch(interval=0.05, timeout=60):
+            pass
+
+    return _measure(server, len(task_ids), run_and_wait)
+
+
+def bench_listing(pgc: PyGoCron, server: FakeGocronServer, args) -> dict:
+    def listing():
+        for _ in range(args.listings):
+            assert sum(1 for _ in pgc.iter_tasks(tag=TAG)) == args.tasks
+
+    return _measure(server, args.tasks * args.listings, listing)
+
+
+def bench_bulk_delete(pgc: PyGoCron, server: FakeGocronServer, args) -> dict:
+    def bulk_delete():
+        summary = pgc.delete_tasks(max_workers=_workers(args), tag=TAG)
+        assert not summary.failed and len(summary.succeeded) == args.tasks
+
+    return _measure(server, args.tasks, bulk_delete)
+
+
+WORKFLOWS = {
+    "create": bench_create,
+    "run_and_wait": bench_run_and_wait,
+    "listing": bench_listing,
+    "bulk_delete": bench_bulk_delete,
+}
+
+
+def _workers(args):
+    return None if args.governor else args.workers  # a governor picks the concurrency itself
+
+
+def run(args) -> dict:
+    server = FakeGocronServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        visibility_delay=args.visibility_delay,
+        result_size=args.result_size,
+        capacity=args.capacity,
+    )
+    results = {}
+    with server:
+        governor = Governor() if args.governor else None
+        with PyGoCron(server.address, server.username, server.password, pool_size=args.workers, governor=governor) as pgc:
+            pgc.get_nodes()  # log in before measuring
+            for name, bench in WORKFLOWS.items():  # in order, every workflow uses the tasks of `create`
+                results[name] = bench(pgc, server, args)
+    return {
+        "python": platform.python_version(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "tolerance")},
+        "results": results,
+    }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> list:
+    slow = []
+    for name, result in report["results"].items():
+        before = baseline["results"].get(name)
+        if before and result["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance):
+            slow.append(f"{name}: {result['ops_per_sec']} ops/s, baseline {before['ops_per_sec']} ops/s")
+    return slow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200, help="number of tasks created, listed and deleted")
+    parser.add_argument("--runs", type=int, default=20, help="number of tasks run and waited for")
+    parser.add_argument("--listings", type=int, default=5, help="number of full listings")
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.001, help="server latency(seconds) per request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--visibility-delay", type=float, default=0.0)
+    parser.add_argument("--result-size", type=int, default=256)
+    parser.add_argument("--capacity", type=int, default=0, help="requests the server handles at once, the others get a 503")
+    parser.add_argument("--governor", action="store_true", help="let a `Governor` pick the concurrency instead of --workers")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="a previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slow = regressions(report, json.load(f), args.tolerance)
+        for line in slow:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""`python -m pygocron`, same as the `pygocron` command."""
+import sys
+
+from pygocron.cli import main
+
+sys.exit(main())
@@ -0,0 +1,439 @@
+"""
+Request building and response parsing of the gocron web api, shared by the
+sync(`PyGoCron`) and the async(`AsyncPyGoCron`) clients.
+"""
+import json
+import re
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+SUCCESS = "操作成功"
+SAVED = "保存成功"
+TRIGGERED = "任务已开始运行, 请到任务日志中查看结果"
+CONNECTED = "连接成功"
+AUTH_FAILED = "认证失败"
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+LOGIN_PATH = "/api/user/login"
+LIST_PAGE_SIZE = 200  # page size used when the client walks through a whole listing
+REJECTED_STATUS = (429, 503)  # the server refused the request without handling it
+RETRY_STATUS = (502, 503, 504)  # an idempotent request failing with these is sent again
+
+# gocron replies `{"code": 0, "message": "...", "data": ...}`, the message can be read without decoding `data`
+_MESSAGE = re.compile(rb'\s*\{\s*"code"\s*:\s*-?\d+\s*,\s*"message"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+_loads = None
+
+
+def loads(body: Union[bytes, str]):
+    """
+    Decode json by `orjson` when it is installed(several times faster on big listings), else by `json`
+    """
+    global _loads
+    if _loads is None:  # resolved on the first response, importing orjson is slow
+        try:
+            from orjson import loads as _loads
+        except ImportError:
+            _loads = json.loads
+    return _loads(body)
+
+
+class RunStatus(Enum):
+    FAILED: int = 0
+    RUNNING: int = 1
+    SUCCESS: int = 2
+    CANCELLED: int = 3  # final, gocron skipped the run because the single instance task was still running
+    PENDING: int = 3  # former name of `CANCELLED`, kept as an alias
+
+
+UNFINISHED = (RunStatus.RUNNING,)  # a run in these states will still change, all the others are final
+
+
+class PyGocronException(Exception):
+    pass
+
+
+class PyGocronTimeout(PyGocronException):
+    pass
+
+
+class TaskResult(NamedTuple):
+    """
+    Result of one task in a bulk operation, `error` is `None` on success
+    """
+
+    name: str
+    task_id: Optional[int] = None
+    error: Optional[Exception] = None
+
+
+class BulkSummary(NamedTuple):
+    """
+    Outcome of a selector based bulk operation
+
+    succeeded: ids of the tasks done successfully
+    failed: `{task_id: error}` of the tasks that failed
+    """
+
+    succeeded: List[int]
+    failed: Dict[int, Exception]
+
+
+class Call(NamedTuple):
+    """
+    One http call to the gocron web api
+
+    method: http method, `GET` or `POST`
+    path: api path
+    params: query params
+    form: send as a form(`application/x-www-form-urlencoded`) request
+    ok_message: the `message` gocron replies on success
+    error: error message prefix when the call fails
+    timeout: seconds for this call, instead of the timeout of the client
+    idempotent: `False` for a `GET` with side effects(triggering a run), it is never sent twice nor shared with identical calls
+    retries: max retries of this call, instead of the `max_retries` of the client
+    """
+
+    method: str
+    path: str
+    params: Optional[dict] = None
+    form: bool = False
+    ok_message: str = SUCCESS
+    error: str = "Request error"
+    timeout: Optional[float] = None
+    idempotent: bool = True
+    retries: Optional[int] = None
+
+
+def is_retryable(call: Call) -> bool:
+    """
+    An idempotent `GET`, safe to send again after a connection error or a 502/503/504,
+    or to share with identical concurrent calls
+    """
+    return call.method == "GET" and call.idempotent
+
+
+def check_credentials(address: str, username: str, password: str):
+    if address == "" or username == "" or password == "":
+        raise ValueError(
+            "If you don't explicitly give PyGoCron` enough parameters("
+            "`gocron_address`, `gocron_admin_user`, `gocron_admin_password`),"
+            "then make sure set all of following enviroment varibles:`GOCRON_ADDRESS`,"
+            "`GOCRON_ADMIN_USER`, `GOCRON_ADMIN_PASSWORD`"
+        )
+
+
+def request_headers(call: Call, auth_headers: Optional[dict]) -> dict:
+    headers = dict(auth_headers) if auth_headers else {}
+    if call.form:
+        headers["Content-Type"] = FORM_CONTENT_TYPE
+    return headers
+
+
+def parse(call: Call, status_code: int, body: Union[bytes, str]):
+    """
+    Parse a gocron response body(bytes are decoded by the json parser directly), return its `data` or raise `PyGocronException`
+    """
+    if status_code == 200:
+        data = loads(body)
+        if data["message"] == call.ok_message:
+            return data["data"]
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    raise PyGocronException(f"{call.error}, details: {body}")
+
+
+def message(body: Union[bytes, str]) -> Optional[str]:
+    """
+    The gocron `message` of a response body, `None` if the body is not a gocron reply
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    match = _MESSAGE.match(body)
+    try:
+        return json.loads(match.group(1)) if match else loads(body)["message"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def is_auth_error(status_code: int, body: Union[bytes, str]) -> bool:
+    """
+    The request was rejected because the `Auth-Token` is missing, invalid or expired
+    """
+    if status_code == 401:
+        return True
+    return status_code == 200 and message(body) == AUTH_FAILED
+
+
+def is_overloaded(status_code: int) -> bool:
+    """
+    The response means the server is overloaded and the client should slow down
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def response_error(call: Call, status_code: int, body: Union[bytes, str]) -> Optional[str]:
+    """
+    `None` for a successful response, else the gocron `message`, or `HTTP <status>` for a non 200 response
+    """
+    if status_code != 200:
+        return f"HTTP {status_code}"
+    reply = message(body)
+    if reply is None:
+        return "Invalid response"
+    return None if reply == call.ok_message else reply
+
+
+def login(username: str, password: str) -> Call:
+    return Call(
+        "POST",
+        LOGIN_PATH,
+        {"username": username, "password": password},
+        error="Authentication error",
+    )
+
+
+def task_payload(
+    name: str,
+    spec: str,
+    command: str,
+    tag: str = "",
+    level: int = 1,
+    dependency_status: int = 1,
+    dependency_task_id: str = "",
+    protocol: int = 2,
+    http_method: int = 1,
+    host_id: int = 1,
+    timeout: int = 0,
+    multi: int = 2,
+    notify_status: int = 1,
+    notify_type: int = 2,
+    notify_keyword: str = "",
+    notify_receiver_id: str = "",
+    retry_times: int = 0,
+    retry_interval: int = 0,
+    remark: str = "",
+    task_id="",
+) -> dict:
+    """
+    Build the `/api/task/store` payload, see `PyGoCron.create_task` for the params,
+    raise `ValueError` when the `spec` is not a valid cron spec
+    """
+    if spec:
+        from pygocron.cronspec import CronSpec
+
+        try:
+            CronSpec.parse(spec)
+        except ValueError as e:
+            raise ValueError(f"Invalid spec of task `{name}`: {e}") from None
+    return {
+        "id": task_id,
+        "name": name,
+        "spec": spec,
+        "command": command,
+        "tag": tag,
+        "level": level,
+        "dependency_status": dependency_status,
+        "dependency_task_id": dependency_task_id,
+        "protocol": protocol,
+        "http_method": http_method,
+        "host_id": host_id,
+        "timeout": timeout,
+        "multi": multi,
+        "notify_status": notify_status,
+        "notify_type": notify_type,
+        "notify_keyword": notify_keyword,
+        "notify_receiver_id": notify_receiver_id,
+        "retry_times": retry_times,
+        "retry_interval": retry_interval,
+        "remark": remark,
+    }
+
+
+def store_task(payload: dict) -> Call:
+    return Call(
+        "POST",
+        "/api/task/store",
+        payload,
+        form=True,
+        ok_message=SAVED,
+        error=f"Create task:`{payload['name']}` error",
+    )
+
+
+def run_task(task_id) -> Call:
+    return Call(
+        "GET", f"api/task/run/{task_id}", ok_message=TRIGGERED, error="Canot trigger task", idempotent=False
+    )
+
+
+def list_tasks(
+    page=1,
+    page_size=50,
+    task_id: int = None,
+    protocol: int = None,
+    name: str = None,
+    tag: str = None,
+    host_id: int = None,
+    status: int = None,
+) -> Call:
+    payload = {
+        "page_size": page_size,
+        "page": page,
+        "id": task_id,
+        "protocol": protocol,
+        "name": name,
+        "tag": tag,
+        "host_id": host_id,
+        "status": status,
+    }
+    return Call("GET", "api/task", payload, error="Can not fetch task list")
+
+
+def list_task_logs(
+    task_id: int = None,
+    page: int = 1,
+    page_size: int = 20,
+    protocol: int = None,
+    status: Union[int, RunStatus] = None,
+) -> Call:
+    if isinstance(status, RunStatus):  # the query status is the record status plus one
+        status = status.value + 1
+    payload = {
+        "task_id": task_id,
+        "page": page,
+        "page_size": page_size,
+        "protocol": protocol,
+        "status": status,
+    }
+    return Call("GET", "api/task/log", payload, error="Can not fetch task log")
+
+
+def disable_task(task_id) -> Call:
+    return Call("POST", f"api/task/disable/{task_id}", error="Can not disable task")
+
+
+def enable_task(task_id) -> Call:
+    return Call("POST", f"api/task/enable/{task_id}", error="Can not enable task")
+
+
+def remove_task(task_id) -> Call:
+    # Gocron will not report an error even tge task id is not existed
+    return Call("POST", f"api/task/remove/{task_id}", error="Can not delete the task")
+
+
+def list_nodes() -> Call:
+    return Call("GET", "api/host/all", error="Can not fetch all nodes(hosts)")
+
+
+def store_node(ip: str, port: int, alias: str, remark: str) -> Call:
+    payload = {
+        "id": "",
+        "name": ip,
+        "port": port,
+        "alias": alias,
+        "remark": remark,
+    }
+    return Call(
+        "POST", "api/host/store", payload, form=True, ok_message=SAVED, error="Can not add node"
+    )
+
+
+def ping_node(node_id, timeout: float = None) -> Call:
+    return Call(
+        "GET",
+        f"api/host/ping/{node_id}",
+        ok_message=CONNECTED,
+        error="Can not connect to node",
+        timeout=timeout,
+        retries=None if timeout is None else 0,  # a retried ping would wait several times `timeout`
+    )
+
+
+def first_task_id(data: dict, name: str) -> int:
+    """
+    Pick the task id out of a `get_tasks(name=name)` result
+    """
+    for record in data["data"]:
+        if record["name"] == name:
+            return record["id"]
+    raise PyGocronException(f"Task Name `{name}` Not Found")
+
+
+def group_names_by_tag(specs: Iterable[dict]) -> Dict[str, Set[str]]:
+    """
+    Group task names of `create_task` specs by tag, tasks sharing a tag can be found by one listing
+    """
+    names_by_tag = {}
+    for spec in specs:
+        names_by_tag.setdefault(spec.get("tag", ""), set()).add(spec["name"])
+    return names_by_tag
+
+
+def match_task_ids(data: dict, names: Set[str]) -> Dict[str, int]:
+    """
+    Pick `{name: id}` of the wanted task names out of a `get_tasks` result
+    """
+    return {
+        record["name"]: record["id"] for record in data["data"] if record["name"] in names
+    }
+
+
+def has_wildcard(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def is_last_page(data: dict, page: int, page_size: int) -> bool:
+    return page * page_size >= data["total"] or len(data["data"]) < page_size
+
+
+def task_results(specs: List[dict], stored: List[Tuple], task_ids: Dict[str, int]) -> List[TaskResult]:
+    """
+    Merge the `/api/task/store` outcomes and the resolved task ids into input ordered `TaskResult`s
+    """
+    results = []
+    for spec, (_, error) in zip(specs, stored):
+        name = spec.get("name")
+        if error is None and name not in task_ids:
+            error = PyGocronException(f"Task Name `{name}` Not Found")
+        results.append(TaskResult(name, task_ids.get(name) if error is None else None, error))
+    return results
+
+
+def run_status(status: int) -> RunStatus:
+    """
+    Map the `status` field of a task log record to a `RunStatus`
+    """
+    try:
+        return RunStatus(status)
+    except ValueError:
+        raise ValueError(f"Wrong status number: {status}")
+
+
+def find_run_status(logs: dict, run_id: int) -> Optional[RunStatus]:
+    """
+    Find the status of run `run_id` in a `get_task_logs` result
+    """
+    for record in logs["data"]:  # 有序的， 按开始时间倒序
+        if record["id"] == run_id:
+            return run_status(record["status"])
+    return None
+
+
+def find_task_id(data: dict, name: str) -> Optional[int]:
+    """
+    Like `first_task_id`, but return `None` when the task is not found
+    """
+    return match_task_ids(data, {name}).get(name)
+
+
+def latest_run_id(logs: dict, after_id: int = None) -> Optional[int]:
+    """
+    Return the most recent run id in a `get_task_logs` result, `None` if there is no run newer than `after_id`
+    """
+    logs_data = logs["data"]
+    if logs_data and (after_id is None or logs_data[0]["id"] > after_id):
+        return logs_data[0]["id"]
+    return None
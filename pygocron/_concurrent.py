@@ -0,0 +1,118 @@
+"""
+Concurrency helpers: bounded concurrency for the bulk apis, and coalescing of identical calls.
+
+`concurrent.futures` and `asyncio` are imported inside the helpers, they are slow
+to import and most short-lived scripts never need them.
+"""
+import threading
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Tuple
+
+
+def map_settled(fn: Callable, items: Iterable, max_workers: int = 10) -> List[Tuple]:
+    """
+    Run `fn` on every item with at most `max_workers` threads, return a
+    `(result, error)` pair for each item in input order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def settle(item):
+        try:
+            return fn(item), None
+        except Exception as e:
+            return None, e
+
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(settle, items))
+
+
+def imap_settled(fn: Callable, items: Iterable, max_workers: int = 10) -> Iterator[Tuple]:
+    """
+    Like `map_settled`, but stream: `items` are consumed lazily and at most `2 * max_workers`
+    are in flight, yield an `(item, result, error)` triple for each item in completion order
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    def drain(futures):
+        for future in futures:
+            item = pending.pop(future)
+            error = future.exception()
+            yield item, None if error is not None else future.result(), error
+
+    pending = {}  # {future: item}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from drain(done)
+            pending[executor.submit(fn, item)] = item
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from drain(done)
+
+
+async def amap_settled(fn: Callable, items: Iterable, limit: int = 10) -> List[Tuple]:
+    """
+    Await `fn` on every item with at most `limit` coroutines in flight, return a
+    `(result, error)` pair for each item in input order
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def settle(item):
+        async with semaphore:
+            try:
+                return await fn(item), None
+            except Exception as e:
+                return None, e
+
+    return list(await asyncio.gather(*(settle(item) for item in items)))
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls: while a call of a key is in flight, other
+    callers of the same key wait for it and get its result(or its exception)
+    instead of making their own call
+    """
+
+    def __init__(self):
+        self.shared = 0  # number of calls served by another caller's flight
+        self._flights = {}  # {key: _Flight}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,364 @@
+"""
+Asyncio client for gocron, requires `aiohttp`(`pip install pygocron[async]`)
+
+```python
+from pygocron.aio import AsyncPyGoCron
+
+async with AsyncPyGoCron() as pgc:
+    task_id = await pgc.create_task(name="test job", spec="0 0 0 * * *", command="echo 1")
+    run_id = await pgc.run_task(task_id)
+```
+"""
+import asyncio
+import os
+from typing import Dict, List, Set, Union
+from urllib.parse import urljoin
+
+import aiohttp
+
+from pygocron import _api
+from pygocron._api import BulkSummary, PyGocronTimeout, RunStatus, TaskResult
+from pygocron._concurrent import amap_settled
+from pygocron.polling import async_wait_until
+from pygocron.log import logger, success
+from pygocron.metrics import Metrics
+
+
+class AsyncPyGoCron:
+    def __init__(
+        self,
+        gocron_address: str = os.environ.get("GOCRON_ADDRESS", ""),
+        gocron_admin_user: str = os.environ.get("GOCRON_ADMIN_USER", ""),
+        gocron_admin_password: str = os.environ.get("GOCRON_ADMIN_PASSWORD", ""),
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        max_concurrency: int = None,
+        metrics: Union[bool, Metrics] = None,
+    ):
+        """
+        Params
+        -----
+        gocron_address: gocron web server address, for instance `http://127.0.0.1:5920`
+        gocron_admin_user: admin username
+        gocron_admin_password: admin password
+        pool_size: max number of keep-alive connections kept to the gocron web server
+        timeout: timeout(seconds) for every single http request
+        max_retries: retry times for idempotent `GET` requests(not run triggers) on connection errors or 502/503/504
+        backoff_factor: retry backoff factor, retries sleep `backoff_factor * 2 ** (retry - 1)` seconds
+        max_concurrency: max number of in-flight requests, default is `pool_size`
+        metrics: record per-endpoint counts, errors and latencies, see `PyGoCron`
+        """
+        _api.check_credentials(gocron_address, gocron_admin_user, gocron_admin_password)
+        self._base_url = gocron_address
+        self._username = gocron_admin_user
+        self._password = gocron_admin_password
+        self._headers = None
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_concurrency = max_concurrency or pool_size
+        self._session = None
+        self._semaphore = None
+        self._auth_lock = None
+        self.metrics = Metrics() if metrics is True else metrics or None
+
+    def _ensure_session(self):
+        # aiohttp sessions and asyncio primitives must be created inside the running loop
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._pool_size)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._auth_lock = asyncio.Lock()
+
+    async def _send(self, call: _api.Call, headers: dict):
+        url = urljoin(self._base_url, call.path)
+        params = {k: v for k, v in (call.params or {}).items() if v is not None}
+        retries = self._max_retries if call.retries is None else call.retries
+        if not _api.is_retryable(call):
+            retries = 0
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff_factor * 2 ** (attempt - 1))
+            try:
+                status, body = await self._request(call, url, headers, params)
+            except aiohttp.ClientConnectionError:
+                if attempt == retries:
+                    raise
+                continue
+            if status not in _api.RETRY_STATUS or attempt == retries:
+                return status, body
+
+    async def _request(self, call: _api.Call, url: str, headers: dict, params: dict):
+        token = self.metrics.start(call) if self.metrics is not None else None
+        try:
+            kwargs = {} if call.timeout is None else {"timeout": aiohttp.ClientTimeout(total=call.timeout)}
+            async with self._semaphore:
+                async with self._session.request(
+                    call.method, url, headers=headers, params=params, **kwargs
+                ) as response:
+                    body = await response.read()
+        except Exception as e:
+            if token is not None:
+                self.metrics.finish(token, exc=e)
+            raise
+        if token is not None:
+            self.metrics.finish(token, response.status, body)
+        return response.status, body
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the recorded http calls, see `Metrics.snapshot`, empty if the client has no `metrics`
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    async def _call(self, call: _api.Call):
+        self._ensure_session()
+        if call.path == _api.LOGIN_PATH:
+            status, body = await self._send(call, _api.request_headers(call, None))
+            return _api.parse(call, status, body)
+        if self._headers is None:
+            await self._authenticate()
+        auth_headers = self._headers
+        status, body = await self._send(call, _api.request_headers(call, auth_headers))
+        if _api.is_auth_error(status, body):
+            await self._authenticate(stale_token=auth_headers["Auth-Token"])
+            status, body = await self._send(call, _api.request_headers(call, self._headers))
+        return _api.parse(call, status, body)
+
+    async def _authenticate(self, stale_token: str = None):
+        async with self._auth_lock:
+            # another coroutine may have logged in while we were waiting for the lock
+            if self._headers is None or self._headers["Auth-Token"] == stale_token:
+                data = await self._call(_api.login(self._username, self._password))
+                self._headers = {"Auth-Token": data["token"]}
+
+    async def close(self):
+        """
+        Close all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def create_task(self, name: str, spec: str, command: str, **kwargs) -> int:
+        """
+        Create a task, and return the task id, see `PyGoCron.create_task` for all params
+        """
+        await self._call(_api.store_task(_api.task_payload(name, spec, command, **kwargs)))
+        success("Task created: `%s`", name)
+        return await self.get_task_id_lagged(name=name)
+
+    async def create_tasks(self, specs: List[dict], limit: int = 10, wait: float = 10) -> List[TaskResult]:
+        """
+        Create tasks in bulk, return a `TaskResult(name, task_id, error)` for every spec in input order,
+        see `PyGoCron.create_tasks`
+
+        Params
+        -----
+        specs: a list of dicts, each one holds the params of `create_task`
+        limit: max number of concurrent `/api/task/store` calls
+        wait: max seconds to wait for the created tasks to be ready in database
+        """
+        specs = list(specs)
+
+        async def store(spec):
+            return await self._call(_api.store_task(_api.task_payload(**spec)))
+
+        stored = await amap_settled(store, specs, limit)
+        created = [spec for spec, (_, error) in zip(specs, stored) if error is None]
+        task_ids = await self._find_task_ids(_api.group_names_by_tag(created), wait)
+        results = _api.task_results(specs, stored, task_ids)
+        failed = sum(1 for result in results if result.error is not None)
+        success("%d tasks created, %d failed", len(results) - failed, failed)
+        return results
+
+    async def _find_task_ids(self, names_by_tag: Dict[str, Set[str]], wait: float) -> Dict[str, int]:
+        found = {}
+
+        async def probe():
+            for tag, names in names_by_tag.items():
+                missing = names - found.keys()
+                if missing:
+                    found.update(await self._scan_task_ids(tag, missing))
+            if all(names <= found.keys() for names in names_by_tag.values()):
+                return found
+
+        try:
+            return await async_wait_until(probe, timeout=wait, description="created tasks")
+        except PyGocronTimeout:
+            return found
+
+    async def _scan_task_ids(self, tag: str, names: Set[str]) -> Dict[str, int]:
+        found, page = {}, 1
+        while True:
+            data = await self.get_tasks(page=page, page_size=_api.LIST_PAGE_SIZE, tag=tag or None)
+            found.update(_api.match_task_ids(data, names))
+            if len(found) == len(names) or _api.is_last_page(data, page, _api.LIST_PAGE_SIZE):
+                return found
+            page += 1
+
+    async def run_task(self, task_id) -> int:
+        """
+        Run task and return a task run id
+        """
+        logs = await self.get_task_logs(task_id=task_id, page_size=1)
+        previous_run_id = _api.latest_run_id(logs)
+        await self._call(_api.run_task(task_id))
+        success("Task triggered: %s", task_id)
+        return await self.get_latest_run_id(task_id, after_id=previous_run_id)
+
+    async def get_tasks(self, **kwargs):
+        """
+        Get a task list, see `PyGoCron.get_tasks` for all params
+        """
+        return await self._call(_api.list_tasks(**kwargs))
+
+    async def get_task_id_by_name(self, name: str):
+        """
+        Get a task id by task name
+
+        Params
+        -----
+        name: task name
+        """
+        data = await self.get_tasks(name=name)
+        if data:
+            return _api.first_task_id(data, name)
+
+    async def get_task_logs(self, **kwargs):
+        """
+        Get task logs, see `PyGoCron.get_task_logs` for all params
+        """
+        return await self._call(_api.list_task_logs(**kwargs))
+
+    async def check_run_status(self, task_id, run_id) -> RunStatus:
+        """
+        Check and reuturn a task tun status `RunStatus`
+
+        Params:
+        ----
+        task_is: task id
+        run_id: run id
+        """
+        logs = await self.get_task_logs(task_id=task_id, page_size=100)
+        if logs["data"]:
+            status = _api.find_run_status(logs, run_id)
+            if status is None:
+                logger.warning("Run id of task %s not found", task_id)
+            return status
+
+    async def disable_task(self, task_id: int):
+        """
+        Disable a task by task id
+        """
+        await self._call(_api.disable_task(task_id))
+        success("Task disabled: %s", task_id)
+
+    async def enable_task(self, task_id: int):
+        """
+        Enable a task by task id
+        """
+        await self._call(_api.enable_task(task_id))
+        success("Task enabled: %s", task_id)
+
+    async def get_task_id_lagged(self, name, wait=10) -> int:
+        """
+        Get a task id, polling until the task record is ready in database
+
+        Params
+        ----
+        name: task name
+        wait: max seconds to wait, raise `PyGocronTimeout` when the task still can't be found
+        """
+
+        async def probe():
+            return _api.find_task_id(await self.get_tasks(name=name), name)
+
+        return await async_wait_until(probe, timeout=wait, description=f"task `{name}`")
+
+    async def get_latest_run_id(self, task_id, wait=10, after_id: int = None) -> int:
+        """
+        Get most recent run id of a task, polling until a run record is ready in database
+
+        Params
+        ----
+        task_id: task id
+        wait: max seconds to wait, raise `PyGocronTimeout` when there is still no run record
+        after_id: only accept a run newer than this run id
+        """
+
+        async def probe():
+            logs = await self.get_task_logs(task_id=task_id, page_size=1)
+            return _api.latest_run_id(logs, after_id)
+
+        return await async_wait_until(
+            probe, timeout=wait, description=f"a run of task `{task_id}`"
+        )
+
+    async def delete_task_by_tag(self, tag: str, limit: int = 10) -> BulkSummary:
+        """
+        Delete all tasks related to the `tag`, return a `BulkSummary(succeeded, failed)` instead of raising on the first failure
+
+        Params
+        ----
+        tag: tag
+        limit: max number of concurrent `/api/task/remove` calls
+        """
+        # collect all ids before changing anything, deleting while paging would shift the pages
+        task_ids, page = [], 1
+        while True:
+            data = await self.get_tasks(page=page, page_size=_api.LIST_PAGE_SIZE, tag=tag)
+            task_ids.extend(task["id"] for task in data["data"])
+            if _api.is_last_page(data, page, _api.LIST_PAGE_SIZE):
+                break
+            page += 1
+        if not task_ids:
+            logger.warning("No tasks associated with tag `%s`", tag)
+        settled = await amap_settled(self.delete_task, task_ids, limit)
+        succeeded, failed = [], {}
+        for task_id, (_, error) in zip(task_ids, settled):
+            if error is None:
+                succeeded.append(task_id)
+            else:
+                failed[task_id] = error
+        return BulkSummary(succeeded, failed)
+
+    async def delete_task(self, task_id: int):
+        """
+        Delete a task by a `task id`
+        """
+        await self._call(_api.remove_task(task_id))
+        success("Task deleted: %s", task_id)
+
+    async def get_nodes(self):
+        """
+        Get all nodes(server adddress info)
+        """
+        return await self._call(_api.list_nodes())
+
+    async def add_new_node(self, ip: str, port: int, alias: str, remark: str):
+        """
+        Add a new node to gocron, see `PyGoCron.add_new_node`
+        """
+        await self._call(_api.store_node(ip, port, alias, remark))
+        success("Node added: %s", alias)
+
+    async def check_node(self, node_id):
+        """
+        Check if a node is accessible or not
+        """
+        await self._call(_api.ping_node(node_id))
+        success("Node is running: %s", node_id)
@@ -0,0 +1,89 @@
+"""
+On-disk cache of gocron `Auth-Token`s, shared by all processes of a host.
+
+```python
+pgc = PyGoCron(token_cache=True)  # or token_cache="/path/to/tokens.json"
+```
+
+Entries are keyed by gocron address and user, and every read-modify-write of the
+cache file happens under an exclusive file lock, so when many short-lived workers
+start at the same moment only one of them logs in.
+"""
+import json
+import os
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, windows
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pygocron", "tokens.json")
+
+
+class TokenCache:
+    """
+    Params
+    -----
+    path: cache file path, default is `~/.cache/pygocron/tokens.json`
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_PATH
+
+    @staticmethod
+    def key(address: str, username: str) -> str:
+        return f"{address.rstrip('/')}|{username}"
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, tokens: dict):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # tokens are credentials
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tokens, f)
+        os.replace(tmp, self.path)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._locked():
+            return self._read().get(key)
+
+    def fetch(self, key: str, login: Callable[[], str], stale_token: str = None) -> str:
+        """
+        Return the cached token of `key`, calling `login` for a new one when there is
+        no token yet or the cached one is `stale_token`(rejected by the server)
+        """
+        with self._locked():
+            tokens = self._read()
+            token = tokens.get(key)
+            if token is not None and token != stale_token:
+                return token
+            token = login()
+            tokens[key] = token
+            self._write(tokens)
+            return token
+
+    def discard(self, key: str):
+        with self._locked():
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
@@ -0,0 +1,156 @@
+"""
+In-client index of task name -> task id(and tag -> task ids), so repeated name
+lookups don't hit `api/task` every time.
+
+```python
+pgc = PyGoCron(task_index=TaskIndex(maxsize=10000, ttl=300))
+pgc.get_task_id_by_name("test job")  # the first lookup loads all tasks by one listing
+pgc.get_task_id_by_name("test job")  # served from the index
+print(pgc.task_index.stats())
+```
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional, Set
+
+
+class _Entry(NamedTuple):
+    task_id: int
+    tag: str
+    expires: float
+
+
+class TaskIndex:
+    """
+    A bounded LRU index of task name -> task id with a TTL
+
+    Params
+    -----
+    maxsize: max number of task names kept, the least recently used ones are evicted first
+    ttl: seconds an entry(and a bulk load) stays valid
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {name: _Entry}
+        self._tags = {}  # {tag: set of names}
+        self._names = {}  # {task_id: name}
+        self._loaded_at = None
+        self._complete = False  # holds every task of the last bulk load
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stale(self) -> bool:
+        """
+        Never loaded in bulk, or the last bulk load is older than `ttl`
+        """
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def _put(self, name: str, task_id: int, tag: str, expires: float):
+        self._remove(name)
+        self._entries[name] = _Entry(task_id, tag, expires)
+        self._names[task_id] = name
+        self._tags.setdefault(tag, set()).add(name)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self._complete = False
+
+    def _remove(self, name: str):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._names.pop(entry.task_id, None)
+            names = self._tags.get(entry.tag)
+            names.discard(name)
+            if not names:
+                del self._tags[entry.tag]
+
+    def get(self, name: str) -> Optional[int]:
+        """
+        Return the task id of `name`, or `None` on a miss(unknown or expired)
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.expires < time.monotonic():
+                self._remove(name)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return entry.task_id
+
+    def peek(self, name: str) -> Optional[int]:
+        """
+        Like `get`, but don't count hits and misses or touch the LRU order
+        """
+        entry = self._entries.get(name)
+        if entry is None or entry.expires < time.monotonic():
+            return None
+        return entry.task_id
+
+    def ids_by_tag(self, tag: str) -> Optional[Set[int]]:
+        """
+        Return the task ids of `tag`, or `None` when the index can't answer it
+        completely(stale, or some tasks were evicted since the last bulk load)
+        """
+        with self._lock:
+            if self.stale or not self._complete:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {self._entries[name].task_id for name in self._tags.get(tag, ())}
+
+    def put(self, name: str, task_id: int, tag: str = ""):
+        with self._lock:
+            self._put(name, task_id, tag, time.monotonic() + self.ttl)
+
+    def load(self, tasks: Iterable[dict]):
+        """
+        Replace the index with a full task listing, for instance `pgc.iter_tasks()`
+        """
+        tasks = [(task["name"], task["id"], task.get("tag", "")) for task in tasks]
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._names.clear()
+            self._complete = True
+            now = time.monotonic()
+            for name, task_id, tag in tasks:
+                self._put(name, task_id, tag, now + self.ttl)
+            self._loaded_at = now
+
+    def discard(self, task_id: int):
+        """
+        Drop the entry of a deleted task
+        """
+        with self._lock:
+            name = self._names.get(task_id)
+            if name is not None:
+                self._remove(name)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._names.clear()
+            self._loaded_at = None
+            self._complete = False
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,394 @@
+"""
+`pygocron` command line tool.
+
+    $ export GOCRON_ADDRESS=http://127.0.0.1:5920 GOCRON_ADMIN_USER=admin GOCRON_ADMIN_PASSWORD=pass
+    $ pygocron export --tag etl -o tasks.jsonl
+    $ pygocron --workers 20 import tasks.csv
+    $ pygocron run --tag etl --wait
+    $ pygocron delete --name "tmp-*" --yes
+    $ pygocron tail --status failed --follow
+    $ pygocron schedule --suggest
+    $ pygocron logs --since 2022-11-25 --no-result -o logs.jsonl.gz
+
+Files are read and written record by record(`-` is stdin/stdout), a file of millions of
+tasks is imported in batches of `--batch` tasks, so memory stays flat. Progress and
+throughput are reported on stderr, `--quiet` turns them off.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Iterable, Iterator, List
+
+from pygocron import _api
+from pygocron._api import RunStatus
+from pygocron._concurrent import imap_settled, map_settled
+from pygocron.reconcile import task_fields
+
+FORMATS = ("jsonl", "csv")
+EXPORT_FIELDS = tuple(key for key in _api.task_payload("", "", "") if key != "id") + ("enabled",)
+STATUSES = {"failed": RunStatus.FAILED, "running": RunStatus.RUNNING, "success": RunStatus.SUCCESS}
+
+
+class Progress:
+    """
+    Count done and failed items, report them with the throughput on `stream`,
+    on a single refreshed line when `stream` is a terminal
+
+    Params
+    -----
+    label: what is counted, for instance `imported`
+    stream: where to report, `None` to stay silent
+    interval: min seconds between two reports
+    """
+
+    def __init__(self, label: str, stream=sys.stderr, interval: float = 0.5):
+        self.label = label
+        self.stream = stream
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self._start = time.monotonic()
+        self._reported = self._start
+        self._tty = stream is not None and stream.isatty()
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self._start
+        rate = self.done / elapsed if elapsed else 0.0
+        return f"{self.done} {self.label}, {self.failed} failed, {elapsed:.1f}s, {rate:.1f}/s"
+
+    def add(self, ok: bool = True):
+        if ok:
+            self.done += 1
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        if self._tty and now - self._reported >= self.interval:
+            self._reported = now
+            self.stream.write(f"\r{self.line()}")
+            self.stream.flush()
+
+    def error(self, message: str):
+        # errors are reported even when progress is not
+        stream = self.stream if self.stream is not None else sys.stderr
+        stream.write(f"\r{message}\n" if self._tty else f"{message}\n")
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.write(f"\r{self.line()}\n" if self._tty else f"{self.line()}\n")
+            self.stream.flush()
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _format(path: str, fmt: str = None) -> str:
+    return fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("0", "false", "no", "")
+    return bool(value)
+
+
+def read_specs(f, fmt: str) -> Iterator[dict]:
+    """
+    Yield task specs(dicts of `create_task` params plus an optional `enabled`) one by one from a JSON lines
+    or a CSV file, empty CSV cells are left out so the `create_task` defaults apply
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(f):
+            yield {key: value for key, value in row.items() if key and value not in (None, "")}
+    else:
+        for line in f:
+            if line.strip():
+                yield _api.loads(line)
+
+
+def write_specs(f, fmt: str, tasks: Iterable[dict]) -> Iterator[dict]:
+    """
+    Write the tasks of `get_tasks` as specs one by one, yield every task once written
+    """
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(f, EXPORT_FIELDS)
+        writer.writeheader()
+    for task in tasks:
+        spec = dict(task_fields(task), enabled=bool(task.get("status")))
+        if writer is not None:
+            writer.writerow(spec)
+        else:
+            f.write(json.dumps(spec, ensure_ascii=False) + "\n")
+        yield task
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _selector(args) -> dict:
+    return {
+        "tag": args.tag,
+        "name": args.name,
+        "host_id": args.host_id,
+        "status": None if args.enabled is None else int(args.enabled),
+    }
+
+
+def cmd_export(pgc, args, progress: Progress) -> int:
+    f = _open(args.output, "w")
+    try:
+        tasks = pgc.iter_tasks(page_size=_api.LIST_PAGE_SIZE, tag=args.tag)
+        for _ in write_specs(f, _format(args.output, args.format), tasks):
+            progress.add()
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return 0
+
+
+def cmd_import(pgc, args, progress: Progress) -> int:
+    f = _open(args.file, "r")
+    try:
+        for batch in _batches(read_specs(f, _format(args.file, args.format)), args.batch):
+            enabled = [_parse_bool(spec.pop("enabled", True)) for spec in batch]
+            results = pgc.create_tasks(batch, max_workers=args.workers)
+            disabled = [r.task_id for r, on in zip(results, enabled) if r.error is None and not on]
+            settled = map_settled(pgc.disable_task, disabled, args.workers)
+            not_disabled = {task_id for task_id, (_, error) in zip(disabled, settled) if error is not None}
+            for result in results:
+                if result.error is not None:
+                    progress.error(f"{result.name}: {result.error}")
+                elif result.task_id in not_disabled:
+                    progress.error(f"{result.name}: created, but can not be disabled")
+                progress.add(result.error is None and result.task_id not in not_disabled)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return 1 if progress.failed else 0
+
+
+def cmd_run(pgc, args, progress: Progress) -> int:
+    task_ids = pgc.select_tasks(**_selector(args))
+    if args.wait:
+        def run(task_id):
+            return pgc.run_task_async(task_id).wait(args.timeout)
+    else:
+        def run(task_id):
+            return pgc._call(_api.run_task(task_id))
+
+    for task_id, update, error in imap_settled(run, task_ids, args.workers):
+        if error is not None:
+            progress.error(f"Task {task_id}: {error}")
+        elif args.wait:
+            print(json.dumps({"task_id": task_id, "run_id": update.run_id, "status": update.status.name.lower()}))
+        progress.add(error is None and (not args.wait or update.status is RunStatus.SUCCESS))
+    return 1 if progress.failed else 0
+
+
+def cmd_delete(pgc, args, progress: Progress) -> int:
+    selector = _selector(args)
+    if not any(value is not None for value in selector.values()):
+        progress.error("Refusing to delete every task, select some by --tag, --name, --host-id or --enabled/--disabled")
+        return 2
+    task_ids = pgc.select_tasks(**selector)  # selected up front: deleting while paging would skip tasks
+    if not args.yes:
+        progress.error(f"{len(task_ids)} tasks would be deleted, pass --yes to delete them")
+        return 1
+    for task_id, _, error in imap_settled(pgc.delete_task, task_ids, args.workers):
+        if error is not None:
+            progress.error(f"Task {task_id}: {error}")
+        progress.add(error is None)
+    return 1 if progress.failed else 0
+
+
+def _print_log(record: dict, as_json: bool):
+    if as_json:
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+    status = _api.run_status(record["status"]).name.lower()
+    print(
+        f"{record['start_time']}  #{record['id']}  {record['name']}(task {record['task_id']})"
+        f"  {status}  {record.get('total_time', 0)}s",
+        flush=True,
+    )
+
+
+def cmd_tail(pgc, args, progress: Progress) -> int:
+    filters = {"task_id": args.task_id, "status": STATUSES.get(args.status)}
+    result_limit = None if args.json else 0
+    records = list(
+        itertools.islice(
+            pgc.iter_task_logs(page_size=args.lines or 1, prefetch=False, result_limit=result_limit, **filters),
+            args.lines,
+        )
+    )
+    last_id = records[0]["id"] if records else 0
+    if not records and args.follow:
+        last_id = _api.latest_run_id(pgc.get_task_logs(page_size=1, **filters)) or 0
+    while True:
+        for record in reversed(records):
+            _print_log(record, args.json)
+            progress.add()
+        if not args.follow:
+            return 0
+        time.sleep(args.interval)
+        records = []
+        for record in pgc.iter_task_logs(page_size=50, prefetch=False, result_limit=result_limit, **filters):
+            if record["id"] <= last_id:
+                break
+            records.append(record)
+        if records:
+            last_id = records[0]["id"]
+
+
+def cmd_logs(pgc, args, progress: Progress) -> int:
+    from pygocron.logexport import JsonLinesWriter, in_time_range
+
+    if args.chunk and args.output == "-":
+        progress.error("--chunk needs an --output file")
+        return 2
+    result_limit = 0 if args.no_result else args.result_limit
+    records = pgc.iter_task_logs(
+        page_size=args.page_size,
+        max_page_size=args.page_size,
+        prefetch=False,
+        result_limit=result_limit,
+        task_id=args.task_id,
+        status=STATUSES.get(args.status),
+    )
+    output = sys.stdout if args.output == "-" else args.output
+    with JsonLinesWriter(output, chunk_records=args.chunk) as writer:
+        for record in in_time_range(records, args.since, args.until):
+            writer.write(record)
+            progress.add()
+    return 0
+
+
+def cmd_schedule(pgc, args, progress: Progress) -> int:
+    report = pgc.analyze_schedule(days=args.days, tag=args.tag)
+    for task_id, error in report.invalid.items():
+        progress.error(f"Task {task_id}: {error}")
+    if args.suggest:
+        for task_id, spec in report.suggest_jitter(max_shift=args.max_shift).items():
+            print(json.dumps({"task_id": task_id, "spec": report.specs[task_id].text, "suggested": spec}))
+            progress.add()
+        return 0
+    print(f"Busiest seconds from {report.start}:")
+    for moment, count in report.peaks(args.top):
+        print(f"  {moment}  {count} tasks")
+    for host_id in sorted(report.per_host):
+        peak = report.peaks(1, host_id=host_id)
+        if peak:
+            print(f"  host {host_id}: {peak[0][1]} tasks at {peak[0][0]}")
+    return 1 if report.invalid else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pygocron", description="Manage gocron tasks in bulk")
+    parser.add_argument("--address", default=os.environ.get("GOCRON_ADDRESS", ""), help="default: $GOCRON_ADDRESS")
+    parser.add_argument("--user", default=os.environ.get("GOCRON_ADMIN_USER", ""), help="default: $GOCRON_ADMIN_USER")
+    parser.add_argument(
+        "--password", default=os.environ.get("GOCRON_ADMIN_PASSWORD", ""), help="default: $GOCRON_ADMIN_PASSWORD"
+    )
+    parser.add_argument("--workers", type=int, default=10, help="concurrent requests(default: 10)")
+    parser.add_argument("--quiet", action="store_true", help="don't report progress on stderr")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    export = commands.add_parser("export", help="write tasks as specs that `import` reads back")
+    export.add_argument("-o", "--output", default="-", help="file to write, `-` for stdout(default)")
+    export.add_argument("--format", choices=FORMATS, help="default: by the file extension, else jsonl")
+    export.add_argument("--tag")
+    export.set_defaults(handler=cmd_export, label="exported")
+
+    import_ = commands.add_parser("import", help="create tasks from a JSON lines or a CSV file")
+    import_.add_argument("file", help="file to read, `-` for stdin")
+    import_.add_argument("--format", choices=FORMATS, help="default: by the file extension, else jsonl")
+    import_.add_argument("--batch", type=int, default=500, help="tasks created(and held in memory) at once")
+    import_.set_defaults(handler=cmd_import, label="imported")
+
+    for name, handler, label, summary in (
+        ("run", cmd_run, "runs", "trigger the selected tasks now"),
+        ("delete", cmd_delete, "deleted", "delete the selected tasks"),
+    ):
+        command = commands.add_parser(name, help=summary)
+        command.add_argument("--tag")
+        command.add_argument("--name", help="task name, or a shell-style pattern such as `etl-*`")
+        command.add_argument("--host-id", type=int)
+        command.add_argument("--enabled", action="store_true", default=None, help="only enabled tasks")
+        command.add_argument("--disabled", action="store_false", dest="enabled", help="only disabled tasks")
+        command.set_defaults(handler=handler, label=label)
+    run = commands.choices["run"]
+    run.add_argument("--wait", action="store_true", help="wait for the runs, print their final status as JSON lines")
+    run.add_argument("--timeout", type=float, help="max seconds to wait for one run")
+    commands.choices["delete"].add_argument("--yes", action="store_true", help="really delete")
+
+    schedule = commands.add_parser("schedule", help="find the seconds where many tasks fire at once")
+    schedule.add_argument("--days", type=float, default=1, help="length of the window from now(default: 1)")
+    schedule.add_argument("--tag")
+    schedule.add_argument("--top", type=int, default=10, help="number of busiest seconds to print")
+    schedule.add_argument("--suggest", action="store_true", help="print jittered specs flattening the peaks as JSON lines")
+    schedule.add_argument("--max-shift", type=int, default=300, help="max seconds a task is delayed by --suggest")
+    schedule.set_defaults(handler=cmd_schedule, label="suggested")
+
+    logs = commands.add_parser("logs", help="stream task logs(newest first) to a JSON lines file, one page in memory")
+    logs.add_argument("-o", "--output", default="-", help="file to write, gzipped if it ends with `.gz`(default: stdout)")
+    logs.add_argument("--since", help="only logs started at or after this time, for instance 2022-11-25T10:00:00")
+    logs.add_argument("--until", help="only logs started before this time")
+    logs.add_argument("--task-id", type=int)
+    logs.add_argument("--status", choices=sorted(STATUSES))
+    logs.add_argument("--result-limit", type=int, help="truncate the run output to this many chars")
+    logs.add_argument("--no-result", action="store_true", help="drop the run output")
+    logs.add_argument("--chunk", type=int, help="start a new file(logs-00001.jsonl.gz, ...) every this many logs")
+    logs.add_argument("--page-size", type=int, default=100, help="logs per request and held in memory(default: 100)")
+    logs.set_defaults(handler=cmd_logs, label="logs")
+
+    tail = commands.add_parser("tail", help="print the latest task logs, oldest first")
+    tail.add_argument("-n", "--lines", type=int, default=10, help="number of logs to print first(default: 10)")
+    tail.add_argument("-f", "--follow", action="store_true", help="keep printing new logs")
+    tail.add_argument("--interval", type=float, default=2, help="seconds between two polls with --follow")
+    tail.add_argument("--task-id", type=int)
+    tail.add_argument("--status", choices=sorted(STATUSES))
+    tail.add_argument("--json", action="store_true", help="print the log records(with the run output) as JSON lines")
+    tail.set_defaults(handler=cmd_tail, label="logs")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    from pygocron.pygocron import PyGoCron
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        pgc = PyGoCron(args.address, args.user, args.password, pool_size=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    progress = Progress(args.label, stream=None if args.quiet else sys.stderr)
+    try:
+        with pgc:
+            return args.handler(pgc, args, progress)
+    except KeyboardInterrupt:
+        return 130
+    except _api.PyGocronException as e:
+        progress.error(str(e))
+        return 1
+    finally:
+        if args.handler not in (cmd_tail, cmd_schedule) or getattr(args, "suggest", False):
+            progress.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
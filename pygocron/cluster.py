@@ -0,0 +1,289 @@
+"""
+One client over several independent gocron deployments(shards).
+
+```python
+cluster = PyGoCronCluster({
+    "gocron-a": PyGoCron("http://gocron-a:5920", "admin", "pass"),
+    "gocron-b": PyGoCron("http://gocron-b:5920", "admin", "pass"),
+})
+task = cluster.create_task("nightly report", "0 0 1 * * *", "python report.py")  # ShardedId("gocron-b", 12)
+cluster.run_task(task)
+for log in cluster.iter_task_logs(status=RunStatus.FAILED):  # all shards, newest first
+    print(log["shard"], log["name"], log["start_time"])
+```
+
+New tasks are placed by consistent hashing of their name(or tag), so adding a shard
+moves only about `1 / number of shards` of the keys. Task ids are only unique within
+a shard, so the cluster identifies a task by a `ShardedId(shard, task_id)`.
+"""
+import bisect
+import datetime
+import hashlib
+import heapq
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple
+
+from pygocron._api import PyGocronException, TaskResult
+from pygocron._concurrent import map_settled
+
+_DONE = object()
+
+
+class ShardedId(NamedTuple):
+    shard: str
+    task_id: int
+
+
+class HashRing:
+    """
+    Consistent hash ring of shard names
+
+    Params
+    -----
+    shards: shard names
+    replicas: number of points of every shard on the ring, more points spread keys more evenly
+    """
+
+    def __init__(self, shards: Iterable[str], replicas: int = 64):
+        self.replicas = replicas
+        self._points = []  # sorted [(hash, shard)]
+        for shard in shards:
+            self.add(shard)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def add(self, shard: str):
+        for i in range(self.replicas):
+            bisect.insort(self._points, (self._hash(f"{shard}#{i}"), shard))
+
+    def remove(self, shard: str):
+        self._points = [point for point in self._points if point[1] != shard]
+
+    def get(self, key: str) -> str:
+        if not self._points:
+            raise PyGocronException("Hash ring has no shards")
+        i = bisect.bisect(self._points, (self._hash(key), ""))
+        return self._points[i % len(self._points)][1]
+
+
+_TIME_FORMATS = ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+def _timestamp(value) -> float:
+    # no `datetime.fromisoformat` before python 3.7, and `%z` only takes `+08:00` since 3.7
+    if not isinstance(value, str):
+        return 0.0
+    if value.endswith("Z"):
+        value = value[:-1] + "+0000"
+    elif len(value) > 6 and value[-3] == ":" and value[-6] in "+-":
+        value = value[:-3] + value[-2:]
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
+
+def _produce(records: Iterator[dict], shard: str, out: queue.Queue, stop: threading.Event):
+    def put(item):
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for record in records:
+            record["shard"] = shard
+            if not put(record):
+                return
+        put(_DONE)
+    except Exception as e:
+        put(e)
+
+
+def _consume(out: queue.Queue) -> Iterator[dict]:
+    while True:
+        item = out.get()
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def merge_streams(streams: Dict[str, Iterator[dict]], key: Callable, buffer: int = 200) -> Iterator[dict]:
+    """
+    Consume every stream in its own thread(so the shards are queried concurrently), and merge
+    them into one stream in descending `key` order, each stream must already be in that order.
+    Every record gets a `shard` field. At most `buffer` records per stream wait in memory.
+    """
+    stop = threading.Event()
+    outputs = []
+    for shard, records in streams.items():
+        out = queue.Queue(maxsize=buffer)
+        threading.Thread(target=_produce, args=(records, shard, out, stop), daemon=True).start()
+        outputs.append(_consume(out))
+    try:
+        yield from heapq.merge(*outputs, key=key, reverse=True)
+    finally:
+        stop.set()
+
+
+class PyGoCronCluster:
+    """
+    Params
+    -----
+    clients: `{shard name: PyGoCron}`
+    shard_by: `name` or `tag`, the task field hashed to place a task, with `tag` all tasks of a tag
+        live on one shard(and tasks without tag on one shard too)
+    replicas: points per shard on the hash ring
+    """
+
+    def __init__(self, clients: Dict[str, object], shard_by: str = "name", replicas: int = 64):
+        if shard_by not in ("name", "tag"):
+            raise ValueError("`shard_by` must be `name` or `tag`")
+        if not clients:
+            raise ValueError("A cluster needs at least one client")
+        self.clients = dict(clients)
+        self.shard_by = shard_by
+        self.ring = HashRing(self.clients, replicas)
+
+    @property
+    def shards(self) -> List[str]:
+        return list(self.clients)
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def shard_for(self, name: str = None, tag: str = None) -> str:
+        """
+        The shard owning a task of this name(or tag, see `shard_by`)
+        """
+        key = name if self.shard_by == "name" else tag
+        if key is None:
+            raise PyGocronException(f"Need the task `{self.shard_by}` to find its shard")
+        return self.ring.get(key)
+
+    def _routable(self, name: str = None, tag: str = None) -> bool:
+        return (name if self.shard_by == "name" else tag) is not None
+
+    def _fan_out(self, fn: Callable) -> Dict[str, tuple]:
+        shards = self.shards
+        settled = map_settled(lambda shard: fn(self.clients[shard]), shards, len(shards))
+        return dict(zip(shards, settled))
+
+    def create_task(self, name: str, spec: str, command: str, **kwargs) -> ShardedId:
+        """
+        Create a task on its shard, see `PyGoCron.create_task` for the params
+        """
+        shard = self.shard_for(name, kwargs.get("tag", ""))
+        return ShardedId(shard, self.clients[shard].create_task(name, spec, command, **kwargs))
+
+    def create_tasks(self, specs: List[dict], max_workers: int = None, wait: float = 10) -> List[TaskResult]:
+        """
+        Create tasks in bulk, every shard gets its share concurrently, return `TaskResult`s(with
+        `ShardedId` task ids) in input order, see `PyGoCron.create_tasks`
+        """
+        positions = {}  # {shard: [index in specs]}
+        for i, spec in enumerate(specs):
+            shard = self.shard_for(spec.get("name"), spec.get("tag", ""))
+            positions.setdefault(shard, []).append(i)
+        results = [None] * len(specs)
+
+        def create(shard):
+            return self.clients[shard].create_tasks(
+                [specs[i] for i in positions[shard]], max_workers=max_workers, wait=wait
+            )
+
+        for shard, (created, error) in zip(positions, map_settled(create, positions, len(positions))):
+            for j, i in enumerate(positions[shard]):
+                if error is not None:
+                    results[i] = TaskResult(specs[i].get("name"), None, error)
+                    continue
+                result = created[j]
+                task_id = ShardedId(shard, result.task_id) if result.error is None else None
+                results[i] = result._replace(task_id=task_id)
+        return results
+
+    def get_task_id_by_name(self, name: str, tag: str = None) -> ShardedId:
+        """
+        Look the task up on its shard, or on all shards(concurrently) when sharded by tag and `tag` is not given
+        """
+        if self._routable(name, tag):
+            shard = self.shard_for(name, tag)
+            return ShardedId(shard, self.clients[shard].get_task_id_by_name(name))
+        errors = []
+        for shard, (task_id, error) in self._fan_out(lambda client: client.get_task_id_by_name(name)).items():
+            if task_id is not None:
+                return ShardedId(shard, task_id)
+            if error is not None:
+                errors.append(error)
+        if errors:  # an unreachable shard may hold the task, don't report it as missing
+            raise errors[0]
+        raise PyGocronException(f"Task Name `{name}` Not Found")
+
+    def get_tasks(self, name: str = None, tag: str = None, **kwargs) -> dict:
+        """
+        One page of the tasks on the shard owning `name`(or `tag`), see `PyGoCron.get_tasks`.
+        Use `iter_tasks` to list the tasks of all shards
+        """
+        if not self._routable(name, tag):
+            raise PyGocronException(
+                f"`get_tasks` needs the `{self.shard_by}` to route the query, use `iter_tasks` for all shards"
+            )
+        return self.clients[self.shard_for(name, tag)].get_tasks(name=name, tag=tag, **kwargs)
+
+    def run_task(self, task: ShardedId) -> int:
+        return self.clients[task.shard].run_task(task.task_id)
+
+    def enable_task(self, task: ShardedId):
+        self.clients[task.shard].enable_task(task.task_id)
+
+    def disable_task(self, task: ShardedId):
+        self.clients[task.shard].disable_task(task.task_id)
+
+    def delete_task(self, task: ShardedId):
+        self.clients[task.shard].delete_task(task.task_id)
+
+    def get_task_logs(self, task: ShardedId, **kwargs) -> dict:
+        """
+        One page of the logs of a task, see `PyGoCron.get_task_logs`
+        """
+        return self.clients[task.shard].get_task_logs(task_id=task.task_id, **kwargs)
+
+    def iter_tasks(self, **filters) -> Iterator[dict]:
+        """
+        Yield the tasks of all shards(newest first), the shards are listed concurrently,
+        every task has a `shard` field. `filters` are the filters of `PyGoCron.get_tasks`
+        """
+        if self.shard_by == "tag" and filters.get("tag") is not None:
+            shard = self.shard_for(tag=filters["tag"])
+            streams = {shard: self.clients[shard].iter_tasks(**filters)}
+        else:
+            streams = {shard: client.iter_tasks(**filters) for shard, client in self.clients.items()}
+        return merge_streams(streams, key=lambda task: (_timestamp(task.get("created")), task["id"]))
+
+    def iter_task_logs(self, **filters) -> Iterator[dict]:
+        """
+        Yield the task logs of all shards(newest first), the shards are queried concurrently,
+        every record has a `shard` field. `filters` are the filters of `PyGoCron.iter_task_logs`,
+        except `task_id`: use `get_task_logs` with a `ShardedId` for the logs of one task
+        """
+        if "task_id" in filters:
+            raise PyGocronException("Task ids are per shard, use `get_task_logs` with a `ShardedId`")
+        streams = {shard: client.iter_task_logs(**filters) for shard, client in self.clients.items()}
+        return merge_streams(streams, key=lambda log: (_timestamp(log.get("start_time")), log["id"]))
@@ -0,0 +1,371 @@
+"""
+Parse gocron `spec`s locally, list their fire times, and find the seconds where too many tasks fire at once.
+
+```python
+spec = CronSpec.parse("0 */5 9-17 * * MON-FRI")
+spec.next(datetime.datetime.now())  # next fire time
+
+report = pgc.analyze_schedule()  # fires of all tasks over the next day
+print(report.peaks(5))  # [(datetime(2024, 1, 2, 0, 0), 812), ...]
+for task_id, new_spec in report.suggest_jitter(max_shift=300).items():
+    ...
+```
+
+gocron uses the cron syntax of robfig/cron v1: `second minute hour day-of-month month [day-of-week]`,
+with `*`, `?`, lists, ranges, steps, month and weekday names, and the descriptors `@yearly`,
+`@monthly`, `@weekly`, `@daily`, `@hourly` and `@every <duration>`. When both day fields are
+restricted, a day matches if either of them does.
+
+Every field is a bitset(an int), and the seconds a spec fires within a matching day are built once
+by multiplying bitsets: `seconds * minute_spread * hour_spread` puts a copy of the seconds bits at
+every matching minute of every matching hour, so listing fires over a window only checks the days.
+"""
+import datetime
+import heapq
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DAY = 86400
+_MONTHS = {name: i + 1 for i, name in enumerate("JAN FEB MAR APR MAY JUN JUL AUG SEP OCT NOV DEC".split())}
+_WEEKDAYS = {name: i for i, name in enumerate("SUN MON TUE WED THU FRI SAT".split())}
+_DESCRIPTORS = {
+    "@yearly": "0 0 0 1 1 *",
+    "@annually": "0 0 0 1 1 *",
+    "@monthly": "0 0 0 1 * *",
+    "@weekly": "0 0 0 * * 0",
+    "@daily": "0 0 0 * * *",
+    "@midnight": "0 0 0 * * *",
+    "@hourly": "0 0 * * * *",
+}
+_DURATION = re.compile(r"(\d+\.?\d*|\.\d+)(ns|us|\u00b5s|\u03bcs|ms|s|m|h)")  # the units of Go's `time.ParseDuration`
+_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 1e-3, "us": 1e-6, "\u00b5s": 1e-6, "\u03bcs": 1e-6, "ns": 1e-9}
+# (name, min, max, names)
+_FIELDS = (
+    ("second", 0, 59, None),
+    ("minute", 0, 59, None),
+    ("hour", 0, 23, None),
+    ("day of month", 1, 31, None),
+    ("month", 1, 12, _MONTHS),
+    ("day of week", 0, 6, _WEEKDAYS),
+)
+
+
+def _spread(bits: int, width: int) -> int:
+    # one bit at `i * width` for every bit `i` of `bits`
+    spread, i = 0, 0
+    while bits:
+        if bits & 1:
+            spread |= 1 << (i * width)
+        bits >>= 1
+        i += 1
+    return spread
+
+
+def _positions(bits: int) -> List[int]:
+    return [i for i, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"]
+
+
+def _parse_value(text: str, field: tuple) -> int:
+    name, _, _, names = field
+    if names and text.upper() in names:
+        return names[text.upper()]
+    if not text.isdigit():
+        raise ValueError(f"Invalid {name} `{text}`")
+    return int(text)
+
+
+def _parse_field(text: str, field: tuple) -> Tuple[int, bool]:
+    """
+    `(bitset, star)` of one field, `star` when the field is `*` or `?`
+    """
+    name, low, high, _ = field
+    bits, star = 0, False
+    for part in text.split(","):
+        range_, _, step = part.partition("/")
+        if range_ in ("*", "?"):
+            start, end = low, high
+            star = star or not step
+        elif "-" in range_:
+            start, end = (_parse_value(value, field) for value in range_.split("-", 1))
+        else:
+            start = _parse_value(range_, field)
+            end = high if step else start
+        step = int(step) if step.isdigit() else None if step else 1
+        if step is None or step == 0:
+            raise ValueError(f"Invalid step in {name} `{part}`")
+        if start < low or end > high or start > end:
+            raise ValueError(f"{name.capitalize()} `{part}` out of range {low}-{high}")
+        for value in range(start, end + 1, step):
+            bits |= 1 << value
+    return bits, star
+
+
+def parse_duration(text: str) -> float:
+    """
+    Seconds of a Go duration such as `1h30m`, `-1.5s` or `300ms`
+    """
+    sign, body = (-1 if text[0] == "-" else 1, text[1:]) if text[:1] in ("-", "+") else (1, text)
+    if body == "0":
+        return 0.0
+    matches = list(_DURATION.finditer(body))
+    if not matches or "".join(m.group(0) for m in matches) != body:
+        raise ValueError(f"Invalid duration `{text}`")
+    return sign * sum(float(m.group(1)) * _UNITS[m.group(2)] for m in matches)
+
+
+class CronSpec:
+    """
+    A parsed spec, `CronSpec.parse` raises `ValueError` on an invalid spec
+
+    seconds, minutes, hours, days, months, weekdays: bitsets of the fields
+    every: seconds between two fires of an `@every` spec, `None` otherwise
+    """
+
+    __slots__ = ("text", "fields", "seconds", "minutes", "hours", "days", "months", "weekdays",
+                 "_dom_star", "_dow_star", "every", "_day_bits")
+
+    def __init__(self, text: str, fields: List[str] = None, every: float = None):
+        self.text = text
+        self.fields = fields
+        self.every = every
+        self._day_bits = None
+        if every is not None:
+            return
+        parsed = [_parse_field(value, field) for value, field in zip(fields, _FIELDS)]
+        self.seconds, self.minutes, self.hours, self.days, self.months, self.weekdays = (bits for bits, _ in parsed)
+        self._dom_star, self._dow_star = parsed[3][1], parsed[5][1]
+
+    @classmethod
+    def parse(cls, spec: str) -> "CronSpec":
+        spec = spec.strip()
+        if not spec:
+            raise ValueError("Empty spec")
+        if spec.startswith("@every "):
+            # like robfig/cron: less than a second is one second, and the rest is truncated to whole seconds
+            every = parse_duration(spec[len("@every "):].strip())
+            return cls(spec, every=max(1, int(every + 1e-9)))  # 1e-9: float noise of `0.001 * 3000`
+        if spec.startswith("@"):
+            if spec not in _DESCRIPTORS:
+                raise ValueError(f"Unknown descriptor `{spec}`")
+            return cls(spec, _DESCRIPTORS[spec].split())
+        fields = spec.split()
+        if len(fields) not in (5, 6):
+            raise ValueError(f"Expected 5 or 6 fields, found {len(fields)} in `{spec}`")
+        return cls(spec, fields + ["*"] * (6 - len(fields)))
+
+    def __repr__(self):
+        return f"CronSpec({self.text!r})"
+
+    def matches_day(self, date: datetime.date) -> bool:
+        if self.every is not None:
+            return True
+        if not self.months >> date.month & 1:
+            return False
+        dom = bool(self.days >> date.day & 1)
+        dow = bool(self.weekdays >> (date.isoweekday() % 7) & 1)
+        if self._dom_star or self._dow_star:
+            return dom and dow
+        return dom or dow
+
+    def day_bits(self) -> int:
+        """
+        Bitset of the seconds of a matching day(bit `h * 3600 + m * 60 + s`) the spec fires at
+        """
+        if self._day_bits is None:
+            if self.every is not None:
+                raise ValueError("An `@every` spec has no fixed seconds of the day")
+            self._day_bits = self.seconds * _spread(self.minutes, 60) * _spread(self.hours, 3600)
+        return self._day_bits
+
+    def day_seconds(self) -> List[int]:
+        """
+        Sorted seconds of a matching day the spec fires at
+        """
+        return _positions(self.day_bits())
+
+    def offsets(self, start: datetime.datetime, end: datetime.datetime) -> Iterator[int]:
+        """
+        Yield the fire times in `[start, end)` as seconds since `start`(rounded down to the second), in order.
+        `@every` specs fire every `every` seconds from `start`, gocron counts from when it loaded the task
+        """
+        if self.every is not None:
+            window = (end - start).total_seconds()
+            offset = 0.0
+            while offset < window:
+                yield int(offset)
+                offset += self.every
+            return
+        first = start.replace(microsecond=0)
+        day = datetime.datetime.combine(first.date(), datetime.time())
+        skip = int((first - day).total_seconds())  # seconds of the first day before `start`
+        window = (end - day).total_seconds()
+        base, seconds = 0, None  # `base` is the offset of `day` from the first midnight
+        while base < window:
+            if self.matches_day(day):
+                seconds = seconds if seconds is not None else self.day_seconds()
+                for second in seconds:
+                    offset = base + second
+                    if offset >= window:
+                        return
+                    if offset >= skip:
+                        yield offset - skip
+            day += datetime.timedelta(days=1)
+            base += DAY
+
+    def fires(self, start: datetime.datetime, end: datetime.datetime) -> Iterator[datetime.datetime]:
+        """
+        Yield the fire times in `[start, end)`, in order, see `offsets`
+        """
+        base = start.replace(microsecond=0)
+        for offset in self.offsets(start, end):
+            moment = base + datetime.timedelta(seconds=offset)
+            if moment >= start:
+                yield moment
+
+    def next(self, after: datetime.datetime, horizon_days: int = 366 * 5) -> Optional[datetime.datetime]:
+        """
+        The first fire time after `after`, `None` when there is none within `horizon_days`(for instance `0 0 0 30 2 *`)
+        """
+        after = after.replace(microsecond=0) + datetime.timedelta(seconds=1)
+        return next(self.fires(after, after + datetime.timedelta(days=horizon_days)), None)
+
+    def shifted(self, offset: int) -> str:
+        """
+        The spec firing `offset` seconds later within the same hour,
+        only for specs with a single second and a single minute(or a single second)
+        """
+        second, minute = _positions(self.seconds), _positions(self.minutes)
+        if len(second) != 1:
+            raise ValueError(f"Can not shift `{self.text}`, it fires at several seconds of a minute")
+        if len(minute) == 1:
+            total = minute[0] * 60 + second[0] + offset
+            if total >= 3600:
+                raise ValueError(f"Can not shift `{self.text}` by {offset} seconds within its hour")
+            new = [str(total % 60), str(total // 60)]
+        else:
+            if second[0] + offset >= 60:
+                raise ValueError(f"Can not shift `{self.text}` by {offset} seconds within its minute")
+            new = [str(second[0] + offset), self.fields[1]]
+        return " ".join(new + self.fields[2:])
+
+
+def validate(spec: str) -> CronSpec:
+    """
+    Parse `spec`, raise `ValueError` when gocron would reject it
+    """
+    return CronSpec.parse(spec)
+
+
+class ScheduleReport:
+    """
+    Fire counts of many tasks over a window, built by `analyze`
+
+    start: first second of the window
+    per_second: fire count of every second of the window
+    per_host: `{host_id: fire count of every second}`
+    specs: `{task_id: CronSpec}` of the tasks counted
+    invalid: `{task_id: error}` of the tasks whose spec does not parse
+    """
+
+    def __init__(self, start: datetime.datetime, seconds: int):
+        self.start = start
+        self.per_second = [0] * seconds
+        self.per_host: Dict[int, List[int]] = {}
+        self.invalid: Dict[int, str] = {}
+        self.specs: Dict[int, CronSpec] = {}
+        self._fires: Dict[int, List[int]] = {}  # {task_id: offsets of its fires in the window}
+
+    def _add(self, task_id: int, spec: CronSpec, offsets: List[int], host_ids: Iterable[int]):
+        self._fires[task_id] = offsets
+        self.specs[task_id] = spec
+        for offset in offsets:
+            self.per_second[offset] += 1
+        for host_id in host_ids:
+            counts = self.per_host.setdefault(host_id, [0] * len(self.per_second))
+            for offset in offsets:
+                counts[offset] += 1
+
+    def peaks(self, top: int = 10, host_id: int = None) -> List[Tuple[datetime.datetime, int]]:
+        """
+        The `top` busiest seconds, of all tasks or of the tasks of one host, `(time, fire count)` busiest first
+        """
+        counts = self.per_second if host_id is None else self.per_host.get(host_id, [])
+        busiest = heapq.nlargest(top, range(len(counts)), key=counts.__getitem__)
+        return [(self.start + datetime.timedelta(seconds=i), counts[i]) for i in busiest if counts[i]]
+
+    def histogram(self, bucket: int = 60, host_id: int = None) -> List[int]:
+        """
+        Fire counts per `bucket` seconds, of all tasks or of the tasks of one host
+        """
+        counts = self.per_second if host_id is None else self.per_host.get(host_id, [])
+        return [sum(counts[i:i + bucket]) for i in range(0, len(counts), bucket)]
+
+    def suggest_jitter(self, max_shift: int = 300, max_per_second: int = None) -> Dict[int, str]:
+        """
+        `{task_id: new spec}` delaying tasks by up to `max_shift` seconds(within their hour) so
+        that at most `max_per_second` tasks fire in the same second, by default the busiest second spread
+        over `max_shift + 1` seconds. Tasks firing at several seconds of a minute, or `@every` tasks, are not moved.
+        """
+        counts = list(self.per_second)
+        busy = [count for count in counts if count]
+        if not busy:
+            return {}
+        if max_per_second is None:  # as if the busiest second could spread over `max_shift` seconds
+            max_per_second = max(1, -(-max(busy) // (max_shift + 1)))
+        suggestions = {}
+        # move the tasks with the fewest fires first, they are the cheapest to move
+        for task_id in sorted(self._fires, key=lambda task_id: len(self._fires[task_id])):
+            spec, offsets = self.specs[task_id], self._fires[task_id]
+            if not offsets or max(counts[i] for i in offsets) <= max_per_second:
+                continue
+            best, best_load = 0, self._load(counts, offsets, 0)
+            for shift in range(1, max_shift + 1):
+                try:
+                    spec.shifted(shift)
+                except ValueError:
+                    break
+                load = self._load(counts, offsets, shift)
+                if load < best_load:
+                    best, best_load = shift, load
+                    if load == 0:
+                        break
+            if best:
+                for offset in offsets:
+                    counts[offset] -= 1
+                    if offset + best < len(counts):
+                        counts[offset + best] += 1
+                suggestions[task_id] = spec.shifted(best)
+        return suggestions
+
+    @staticmethod
+    def _load(counts: List[int], offsets: List[int], shift: int) -> int:
+        # fires already at the seconds the task would fire at, not counting the task itself
+        size = len(counts)
+        return max(counts[i + shift] - (shift == 0) for i in offsets if i + shift < size) if offsets else 0
+
+
+def analyze(tasks: Iterable[dict], start: datetime.datetime, days: float = 1) -> ScheduleReport:
+    """
+    Count the fires of `tasks`(records of `get_tasks`) in every second of `[start, start + days)`,
+    disabled tasks and sub tasks(which only run after their main task) are skipped
+    """
+    start = start.replace(microsecond=0)
+    seconds = int(days * DAY)
+    end = start + datetime.timedelta(seconds=seconds)
+    report = ScheduleReport(start, seconds)
+    specs: Dict[str, CronSpec] = {}
+    fires: Dict[str, List[int]] = {}  # offsets are computed once per distinct spec
+    for task in tasks:
+        if not task.get("status") or task.get("level", 1) != 1:
+            continue
+        text = task.get("spec") or ""
+        if text not in specs:
+            try:
+                specs[text] = CronSpec.parse(text)
+            except ValueError as e:
+                report.invalid[task["id"]] = str(e)
+                continue
+            fires[text] = list(specs[text].offsets(start, end))
+        host_ids = [host["host_id"] for host in task.get("hosts") or ()]
+        report._add(task["id"], specs[text], fires[text], host_ids)
+    return report
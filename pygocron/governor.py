@@ -0,0 +1,142 @@
+"""
+Client-side backpressure: a rate limit and an adaptive concurrency limit shared by all calls of a client.
+
+```python
+pgc = PyGoCron(governor=True)  # or Governor(rate=50, max_limit=64), which can be shared by several clients
+pgc.delete_tasks(tag="Test")  # as many concurrent calls as the server takes, no `max_workers` to tune
+print(pgc.stats()["governor"])  # {"limit": 23.5, "in_flight": 23, "rate": 50, ...}
+```
+
+Every call first takes a concurrency slot, then a token from a token bucket(`rate` calls
+per second, up to `burst` at once). The number of slots follows AIMD: it grows by about
+one per round trip while calls are fast and succeed, and is cut by `backoff` when a call
+fails with a server error(5xx, 429, connection error or timeout) or takes more than
+`latency_tolerance` times(and 10ms more than) the fastest recent latency. At most one cut
+happens per round trip, calls already in flight when the limit was cut don't cut it again.
+"""
+import threading
+import time
+from typing import Optional
+
+LATENCY_SLACK = 0.01  # latency noise under this(seconds) is never taken for congestion
+
+
+class Governor:
+    """
+    Params
+    -----
+    rate: max calls per second, `None` for no rate limit
+    burst: max calls sent at once after an idle period, defaults to `rate`(at least 1)
+    initial_limit: concurrency limit at start
+    min_limit: the limit never goes below
+    max_limit: the limit never goes above, it is also the number of threads the bulk methods use
+    backoff: factor of the multiplicative decrease
+    latency_tolerance: a call slower than this times the fastest recent latency means the server is congested
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.7,
+        latency_tolerance: float = 3,
+    ):
+        if not 0 < backoff < 1:
+            raise ValueError("`backoff` must be between 0 and 1")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Need 1 <= `min_limit` <= `initial_limit` <= `max_limit`")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate or 1, 1)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._baseline = None  # fastest recent latency, drifts up by 1% per call
+        self._seq = 0  # number of calls started
+        self._cut_seq = 0  # calls started before the last cut don't cut again
+        self._counts = {"calls": 0, "congested": 0, "cuts": 0, "throttled": 0}
+        self._cond = threading.Condition()
+
+    def _take_token(self) -> float:
+        # seconds to wait for a token, 0 when one was taken
+        if self.rate is None:
+            return 0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> tuple:
+        """
+        Block until the call may be sent, pass the returned token to `release`
+        """
+        with self._cond:
+            waited = False
+            while self.in_flight >= int(self.limit):
+                waited = True
+                self._cond.wait()
+            self.in_flight += 1  # hold the slot while waiting for a token
+            delay = self._take_token()
+            while delay:
+                waited = True
+                self._cond.wait(delay)
+                delay = self._take_token()
+            self._seq += 1
+            if waited:
+                self._counts["throttled"] += 1
+            return self._seq, time.monotonic()
+
+    def release(self, token: tuple, overloaded: bool = False):
+        """
+        Free the slot of a finished call and adapt the limit
+
+        Params
+        -----
+        token: returned by `acquire`
+        overloaded: the call failed in a way that means the server is overloaded(5xx, 429, connection error, timeout)
+        """
+        seq, start = token
+        latency = time.monotonic() - start
+        with self._cond:
+            self.in_flight -= 1
+            self._counts["calls"] += 1
+            if not overloaded:
+                self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.01)
+                threshold = max(self._baseline * self.latency_tolerance, self._baseline + LATENCY_SLACK)
+                overloaded = latency > threshold
+                if overloaded:
+                    self._counts["congested"] += 1
+            if overloaded:
+                if seq > self._cut_seq:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._cut_seq = self._seq
+                    self._counts["cuts"] += 1
+            elif self.in_flight + 1 >= int(self.limit):  # only grow a limit that is actually used
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        """
+        `{"limit", "in_flight", "rate", "tokens", "baseline", "calls", "congested", "cuts", "throttled"}`:
+        current limits, the fastest recent latency(seconds), the number of calls, of slow calls,
+        of limit cuts and of calls that had to wait
+        """
+        with self._cond:
+            return dict(
+                self._counts,
+                limit=self.limit,
+                in_flight=self.in_flight,
+                rate=self.rate,
+                tokens=self._tokens if self.rate is not None else None,
+                baseline=self._baseline,
+            )
@@ -0,0 +1,104 @@
+"""
+Logging of pygocron, all messages go to the `pygocron` logger of the stdlib `logging`.
+
+The library only attaches a `NullHandler`, so nothing is printed until the
+application configures logging, either the usual way or by:
+
+```python
+from pygocron.log import configure_logging
+
+listener = configure_logging("INFO", rich=True)  # messages are rendered in a background thread
+```
+
+Besides the stdlib levels there is a `SUCCESS` level(25) between `INFO` and `WARNING`,
+used for completed operations such as a created or triggered task.
+"""
+import atexit
+import logging
+from typing import Union
+
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+FORMAT = "%(asctime)s-%(name)s :%(levelname)s: %(message)s"
+DATE_FORMAT = "%Y/%m/%d %H:%M:%S"
+
+logger = logging.getLogger("pygocron")
+logger.addHandler(logging.NullHandler())
+
+_listener = None
+
+
+def success(message: str, *args):
+    """
+    Log `message % args` at `SUCCESS` level, nothing is formatted when the level is disabled
+    """
+    if logger.isEnabledFor(SUCCESS):
+        logger.log(SUCCESS, message, *args)
+
+
+def _rich_handler() -> logging.Handler:
+    try:
+        from rich.logging import RichHandler
+    except ImportError:
+        raise ImportError("rich output needs `rich`, run `pip install rich`") from None
+    handler = RichHandler(show_path=False)
+    handler.setFormatter(logging.Formatter("%(message)s", DATE_FORMAT))
+    return handler
+
+
+def configure_logging(
+    level: Union[int, str] = logging.INFO,
+    rich: bool = False,
+    handler: logging.Handler = None,
+):
+    """
+    Send the messages of the `pygocron` logger through a queue to a handler running
+    in a background thread, so logging never blocks a request on console or file I/O.
+    Calling it again replaces the previous configuration.
+
+    Return the started `logging.handlers.QueueListener`, it is stopped(and the queue
+    flushed) at interpreter exit, or by `unconfigure_logging()`.
+
+    Params
+    -----
+    level: minimal level of the messages, for instance `logging.INFO`, `"SUCCESS"` or `"WARNING"`
+    rich: render the messages with `rich`(needs `pip install rich`)
+    handler: the handler writing the messages, default is a `StreamHandler` on stderr
+    """
+    global _listener
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    if handler is None:
+        if rich:
+            handler = _rich_handler()
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(FORMAT, DATE_FORMAT))
+
+    unconfigure_logging()
+    records = queue.Queue()  # no `queue.SimpleQueue` before python 3.7
+    queue_handler = QueueHandler(records)
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+    _listener.queue_handler = queue_handler
+    _listener.start()
+    return _listener
+
+
+def unconfigure_logging():
+    """
+    Stop the listener started by `configure_logging` and detach its queue handler
+    """
+    global _listener
+    if _listener is None:
+        return
+    logger.removeHandler(_listener.queue_handler)
+    if _listener._thread is not None:  # not stopped by the caller already
+        _listener.stop()
+    _listener = None
+
+
+atexit.register(unconfigure_logging)
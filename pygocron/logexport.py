@@ -0,0 +1,165 @@
+"""
+Stream gocron task logs to JSON lines files, optionally gzipped and split in chunks.
+
+```python
+export = pgc.export_task_logs("logs.jsonl.gz", since="2022-11-25", result_limit=1000)
+export = pgc.export_task_logs("logs/runs.jsonl.gz", chunk_records=100000)  # runs-00001.jsonl.gz, ...
+print(export.records, export.files)
+```
+
+Pages are fetched one at a time and every record is written as soon as it is read, so
+memory is bounded by one page(`page_size` records with their run output) whatever the
+number of logs. A file is written under a `.part` name and renamed once complete, so a
+reader picking up finished chunks never sees a half written one.
+"""
+import json
+import os
+from typing import IO, Iterable, Iterator, List, NamedTuple, Union
+
+
+class LogExport(NamedTuple):
+    records: int
+    files: List[str]
+
+
+def in_time_range(records: Iterable[dict], since: str = None, until: str = None) -> Iterator[dict]:
+    """
+    Yield the records started in `[since, until)`, `records` must be newest first(as gocron lists them),
+    the walk stops at the first record started before `since`
+
+    Params
+    -----
+    records: task log records, newest first
+    since: only logs started at or after this time, for instance `2022-11-25` or `2022-11-25T10:00:00`
+    until: only logs started before this time
+    """
+    for record in records:
+        start_time = record.get("start_time") or ""
+        if since is not None and start_time < since:
+            return
+        if until is None or start_time < until:
+            yield record
+
+
+def chunk_path(path: str, index: int) -> str:
+    """
+    Name of the `index`th chunk of `path`: `logs.jsonl.gz` gives `logs-00001.jsonl.gz`
+    """
+    root, ext = os.path.splitext(path)
+    if ext == ".gz":
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return f"{root}-{index:05d}{ext}"
+
+
+class JsonLinesWriter:
+    """
+    Write records as JSON lines to `output`, gzipped when the file name ends with `.gz`
+
+    Params
+    -----
+    output: file name, or an open text stream(never chunked, nor closed)
+    chunk_records: start a new file every this many records, files are named by `chunk_path`
+    compresslevel: gzip compression level, 1(fastest) to 9(smallest)
+    """
+
+    def __init__(self, output: Union[str, IO], chunk_records: int = None, compresslevel: int = 6):
+        if chunk_records is not None and chunk_records < 1:
+            raise ValueError("`chunk_records` must be at least 1")
+        if chunk_records is not None and not isinstance(output, str):
+            raise ValueError("Only a file name can be split in chunks")
+        self.output = output
+        self.chunk_records = chunk_records
+        self.compresslevel = compresslevel
+        self.records = 0
+        self.files = []
+        self._file = None
+        self._path = None
+        self._in_chunk = 0
+
+    def _open(self):
+        if not isinstance(self.output, str):
+            self._file = self.output
+            return
+        self._path = chunk_path(self.output, len(self.files) + 1) if self.chunk_records else self.output
+        if self._path.endswith(".gz"):
+            import gzip  # only load it when compressing
+
+            self._file = gzip.open(self._path + ".part", "wt", encoding="utf-8", compresslevel=self.compresslevel)
+        else:
+            self._file = open(self._path + ".part", "w", encoding="utf-8")
+
+    def _close(self):
+        if self._file is None:
+            return
+        if self._path is None:
+            self._file.flush()
+        else:
+            self._file.close()
+            os.replace(self._path + ".part", self._path)
+            self.files.append(self._path)
+        self._file, self._path, self._in_chunk = None, None, 0
+
+    def write(self, record: dict):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+        self.records += 1
+        self._in_chunk += 1
+        if self.chunk_records and self._in_chunk >= self.chunk_records:
+            self._close()
+
+    def close(self) -> LogExport:
+        """
+        Finish the current file, an export without any record still writes one empty file
+        """
+        if self._file is None and not self.files:
+            self._open()
+        self._close()
+        return LogExport(self.records, self.files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None and self._path is not None:  # don't leave a truncated file behind
+            self._file.close()
+            os.remove(self._path + ".part")
+
+
+def export_task_logs(
+    client,
+    output: Union[str, IO],
+    since: str = None,
+    until: str = None,
+    result_limit: int = None,
+    chunk_records: int = None,
+    page_size: int = 100,
+    compresslevel: int = 6,
+    **filters,
+) -> LogExport:
+    """
+    Write all the task logs(newest first) matching the filters as JSON lines
+
+    Params
+    -----
+    client: a `PyGoCron` object
+    output: file name(gzipped when it ends with `.gz`), or an open text stream
+    since: only logs started at or after this time, for instance `2022-11-25` or `2022-11-25T10:00:00`
+    until: only logs started before this time
+    result_limit: keep at most this many chars of the run output(`result`), 0 to drop it
+    chunk_records: start a new file every this many records
+    page_size: records per request, the most records held in memory
+    compresslevel: gzip compression level
+    filters: filters of `get_task_logs`, for instance `task_id=1`
+    """
+    records = client.iter_task_logs(
+        page_size=page_size, max_page_size=page_size, prefetch=False, result_limit=result_limit, **filters
+    )
+    with JsonLinesWriter(output, chunk_records, compresslevel) as writer:
+        for record in in_time_range(records, since, until):
+            writer.write(record)
+    return LogExport(writer.records, writer.files)
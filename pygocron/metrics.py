@@ -0,0 +1,186 @@
+"""
+Per-endpoint instrumentation of the http calls of a client.
+
+```python
+pgc = PyGoCron(metrics=True)
+...
+print(pgc.stats())  # {"endpoints": {"GET /api/task": {"count": 12, "p95": 0.031, ...}}, "errors": {...}}
+```
+
+Hooks forward every call to your own monitoring(Prometheus, OpenTelemetry, ...):
+
+```python
+metrics = Metrics()
+metrics.add_response_hook(lambda sample: histogram.labels(sample.endpoint).observe(sample.elapsed))
+pgc = PyGoCron(metrics=metrics)
+```
+
+Without `metrics` a client records nothing and pays a single `is None` check per call.
+"""
+import bisect
+import re
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from pygocron import _api
+from pygocron.log import logger
+
+# latency bucket upper bounds(seconds), ~19% apart from 0.5ms up to 2 minutes
+BUCKETS = tuple(0.0005 * 2 ** (i / 4) for i in range(72))
+
+_ID = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint(call: _api.Call) -> str:
+    """
+    `METHOD /path` of a call, with ids replaced by `{id}`, for instance `POST /api/task/run/{id}`
+    """
+    return f"{call.method} /{_ID.sub('/{id}', call.path.lstrip('/'))}"
+
+
+class Sample(NamedTuple):
+    """
+    One finished http call
+
+    endpoint: see `endpoint`
+    call: the `Call`
+    status_code: http status, `None` when no response was received
+    elapsed: seconds from sending the request to receiving the whole response
+    error: `None` on success, else the gocron `message`, `HTTP <status>` or the exception class name
+    """
+
+    endpoint: str
+    call: _api.Call
+    status_code: Optional[int]
+    elapsed: float
+    error: Optional[str]
+
+
+class Histogram:
+    """
+    Latency histogram over fixed exponential buckets, constant memory whatever the number of samples
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the `q`(0-100) percentile, capped by the max value
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+class _Endpoint:
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = {}  # {message: count}
+
+
+class Metrics:
+    """
+    Counts, error messages and latency histograms of the calls of a client, grouped by endpoint
+    """
+
+    def __init__(self):
+        self.request_hooks: List[Callable[[str, _api.Call], None]] = []
+        self.response_hooks: List[Callable[[Sample], None]] = []
+        self._endpoints = {}  # {endpoint: _Endpoint}
+        self._lock = threading.Lock()
+
+    def add_request_hook(self, hook: Callable[[str, _api.Call], None]):
+        """
+        Call `hook(endpoint, call)` before every request
+        """
+        self.request_hooks.append(hook)
+
+    def add_response_hook(self, hook: Callable[[Sample], None]):
+        """
+        Call `hook(sample)` after every request, a `Sample` is given for failed requests too
+        """
+        self.response_hooks.append(hook)
+
+    def _run_hooks(self, hooks: list, *args):
+        for hook in hooks:
+            try:
+                hook(*args)
+            except Exception:  # a broken hook must not break the call
+                logger.exception("pygocron metrics hook %r failed", hook)
+
+    def start(self, call: _api.Call) -> tuple:
+        """
+        Mark the start of a request, pass the returned token to `finish`
+        """
+        name = endpoint(call)
+        if self.request_hooks:
+            self._run_hooks(self.request_hooks, name, call)
+        return name, call, time.perf_counter()
+
+    def finish(self, token: tuple, status_code: int = None, body: bytes = None, exc: BaseException = None) -> Sample:
+        """
+        Record the response(or the exception `exc`) of a request started by `start`
+        """
+        name, call, start = token
+        elapsed = time.perf_counter() - start
+        if exc is not None:
+            error = type(exc).__name__
+        else:
+            error = _api.response_error(call, status_code, body)
+        sample = Sample(name, call, status_code, elapsed, error)
+        self.record(sample)
+        if self.response_hooks:
+            self._run_hooks(self.response_hooks, sample)
+        return sample
+
+    def record(self, sample: Sample):
+        with self._lock:
+            stats = self._endpoints.get(sample.endpoint)
+            if stats is None:
+                stats = self._endpoints[sample.endpoint] = _Endpoint()
+            stats.latency.add(sample.elapsed)
+            if sample.error is not None:
+                stats.errors[sample.error] = stats.errors.get(sample.error, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict:
+        """
+        `{"endpoints": {endpoint: {"count", "errors", "mean", "p50", "p95", "p99", "max"}}, "errors": {message: count}}`,
+        latencies are in seconds, `errors` of an endpoint is `{message: count}`
+        """
+        endpoints, errors = {}, {}
+        with self._lock:
+            for name, stats in sorted(self._endpoints.items()):
+                latency = stats.latency
+                endpoints[name] = {
+                    "count": latency.count,
+                    "errors": dict(stats.errors),
+                    "mean": latency.sum / latency.count,
+                    "p50": latency.percentile(50),
+                    "p95": latency.percentile(95),
+                    "p99": latency.percentile(99),
+                    "max": latency.max,
+                }
+                for message, count in stats.errors.items():
+                    errors[message] = errors.get(message, 0) + count
+        return {"endpoints": endpoints, "errors": errors}
@@ -0,0 +1,142 @@
+"""
+Compact typed records of the gocron web api.
+
+```python
+for log in pgc.iter_task_logs(typed=True, result_limit=0):  # drop the run output
+    if log.status is RunStatus.FAILED:
+        print(log.id, log.name, log.start_time)
+```
+
+Models use `__slots__`, so a `TaskLog` takes a fraction of the memory of the
+response dict. `to_dict()` gives the dict of the api back, fields unknown to a
+model are kept in `extra`.
+
+The run output(`result`) is not decoded lazily: neither json nor orjson can skip a
+field, so a whole page is decoded first. `result_limit` only shrinks what is kept
+after that, a smaller `page_size` is what bounds the peak memory of a listing.
+"""
+from typing import List, Optional
+
+from pygocron._api import RunStatus, run_status
+
+
+def trim_result(record: dict, result_limit: Optional[int]) -> dict:
+    """
+    Drop(`result_limit=0`) or truncate the `result`(run output) of a task log record in place,
+    the record was already decoded in full
+    """
+    if result_limit is not None and record.get("result"):
+        record["result"] = record["result"][:result_limit] if result_limit else None
+    return record
+
+
+class _Model:
+    __slots__ = ("extra",)
+    FIELDS = ()
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        self.extra = fields or None
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        return cls(**record)
+
+    def to_dict(self) -> dict:
+        record = {name: getattr(self, name) for name in self.FIELDS}
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.to_dict() == self.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id!r}, name={self.name!r})"
+
+
+class Task(_Model):
+    """
+    A task record of `api/task`, `status` is 1 for enabled and 0 for disabled
+    """
+
+    FIELDS = (
+        "id",
+        "name",
+        "spec",
+        "command",
+        "tag",
+        "level",
+        "dependency_status",
+        "dependency_task_id",
+        "protocol",
+        "http_method",
+        "timeout",
+        "multi",
+        "notify_status",
+        "notify_type",
+        "notify_keyword",
+        "notify_receiver_id",
+        "retry_times",
+        "retry_interval",
+        "remark",
+        "status",
+        "created",
+        "deleted",
+        "next_run_time",
+        "hosts",
+    )
+    __slots__ = FIELDS
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.status)
+
+    @property
+    def host_ids(self) -> List[int]:
+        return [host["host_id"] for host in self.hosts or ()]
+
+
+class TaskLog(_Model):
+    """
+    A run record of `api/task/log`, `status` is a `RunStatus`
+    """
+
+    FIELDS = (
+        "id",
+        "task_id",
+        "name",
+        "spec",
+        "protocol",
+        "command",
+        "timeout",
+        "retry_times",
+        "hostname",
+        "start_time",
+        "end_time",
+        "status",
+        "result",
+        "total_time",
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        super().__init__(**fields)
+        if self.status is not None and not isinstance(self.status, RunStatus):
+            self.status = run_status(self.status)
+
+    def to_dict(self) -> dict:
+        record = super().to_dict()
+        if self.status is not None:
+            record["status"] = self.status.value
+        return record
+
+
+class Node(_Model):
+    """
+    A node(host) record of `api/host/all`
+    """
+
+    FIELDS = ("id", "name", "port", "alias", "remark")
+    __slots__ = FIELDS
@@ -0,0 +1,82 @@
+"""
+Walk through a paginated gocron listing lazily.
+
+The next page is fetched in a background thread while the caller consumes the
+current one, so at most two pages are held in memory at any time.
+"""
+import time
+from typing import Callable, Iterator, List, Tuple
+
+from pygocron import _api
+
+
+def _fetch(fetch: Callable, page: int, page_size: int) -> Tuple[dict, float]:
+    start = time.monotonic()
+    data = fetch(page, page_size)
+    return data, time.monotonic() - start
+
+
+def _next_page_size(page_size: int, offset: int, latency: float, min_page_size: int, max_page_size: int, target_latency: float) -> int:
+    # a page boundary must stay on `offset`, so only grow when `offset` is a multiple of the bigger size
+    if latency < target_latency / 2 and page_size * 2 <= max_page_size and offset % (page_size * 2) == 0:
+        return page_size * 2
+    if latency > target_latency * 2 and page_size // 2 >= min_page_size and page_size % 2 == 0:
+        return page_size // 2
+    return page_size
+
+
+def iter_pages(
+    fetch: Callable[[int, int], dict],
+    page_size: int = 50,
+    min_page_size: int = 10,
+    max_page_size: int = _api.LIST_PAGE_SIZE,
+    target_latency: float = 0.5,
+    prefetch: bool = True,
+) -> Iterator[List[dict]]:
+    """
+    Yield the `data` list of every page
+
+    Params
+    -----
+    fetch: `fetch(page, page_size)` returns one page of a listing, for instance `{"total": 100, "data": [...]}`
+    page_size: size of the first page
+    min_page_size: page size never shrinks below this
+    max_page_size: page size never grows above this
+    target_latency: the page size doubles when a page takes less than half of it, and halves when a page takes more than twice of it
+    prefetch: fetch the next page in background while the current page is being consumed
+    """
+    from concurrent.futures import ThreadPoolExecutor  # slow to import, only load it when paging
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    offset = 0
+    try:
+        future = executor.submit(_fetch, fetch, 1, page_size) if prefetch else None
+        data, latency = future.result() if prefetch else _fetch(fetch, 1, page_size)
+        while True:
+            records = data["data"]
+            offset += len(records)
+            last = not records or len(records) < page_size or offset >= data["total"]
+            if not last:
+                page_size = _next_page_size(
+                    page_size, offset, latency, min_page_size, max_page_size, target_latency
+                )
+                page = offset // page_size + 1
+                if prefetch:
+                    future = executor.submit(_fetch, fetch, page, page_size)
+            data = None  # drop the reference, so only the yielded page and the prefetched page stay in memory
+            yield records
+            if last:
+                return
+            del records
+            data, latency = future.result() if prefetch else _fetch(fetch, page, page_size)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def iter_records(fetch: Callable[[int, int], dict], **kwargs) -> Iterator[dict]:
+    """
+    Yield records of all pages one by one, see `iter_pages` for the params
+    """
+    for records in iter_pages(fetch, **kwargs):
+        yield from records
@@ -0,0 +1,97 @@
+"""
+Node health and load-aware placement of new tasks on the gocron nodes.
+
+```python
+health = pgc.check_nodes(timeout=3)  # {node_id: NodeHealth(node_id, alias, healthy, latency, error)}
+task_id = pgc.create_task("job", "0 0 0 * * *", "echo 1", host_id=AUTO_HOST)  # on the least loaded healthy node
+
+placement = pgc.host_placement()  # one snapshot of the loads, reused for many tasks
+for name in names:
+    pgc.create_task(name, "0 0 0 * * *", "echo 1", host_id=placement)
+```
+
+The load of a node is the number of enabled tasks on it, plus the number of its
+running runs(times `running_weight`). Every pick adds one to the load of the picked
+node, so the tasks of a batch spread over the nodes instead of all landing on
+the node that was the least loaded at the start.
+"""
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from pygocron._api import PyGocronException
+
+AUTO_HOST = "auto"
+
+
+class NodeHealth(NamedTuple):
+    """
+    node_id: node(host) id
+    alias: node alias
+    healthy: whether gocron could reach the node
+    latency: seconds of the ping
+    error: the error of an unhealthy node
+    """
+
+    node_id: int
+    alias: str
+    healthy: bool
+    latency: float
+    error: Optional[str]
+
+
+def host_loads(
+    nodes: Iterable[dict], tasks: Iterable[dict], running_logs: Iterable[dict], running_weight: float = 1
+) -> Dict[int, float]:
+    """
+    `{node_id: load}` of the nodes, `tasks` are the enabled tasks and `running_logs` the running runs
+    """
+    nodes = list(nodes)
+    loads = {node["id"]: 0.0 for node in nodes}
+    for task in tasks:
+        for host in task.get("hosts") or ():
+            if host["host_id"] in loads:
+                loads[host["host_id"]] += 1
+    # a run record only has the `hostname` of its node, `name:port`(possibly after the alias)
+    addresses = {f"{node['name']}:{node['port']}": node["id"] for node in nodes}
+    for log in running_logs:
+        node_id = addresses.get(host_address(log.get("hostname") or ""))
+        if node_id is not None:
+            loads[node_id] += running_weight
+    return loads
+
+
+def host_address(hostname: str) -> str:
+    """
+    The `name:port` of the `hostname` of a run record, `alias - name:port` or `name:port`
+    """
+    return hostname.rpartition(" - ")[2].strip()
+
+
+class HostPlacement:
+    """
+    Pick the least loaded node for every new task
+
+    Params
+    -----
+    loads: `{node_id: load}` of the nodes tasks can be placed on
+    """
+
+    def __init__(self, loads: Dict[int, float]):
+        self._loads = dict(loads)
+        self._lock = threading.Lock()
+
+    @property
+    def loads(self) -> Dict[int, float]:
+        with self._lock:
+            return dict(self._loads)
+
+    def pick(self) -> int:
+        """
+        The id of the least loaded node(the lowest id on ties), its load grows by one task
+        """
+        with self._lock:
+            if not self._loads:
+                raise PyGocronException("No healthy node to place the task on")
+            node_id = min(self._loads, key=lambda node: (self._loads[node], node))
+            self._loads[node_id] += 1
+            return node_id
@@ -0,0 +1,76 @@
+"""
+Wait until a record becomes visible, polling with exponential backoff and jitter.
+
+gocron writes tasks and task logs asynchronously, so a freshly created task or a
+freshly triggered run shows up in the listings after a short, unpredictable delay.
+"""
+import random
+import time
+from typing import Any, Callable
+
+from pygocron._api import PyGocronTimeout
+
+
+def backoff_delays(
+    initial_delay: float = 0.05,
+    max_delay: float = 1,
+    factor: float = 2,
+    jitter: float = 0.1,
+):
+    """
+    Yield endless sleep intervals: `initial_delay`, `initial_delay * factor`, ... capped at `max_delay`,
+    each one randomly stretched or shrunk by up to `jitter`(a ratio)
+    """
+    delay = initial_delay
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, max_delay)
+
+
+def wait_until(
+    probe: Callable[[], Any],
+    timeout: float = 10,
+    description: str = "record",
+    **backoff,
+):
+    """
+    Call `probe` until it returns something other than `None`, and return that value
+
+    Params
+    -----
+    probe: a function returning `None` while the record is not visible yet
+    timeout: deadline(seconds), raise `PyGocronTimeout` when it passes
+    description: what we are waiting for, used in the timeout message
+    backoff: params of `backoff_delays`
+    """
+    deadline = time.monotonic() + timeout
+    for delay in backoff_delays(**backoff):
+        value = probe()
+        if value is not None:
+            return value
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise PyGocronTimeout(f"Timeout waiting for {description} after {timeout} seconds")
+        time.sleep(min(delay, remaining))
+
+
+async def async_wait_until(
+    probe: Callable[[], Any],
+    timeout: float = 10,
+    description: str = "record",
+    **backoff,
+):
+    """
+    Asyncio version of `wait_until`, `probe` is a coroutine function
+    """
+    import asyncio  # only the async client needs it, keep it out of `import pygocron.pygocron`
+
+    deadline = time.monotonic() + timeout
+    for delay in backoff_delays(**backoff):
+        value = await probe()
+        if value is not None:
+            return value
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise PyGocronTimeout(f"Timeout waiting for {description} after {timeout} seconds")
+        await asyncio.sleep(min(delay, remaining))
@@ -1,19 +1,36 @@
-import time
-import requests
+import logging
 import os
-import json
-import datetime
-from copy import deepcopy
+import threading
+import time
 from urllib.parse import urljoin
 from enum import Enum
-from rich import print as rprint
-
-
-class RunStatus(Enum):
-    FAILED: int = 0
-    RUNNING: int = 1
-    SUCCESS: int = 2
-    PENDING: int = 3
+from typing import IO, TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Union
+
+from pygocron import _api, reconcile
+from pygocron._api import (  # noqa: F401
+    BulkSummary,
+    PyGocronException,
+    PyGocronTimeout,
+    RunStatus,
+    TaskResult,
+)
+from pygocron._concurrent import SingleFlight, map_settled
+from pygocron.auth import TokenCache
+from pygocron.cache import TaskIndex
+from pygocron.governor import Governor
+from pygocron.log import SUCCESS, logger, success
+from pygocron.metrics import Metrics
+from pygocron.models import Node, Task, TaskLog, trim_result
+from pygocron.paging import iter_records
+from pygocron.placement import AUTO_HOST, HostPlacement, NodeHealth, host_loads
+from pygocron.polling import wait_until
+from pygocron.tracker import sweep_task_logs
+
+if TYPE_CHECKING:  # imported lazily, only `analyze_schedule` and `export_task_logs` need them
+    import datetime
+
+    from pygocron.cronspec import ScheduleReport
+    from pygocron.logexport import LogExport
 
 
 class LogLevel(Enum):
@@ -24,60 +41,235 @@ class LogLevel(Enum):
     DEBUG: str = "DEBUG"
 
 
-class PyGocronException(Exception):
-    pass
+_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.SUCCESS: SUCCESS,
+    LogLevel.WARN: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.DEBUG: logging.DEBUG,
+}
 
 
 def logger_print(message: str, level: LogLevel = LogLevel.INFO):
-    this_moment = datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S")
-    message_prefix = f"{this_moment}-pygocron"
-    if level == LogLevel.INFO:
-        message_prefix = message_prefix + f"[blue b] :{level.value}: [/]"
-    if level == LogLevel.SUCCESS:
-        message_prefix = message_prefix + f"[green b] :{level.value}: [/]"
-    if level == LogLevel.WARN:
-        message_prefix = message_prefix + f"[red b] :{level.value}: [/]"
-    if level == LogLevel.ERROR:
-        message_prefix = message_prefix + f"[red b] :{level.value}: [/]"
-    if level == LogLevel.DEBUG:
-        message_prefix = message_prefix + f"[blue b] :{level.value}: [/]"
-    message = message_prefix + message
-    rprint(message)
+    """
+    Kept for compatibility, log `message` to the `pygocron` logger, see `pygocron.log`
+    """
+    logger.log(_LEVELS[level], message)
 
 
 class PyGoCron:
+    """
+    Client of the gocron web api, one instance can be shared by many threads
+    """
+
     def __init__(
         self,
         gocron_address: str = os.environ.get("GOCRON_ADDRESS", ""),
         gocron_admin_user: str = os.environ.get("GOCRON_ADMIN_USER", ""),
         gocron_admin_password: str = os.environ.get("GOCRON_ADMIN_PASSWORD", ""),
+        pool_size: int = 10,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        task_index: TaskIndex = None,
+        token_cache: Union[bool, str, TokenCache] = None,
+        metrics: Union[bool, Metrics] = None,
+        coalesce_reads: bool = True,
+        governor: Union[bool, Governor] = None,
     ):
+        """
+        Params
+        -----
+        gocron_address: gocron web server address, for instance `http://127.0.0.1:5920`
+        gocron_admin_user: admin username
+        gocron_admin_password: admin password
+        pool_size: max number of keep-alive connections kept to the gocron web server,
+            at least `max_limit` of the `governor`, so that every thread it allows keeps its connection
+        timeout: timeout(seconds) for every single http request
+        max_retries: retry times for idempotent `GET` requests(not run triggers) on connection errors or 502/503/504,
+            and also on a 429 when the client has a `governor`
+        backoff_factor: retry backoff factor, retries sleep `backoff_factor * 2 ** (retry - 1)` seconds
+        task_index: an optional `TaskIndex` caching task name -> task id lookups
+        token_cache: share the `Auth-Token` with other processes through a file, `True` for the default path
+            (`~/.cache/pygocron/tokens.json`), or a path, or a `TokenCache`
+        metrics: record per-endpoint counts, errors and latencies of the http calls, `True` or a `Metrics`
+            (to add hooks or share it between clients), read them by `stats()`
+        coalesce_reads: identical idempotent `GET` requests(not run triggers) issued at the same time by several threads share one in-flight request,
+            each caller still gets its own decoded copy of the response
+        governor: rate limit and adapt the concurrency of all calls to the load of the server, `True` or a `Governor`
+            (to tune it or share it between clients), the bulk methods then use as many threads as it allows
+
+        The client logs in lazily on the first request, and logs in again when the token expires
+        """
+        _api.check_credentials(gocron_address, gocron_admin_user, gocron_admin_password)
+        self.task_index = task_index
         self._base_url = gocron_address
+        self._username = gocron_admin_user
+        self._password = gocron_admin_password
         self._headers = None
-        self._authenticate(gocron_admin_user, gocron_admin_password)
-
-    def _authenticate(self, username, password):
-        if self._base_url == "" or username == "" or password == "":
-            raise ValueError(
-                "If you don't explicitly give PyGoCron` enough parameters("
-                "`gocron_address`, `gocron_admin_user`, `gocron_admin_password`),"
-                "then make sure set all of following enviroment varibles:`GOCRON_ADDRESS`,"
-                "`GOCRON_ADMIN_USER`, `GOCRON_ADMIN_PASSWORD`"
-            )
-
-        url = urljoin(self._base_url, "/api/user/login")
-        payload = {"username": username, "password": password}
-        response = requests.post(url, params=payload)
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "操作成功":
-                self._headers = {"Auth-Token": data["data"]["token"]}
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._session = None  # created on the first request, so that importing and constructing stay cheap
+        if token_cache is True:
+            token_cache = TokenCache()
+        elif isinstance(token_cache, str):
+            token_cache = TokenCache(token_cache)
+        self._token_cache = token_cache or None
+        self.metrics = Metrics() if metrics is True else metrics or None
+        self._run_poller = None
+        self._flights = SingleFlight() if coalesce_reads else None
+        self.governor = Governor() if governor is True else governor or None
+        self._pool_size = max(pool_size, int(self.governor.max_limit)) if self.governor is not None else pool_size
+        self._lock = threading.Lock()  # guards the lazily created session and run poller
+        self._auth_lock = threading.Lock()
+
+    @staticmethod
+    def _new_session(pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # no urllib3 retries, `_request` retries per call, so that a run trigger is never sent twice
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self):
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session(self._pool_size)
+                session = self._session
+        return session
+
+    def _get(self, path: str, timeout: float = None, **kwargs):
+        return self._get_session().get(
+            urljoin(self._base_url, path), timeout=timeout or self._timeout, **kwargs
+        )
+
+    def _post(self, path: str, timeout: float = None, **kwargs):
+        return self._get_session().post(
+            urljoin(self._base_url, path), timeout=timeout or self._timeout, **kwargs
+        )
+
+    def _send(self, call: _api.Call, auth_headers: dict = None):
+        if _api.is_retryable(call) and self._flights is not None:  # a run trigger is never shared
+            params = tuple(sorted((k, v) for k, v in (call.params or {}).items() if v is not None))
+            # a call resent with a refreshed token must not join a flight still holding the stale one
+            token = (auth_headers or {}).get("Auth-Token")
+            return self._flights.do((call.path, params, token), lambda: self._request(call, auth_headers))
+        return self._request(call, auth_headers)
+
+    def _request(self, call: _api.Call, auth_headers: dict = None):
+        from requests.exceptions import ConnectionError, Timeout  # already loaded with the session
+
+        retryable = _api.is_retryable(call)
+        retries = self._max_retries if call.retries is None else call.retries
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(self._backoff_factor * 2 ** (attempt - 1))
+            try:
+                response = self._governed(call, auth_headers)
+            except (ConnectionError, Timeout):
+                if not retryable or attempt == retries:
+                    raise
+                continue
+            status = response.status_code
+            # also resend a call rejected under the governor once it cut the limit, but only a retryable one:
+            # a `503` doesn't prove gocron didn't act on it, and a run trigger sent twice runs twice
+            rejected = self.governor is not None and status in _api.REJECTED_STATUS
+            if attempt == retries or not (retryable and (rejected or status in _api.RETRY_STATUS)):
+                return response
+
+    def _governed(self, call: _api.Call, auth_headers: dict = None):
+        if self.governor is None:
+            return self._measure(call, auth_headers)
+        token = self.governor.acquire()
+        try:
+            response = self._measure(call, auth_headers)
+        except Exception:
+            self.governor.release(token, overloaded=True)
+            raise
+        self.governor.release(token, overloaded=_api.is_overloaded(response.status_code))
+        return response
+
+    def _measure(self, call: _api.Call, auth_headers: dict = None):
+        send = self._get if call.method == "GET" else self._post
+        headers = _api.request_headers(call, auth_headers)
+        if self.metrics is None:
+            return send(call.path, timeout=call.timeout, headers=headers, params=call.params)
+        token = self.metrics.start(call)
+        try:
+            response = send(call.path, timeout=call.timeout, headers=headers, params=call.params)
+        except Exception as e:
+            self.metrics.finish(token, exc=e)
+            raise
+        self.metrics.finish(token, response.status_code, response.content)
+        return response
+
+    def _workers(self, max_workers: Optional[int]) -> int:
+        if max_workers is not None:
+            return max_workers
+        return int(self.governor.max_limit) if self.governor is not None else 10
+
+    def stats(self) -> dict:
+        """
+        Snapshot of the recorded http calls, see `Metrics.snapshot`, empty if the client has no `metrics`,
+        plus the current limits of the `governor` under `"governor"`, see `Governor.snapshot`
+        """
+        stats = self.metrics.snapshot() if self.metrics is not None else {}
+        if self.governor is not None:
+            stats["governor"] = self.governor.snapshot()
+        return stats
+
+    def _call(self, call: _api.Call):
+        if call.path == _api.LOGIN_PATH:
+            response = self._send(call)
+            return _api.parse(call, response.status_code, response.content)
+        if self._headers is None:
+            self._authenticate()
+        auth_headers = self._headers
+        response = self._send(call, auth_headers)
+        if _api.is_auth_error(response.status_code, response.content):
+            self._authenticate(stale_token=auth_headers["Auth-Token"])
+            response = self._send(call, self._headers)
+        return _api.parse(call, response.status_code, response.content)
+
+    def close(self):
+        """
+        Close all pooled connections
+        """
+        with self._lock:
+            run_poller, self._run_poller = self._run_poller, None
+            session, self._session = self._session, None
+        if run_poller is not None:
+            run_poller.close()
+        if session is not None:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _login(self) -> str:
+        return self._call(_api.login(self._username, self._password))["token"]
+
+    def _authenticate(self, stale_token: str = None):
+        with self._auth_lock:
+            # another thread may have logged in while we were waiting for the lock
+            if self._headers is not None and self._headers["Auth-Token"] != stale_token:
+                return
+            if self._token_cache is None:
+                token = self._login()
             else:
-                raise PyGocronException(f"Authentication error, details: {response.text}")
-        else:
-            raise PyGocronException(
-                f"Authentication error, details: {response.text}"
-            )
+                key = TokenCache.key(self._base_url, self._username)
+                token = self._token_cache.fetch(key, self._login, stale_token=stale_token)
+            self._headers = {"Auth-Token": token}
 
     def create_task(
         self,
@@ -90,7 +282,7 @@ class PyGoCron:
         dependency_task_id: str = "",
         protocol: int = 2,
         http_method: int = 1,
-        host_id: int = 1,
+        host_id: Union[int, str, HostPlacement] = 1,
         timeout: int = 0,
         multi: int = 2,
         notify_status: int = 1,
@@ -115,9 +307,9 @@ class PyGoCron:
         dependency_task_id: dependency task id
         protocol: 1 for `http` and  2 for `shell`, default is 2
         http_method: http_method, 1 for `get` method and 2 for `post` method
-        host_id: host id or node id 
+        host_id: host id or node id, `AUTO_HOST`(`"auto"`) for the least loaded healthy node, or a `HostPlacement` to pick from
         timeout: timeout(seconds)
-        multi: can be run in multi-instance or not 
+        multi: can be run in multi-instance or not
         notify_status: 0: not notify 1: notify when task fails,  2: notify when task finished
         notify_type: notify method 1: mail 2: slack 3: webhook
         notify_keyword: notify keyword
@@ -126,63 +318,166 @@ class PyGoCron:
         retry_interval: retry interval(seconds)
         remark: comment fot task
         """
+        host_id = self._resolve_host(host_id)
+        payload = _api.task_payload(
+            name=name,
+            spec=spec,
+            command=command,
+            tag=tag,
+            level=level,
+            dependency_status=dependency_status,
+            dependency_task_id=dependency_task_id,
+            protocol=protocol,
+            http_method=http_method,
+            host_id=host_id,
+            timeout=timeout,
+            multi=multi,
+            notify_status=notify_status,
+            notify_type=notify_type,
+            notify_keyword=notify_keyword,
+            notify_receiver_id=notify_receiver_id,
+            retry_times=retry_times,
+            retry_interval=retry_interval,
+            remark=remark,
+        )
+        self._call(_api.store_task(payload))
+        success("Task created: `%s`", name)
+        task_id = self.get_task_id_lagged(name=name)
+        if self.task_index is not None:
+            self.task_index.put(name, task_id, tag)
+        return task_id
+
+    def create_tasks(self, specs: List[dict], max_workers: int = None, wait: float = 10) -> List[TaskResult]:
+        """
+        Create tasks in bulk, return a `TaskResult(name, task_id, error)` for every spec in input order.
+        Tasks are stored concurrently, then all new task ids are looked up by a few paginated listings(one per tag)
 
-        payload = {
-            "id": "",
-            "name": name,
-            "spec": spec,
-            "command": command,
-            "tag": tag,
-            "level": level,
-            "dependency_status": dependency_status,
-            "dependency_task_id": dependency_task_id,
-            "spec": spec,
-            "protocol": protocol,
-            "http_method": http_method,
-            "host_id": host_id,
-            "timeout": timeout,
-            "multi": multi,
-            "notify_status": notify_status,
-            "notify_type": notify_type,
-            "notify_keyword": notify_keyword,
-            "notify_receiver_id": notify_receiver_id,
-            "retry_times": retry_times,
-            "retry_interval": retry_interval,
-            "remark": remark,
-        }
-        url = urljoin(self._base_url, "/api/task/store")
-        headers = deepcopy(self._headers)
-        headers["Content-Type"] = "application/x-www-form-urlencoded"
-        response = requests.post(url, headers=headers, params=payload)
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "保存成功":
-                logger_print(f"Task created:`{name}` successfully", LogLevel.SUCCESS)
-                return self.get_task_id_lagged(name=name)
-            else:
-                raise PyGocronException(
-                    f"Create task:`{name}` error, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(
-                f"Create task:`{name}` error, details: {response.text}"
-            )
+        Params
+        -----
+        specs: a list of dicts, each one holds the params of `create_task`, for instance `{"name": "job", "spec": "0 0 0 * * *", "command": "echo 1"}`,
+            the specs with `"host_id": AUTO_HOST` are spread over the healthy nodes by one `host_placement`,
+            a `host_id` can also be a `HostPlacement` to pick from
+        max_workers: max number of concurrent `/api/task/store` calls, defaults to 10, or to `max_limit` of the `governor`
+        wait: max seconds to wait for the created tasks to be ready in database
+        """
+        specs = list(specs)
+        placement = self.host_placement() if any(spec.get("host_id") == AUTO_HOST for spec in specs) else None
+        specs = [
+            dict(spec, host_id=self._resolve_host(spec["host_id"], placement)) if "host_id" in spec else spec
+            for spec in specs
+        ]
+        stored = map_settled(
+            lambda spec: self._call(_api.store_task(_api.task_payload(**spec))),
+            specs,
+            self._workers(max_workers),
+        )
+        created = [spec for spec, (_, error) in zip(specs, stored) if error is None]
+        task_ids = self._find_task_ids(_api.group_names_by_tag(created), wait)
+        results = _api.task_results(specs, stored, task_ids)
+        if self.task_index is not None:
+            for spec, result in zip(specs, results):
+                if result.error is None:
+                    self.task_index.put(result.name, result.task_id, spec.get("tag", ""))
+        failed = sum(1 for result in results if result.error is not None)
+        success("%d tasks created, %d failed", len(results) - failed, failed)
+        return results
+
+    def _find_task_ids(self, names_by_tag: Dict[str, Set[str]], wait: float) -> Dict[str, int]:
+        found = {}
+
+        def probe():
+            for tag, names in names_by_tag.items():
+                missing = names - found.keys()
+                if missing:
+                    found.update(self._scan_task_ids(tag, missing))
+            if all(names <= found.keys() for names in names_by_tag.values()):
+                return found
+
+        try:
+            return wait_until(probe, timeout=wait, description="created tasks")
+        except PyGocronTimeout:
+            return found
+
+    def _scan_task_ids(self, tag: str, names: Set[str]) -> Dict[str, int]:
+        found, page = {}, 1
+        while True:
+            data = self.get_tasks(page=page, page_size=_api.LIST_PAGE_SIZE, tag=tag or None)
+            found.update(_api.match_task_ids(data, names))
+            if len(found) == len(names) or _api.is_last_page(data, page, _api.LIST_PAGE_SIZE):
+                return found
+            page += 1
+
+    def plan(self, specs: List[dict], tag: str = None, prune: bool = False) -> reconcile.Plan:
+        """
+        Diff wanted tasks against the server(loaded by one paginated listing), return a `Plan` of creates, updates, enables, disables and deletes.
+        Print it to see the diff, and run it by `apply`
 
-    def run_task(self, task_id) -> int:
+        Params
+        -----
+        specs: wanted tasks, each one is a dict of `create_task` params plus an optional `enabled`(default `True`), tasks are matched by name
+        tag: only look at the tasks of this tag on the server
+        prune: delete the server tasks(within `tag`) that are not in `specs`
         """
-        Run task and return a task run id 
+        return reconcile.plan(self, specs, tag=tag, prune=prune)
+
+    def apply(self, plan: reconcile.Plan, max_workers: int = None, dry_run: bool = False) -> List[reconcile.ChangeResult]:
         """
-        url = urljoin(self._base_url, f"api/task/run/{task_id}")
-        response = requests.get(url, headers=self._headers)
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "任务已开始运行, 请到任务日志中查看结果":
-                logger_print("Task Triggerd Successfully", LogLevel.SUCCESS)
-                return self.get_latest_run_id(task_id)
-            else:
-                raise PyGocronException(f"Canot trigger task, details: {response.text}")
-        else:
-            raise PyGocronException(f"Canot trigger task, details: {response.text}")
+        Run a `Plan` returned by `plan` concurrently, return a `ChangeResult(change, task_id, error)` for every change in plan order
+
+        Params
+        -----
+        plan: a `Plan`
+        max_workers: max number of concurrent requests, defaults to 10, or to `max_limit` of the `governor`
+        dry_run: only print the diff
+        """
+        return reconcile.apply(self, plan, max_workers=self._workers(max_workers), dry_run=dry_run)
+
+    def _runs(self):
+        if self._run_poller is None:
+            from pygocron.runs import RunPoller  # loads concurrent.futures, only when runs are triggered
+
+            with self._lock:
+                if self._run_poller is None:
+                    self._run_poller = RunPoller(self)
+        return self._run_poller
+
+    def run_task(self, task_id, wait: float = 10) -> int:
+        """
+        Run task and return a task run id
+
+        Params
+        -----
+        task_id: task id
+        wait: max seconds to wait for the run to show up, raise `PyGocronTimeout` after that
+        """
+        run_id = self._runs().trigger(task_id, track=False).run_id(timeout=wait)
+        success("Task triggered: %s", task_id)
+        return run_id
+
+    def run_task_async(self, task_id):
+        """
+        Trigger a run and return a `RunFuture` right away, its result is the `RunUpdate(task_id, run_id, status, record)`
+        of the finished run. All outstanding runs are polled together by one background thread,
+        wait for them by `pygocron.runs.wait_all` or `pygocron.runs.as_completed`
+
+        Params
+        -----
+        task_id: task id
+        """
+        future = self._runs().trigger(task_id)
+        success("Task triggered: %s", task_id)
+        return future
+
+    def run_and_wait(self, task_id, timeout: float = None):
+        """
+        Run task and wait until the run finishes, return its `RunUpdate(task_id, run_id, status, record)`
+
+        Params
+        -----
+        task_id: task id
+        timeout: max seconds to wait, raise `PyGocronTimeout` when the run is still not finished
+        """
+        return self.run_task_async(task_id).wait(timeout)
 
     def get_tasks(
         self,
@@ -200,7 +495,7 @@ class PyGoCron:
 
         Params
         -----
-        page: page 
+        page: page
         page_size: page size
         task id: task id
         protocol: protocol, 1 for http and 2 for shell
@@ -209,32 +504,56 @@ class PyGoCron:
         host_id: host id
         status: status, 0 for `disabled`， 1 for `enabled`
         """
-        url = urljoin(self._base_url, "api/task")
+        return self._call(
+            _api.list_tasks(
+                page=page,
+                page_size=page_size,
+                task_id=task_id,
+                protocol=protocol,
+                name=name,
+                tag=tag,
+                host_id=host_id,
+                status=status,
+            )
+        )
 
-        payload = {
-            "page_size": page_size,
-            "page": page,
-            "id": task_id,
-            "protocol": protocol,
-            "name": name,
-            "tag": tag,
-            "host_id": host_id,
-            "status": status,
-        }
+    def iter_tasks(
+        self, page_size: int = 50, prefetch: bool = True, typed: bool = False, **filters
+    ) -> Iterator[Union[dict, Task]]:
+        """
+        Yield tasks of all pages one by one, the next page is fetched in background while you are consuming the current one
 
-        response = requests.get(url, headers=self._headers, params=payload)
+        Params
+        -----
+        page_size: size of the first page, it adapts to the server latency later
+        prefetch: fetch the next page in background
+        typed: yield compact `Task` objects instead of dicts
+        filters: filters of `get_tasks`, for instance `tag="Test"`
+        """
+        records = iter_records(
+            lambda page, size: self.get_tasks(page=page, page_size=size, **filters),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+        return map(Task.from_dict, records) if typed else records
+
+    def analyze_schedule(self, start: "datetime.datetime" = None, days: float = 1, **filters) -> "ScheduleReport":
+        """
+        Count the fires of all enabled main tasks in every second of a window, see `pygocron.cronspec.analyze`.
+        Times are in the time zone of the gocron server, which is assumed to be the local one
 
-        if response.status_code == 200:
-            data = json.loads(response.text)
+        Params
+        -----
+        start: start of the window, now by default
+        days: length of the window
+        filters: filters of `get_tasks`, for instance `tag="etl"`
+        """
+        import datetime
 
-            if data["message"] == "操作成功":
-                return data["data"]
-            else:
-                raise PyGocronException(
-                    f"Can not fetch task list, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not fetch task list, details: {response.text}")
+        from pygocron.cronspec import analyze
+
+        tasks = self.iter_tasks(page_size=_api.LIST_PAGE_SIZE, **filters)
+        return analyze(tasks, start or datetime.datetime.now(), days)
 
     def get_task_id_by_name(self, name: str):
         """
@@ -242,16 +561,43 @@ class PyGoCron:
 
         Params
         -----
-        name: task name 
+        name: task name
         """
+        index = self.task_index
+        if index is not None:
+            task_id = index.get(name)
+            if task_id is None and index.stale:
+                self.refresh_task_index()
+                task_id = index.peek(name)
+            if task_id is not None:
+                return task_id
         data = self.get_tasks(name=name)
         if data:
-            try:
-                task_id = data["data"][0]["id"]
-            except IndexError:
-                raise PyGocronException(f"Task Name `{name}` Not Found")
-            else:
-                return task_id
+            task_id = _api.first_task_id(data, name)
+            if index is not None:
+                tag = next(t.get("tag", "") for t in data["data"] if t["id"] == task_id)
+                index.put(name, task_id, tag)
+            return task_id
+
+    def get_task_ids_by_tag(self, tag: str) -> Set[int]:
+        """
+        Get the ids of all tasks related to the `tag`
+
+        Params
+        -----
+        tag: tag
+        """
+        if self.task_index is not None:
+            task_ids = self.task_index.ids_by_tag(tag)
+            if task_ids is not None:
+                return task_ids
+        return {task["id"] for task in self.iter_tasks(page_size=_api.LIST_PAGE_SIZE, tag=tag)}
+
+    def refresh_task_index(self):
+        """
+        Reload `task_index` from one full task listing
+        """
+        self.task_index.load(self.iter_tasks(page_size=_api.LIST_PAGE_SIZE))
 
     def get_task_logs(
         self,
@@ -259,42 +605,74 @@ class PyGoCron:
         page: int = 1,
         page_size: int = 20,
         protocol: int = None,
-        status: int = None,
+        status: Union[int, RunStatus] = None,
     ):
         """
         Get task logs
 
         Params
         -----
-        task_id: task id 
-        page:  page 
+        task_id: task id
+        page:  page
         page_size: page size
         protocol:  protocol, 1 for http and 2 for shell, default is 2
-        status: task staus， 0 for all, 1 for failed, and for running tasks
+        status: task staus， 0 for all, 1 for failed, and 2 for running tasks, or a `RunStatus`(`RunStatus.FAILED` or `RunStatus.RUNNING`)
         """
-        url = urljoin(self._base_url, "api/task/log")
+        return self._call(
+            _api.list_task_logs(
+                task_id=task_id,
+                page=page,
+                page_size=page_size,
+                protocol=protocol,
+                status=status,
+            )
+        )
 
-        payload = {
-            "task_id": task_id,
-            "page": page,
-            "page_size": page_size,
-            "protocol": protocol,
-            "status": status,
-        }
+    def iter_task_logs(
+        self,
+        page_size: int = 20,
+        prefetch: bool = True,
+        typed: bool = False,
+        result_limit: int = None,
+        max_page_size: int = _api.LIST_PAGE_SIZE,
+        **filters,
+    ) -> Iterator[Union[dict, TaskLog]]:
+        """
+        Yield task logs of all pages one by one(newest first), the next page is fetched in background while you are consuming the current one
 
-        response = requests.get(url, headers=self._headers, params=payload)
+        Params
+        -----
+        page_size: size of the first page, it adapts to the server latency later
+        prefetch: fetch the next page in background
+        typed: yield compact `TaskLog` objects(with a `RunStatus` status) instead of dicts
+        result_limit: keep at most this many chars of the run output(`result`), 0 to drop it,
+            it is cut after the page is decoded, so it saves the memory of the records kept, not the decoding
+        max_page_size: the page size never grows above this, it bounds the memory taken by the run outputs of a page
+        filters: filters of `get_task_logs`, for instance `task_id=1`
+        """
+        records = iter_records(
+            lambda page, size: self.get_task_logs(page=page, page_size=size, **filters),
+            page_size=page_size,
+            max_page_size=max_page_size,
+            prefetch=prefetch,
+        )
+        if result_limit is not None:
+            records = (trim_result(record, result_limit) for record in records)
+        return map(TaskLog.from_dict, records) if typed else records
+
+    def export_task_logs(self, output: Union[str, IO], **kwargs) -> "LogExport":
+        """
+        Stream task logs to a JSON lines file(gzipped when its name ends with `.gz`), one page in memory at a time,
+        see `pygocron.logexport.export_task_logs` for the params(`since`, `until`, `result_limit`, `chunk_records`, ...)
 
-        if response.status_code == 200:
-            data = json.loads(response.text)
+        Params
+        -----
+        output: file name, or an open text stream
+        kwargs: params of `pygocron.logexport.export_task_logs`
+        """
+        from pygocron.logexport import export_task_logs
 
-            if data["message"] == "操作成功":
-                return data["data"]
-            else:
-                raise PyGocronException(
-                    f"Can not fetch task log, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not Fetch Task Log, Details: {response.text}")
+        return export_task_logs(self, output, **kwargs)
 
     def check_run_status(self, task_id, run_id) -> RunStatus:  # 0 失败 1 在运行 2 成功
         """
@@ -306,91 +684,62 @@ class PyGoCron:
         task_is: task id
         run_id: run id
         """
-        logs = self.get_task_logs(task_id=task_id, page_size=100)
-        logs_data = logs["data"]
-        if logs_data:
-            for record in logs_data:  # 有序的， 按开始时间倒序
-                if record["id"] == run_id:
-                    status = record["status"]
-                    if status == 0:
-                        return RunStatus.FAILED
-                    elif status == 1:
-                        return RunStatus.RUNNING
-                    elif status == 2:
-                        return RunStatus.SUCCESS
-                    else:
-                        raise ValueError(f"Wrong status number: {status}")
-            logger_print("run id not found", LogLevel.WARN)
-            return None
+        records = sweep_task_logs(self, task_id, {run_id})
+        if run_id in records:
+            return _api.run_status(records[run_id]["status"])
+        logger.warning("Run id of task %s not found", task_id)
+        return None
 
     def disable_task(self, task_id: int):
         """
-        Disable a task by task id 
+        Disable a task by task id
 
         Params:
         ----
-        task_id: task id 
+        task_id: task id
         """
-        url = urljoin(self._base_url, f"api/task/disable/{task_id}")
-
-        response = requests.post(url, headers=self._headers)
-
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "操作成功":
-                logger_print("Task disabled successfully", LogLevel.SUCCESS)
-            else:
-                raise PyGocronException(
-                    f"Can not disable task, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not disable task, details: {response.text}")
+        self._call(_api.disable_task(task_id))
+        success("Task disabled: %s", task_id)
 
     def enable_task(self, task_id: int):
         """
         Enable a task
         -----
-        task_id: task id 
+        task_id: task id
         """
-        url = urljoin(self._base_url, f"api/task/enable/{task_id}")
+        self._call(_api.enable_task(task_id))
+        success("Task enabled: %s", task_id)
 
-        response = requests.post(url, headers=self._headers)
-
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "操作成功":
-                logger_print("Task Enabled Successfully", LogLevel.SUCCESS)
-            else:
-                raise PyGocronException(f"Can not enable task, details: {response.text}")
-        else:
-            raise PyGocronException(f"Can not enable task, details: {response.text}")
-
-    def get_task_id_lagged(self, name, wait=1) ->  int:
+    def get_task_id_lagged(self, name, wait=10) -> int:
         """
-        Get a task id after waitting some second
+        Get a task id, polling until the task record is ready in database
 
         Params
         ----
         name: task name
+        wait: max seconds to wait, raise `PyGocronTimeout` when the task still can't be found
         """
-        time.sleep(wait)  # wait until the record be ready in database
-        return self.get_task_id_by_name(name=name)
+        return wait_until(
+            lambda: _api.find_task_id(self.get_tasks(name=name), name),
+            timeout=wait,
+            description=f"task `{name}`",
+        )
 
-    def get_latest_run_id(self, task_id, wait=1) -> int:
+    def get_latest_run_id(self, task_id, wait=10, after_id: int = None) -> int:
         """
-        Get most recent run id of a task
+        Get most recent run id of a task, polling until a run record is ready in database
 
         Params
         ----
         task_id: task id
+        wait: max seconds to wait, raise `PyGocronTimeout` when there is still no run record
+        after_id: only accept a run newer than this run id
         """
-        time.sleep(wait)  # wait until the record be ready in database
-        logs = self.get_task_logs(task_id=task_id,)
-        logs_data = logs["data"]
-        if logs_data:
-            first_record = logs_data[0]
-            return first_record["id"]
-
+        return wait_until(
+            lambda: _api.latest_run_id(self.get_task_logs(task_id=task_id, page_size=1), after_id),
+            timeout=wait,
+            description=f"a run of task `{task_id}`",
+        )
 
     def delete_task_by_tag(self, tag: str):
         """
@@ -400,120 +749,198 @@ class PyGoCron:
         ----
         tag: tag
         """
-        tasks = self.get_tasks(tag=tag)
-
-        if tasks["total"] >= 1:
-            data = tasks["data"]
-            task_ids = [dat["id"] for dat in data]
-        else:
-            logger_print(f"No tasks associated with tag `{tag}`", LogLevel.WARN)
-            return
-        for task_id in task_ids:
-            self.delete_task(task_id)
+        summary = self.delete_tasks(tag=tag)
+        if not summary.succeeded and not summary.failed:
+            logger.warning("No tasks associated with tag `%s`", tag)
+        return summary
 
-    def delete_task(self, task_id: int):
+    def select_tasks(
+        self,
+        tag: str = None,
+        name: str = None,
+        host_id: int = None,
+        protocol: int = None,
+        status: int = None,
+    ) -> List[int]:
         """
-        Delete a task by a `task id`
+        Walk through every page of the task list and return the ids of all matched tasks
 
         Params
-        ----
-        task_id: task id 
-        """
-        url = urljoin(
-            self._base_url, f"api/task/remove/{task_id}"
-        )  # Gocron will not report an error even tge task id is not existed
-        response = requests.post(url, headers=self._headers)
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "操作成功":
-                logger_print("Task Deleted Successfully", LogLevel.SUCCESS)
+        -----
+        tag: tag
+        name: task name, or a shell-style pattern such as `etl-*`
+        host_id: host id
+        protocol: protocol, 1 for http and 2 for shell
+        status: status, 0 for `disabled`， 1 for `enabled`
+        """
+        import fnmatch
+
+        pattern = name if name is not None and _api.has_wildcard(name) else None
+        tasks = self.iter_tasks(
+            page_size=_api.LIST_PAGE_SIZE,
+            tag=tag,
+            name=None if pattern else name,
+            host_id=host_id,
+            protocol=protocol,
+            status=status,
+        )
+        return [
+            task["id"]
+            for task in tasks
+            if (pattern is None and (name is None or task["name"] == name))
+            or (pattern is not None and fnmatch.fnmatchcase(task["name"], pattern))
+        ]
+
+    def _bulk(self, build_call, task_ids: List[int], max_workers: Optional[int]) -> BulkSummary:
+        # collect all ids before changing anything, deleting while paging would shift the pages
+        settled = map_settled(lambda task_id: self._call(build_call(task_id)), task_ids, self._workers(max_workers))
+        succeeded, failed = [], {}
+        for task_id, (_, error) in zip(task_ids, settled):
+            if error is None:
+                succeeded.append(task_id)
             else:
-                raise PyGocronException(
-                    f"Can not delete the task, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not delete the task, details: {response.text}")
+                failed[task_id] = error
+        return BulkSummary(succeeded, failed)
 
-    def get_nodes(self):
+    def delete_tasks(self, max_workers: int = None, **selector) -> BulkSummary:
         """
-        Get all nodes(server adddress info)
+        Delete all tasks matched by the selector, return a `BulkSummary(succeeded, failed)` instead of raising on the first failure
+
+        Params
+        -----
+        max_workers: max number of concurrent requests, defaults to 10, or to `max_limit` of the `governor`
+        selector: params of `select_tasks`, for instance `tag="Test"` or `name="etl-*"`
         """
-        url = urljoin(self._base_url, "api/host/all")
-        response = requests.get(url, headers=self._headers)
+        summary = self._bulk(_api.remove_task, self.select_tasks(**selector), max_workers)
+        if self.task_index is not None:
+            for task_id in summary.succeeded:
+                self.task_index.discard(task_id)
+        success("%d tasks deleted, %d failed", len(summary.succeeded), len(summary.failed))
+        return summary
+
+    def enable_tasks(self, max_workers: int = None, **selector) -> BulkSummary:
+        """
+        Enable all tasks matched by the selector, return a `BulkSummary(succeeded, failed)`
 
-        if response.status_code == 200:
-            data = json.loads(response.text)
+        Params
+        -----
+        max_workers: max number of concurrent requests, defaults to 10, or to `max_limit` of the `governor`
+        selector: params of `select_tasks`, for instance `tag="Test"` or `name="etl-*"`
+        """
+        summary = self._bulk(_api.enable_task, self.select_tasks(**selector), max_workers)
+        success("%d tasks enabled, %d failed", len(summary.succeeded), len(summary.failed))
+        return summary
 
-            if data["message"] == "操作成功":
-                return data["data"]
-            else:
-                raise PyGocronException(
-                    f"Can not fetch all nodes(hosts), details: {response.text}"
-                )
-        else:
-            raise PyGocronException(
-                f"Can not fetch all nodes(hosts), details: {response.text}"
-            )
+    def disable_tasks(self, max_workers: int = None, **selector) -> BulkSummary:
+        """
+        Disable all tasks matched by the selector, return a `BulkSummary(succeeded, failed)`
 
+        Params
+        -----
+        max_workers: max number of concurrent requests, defaults to 10, or to `max_limit` of the `governor`
+        selector: params of `select_tasks`, for instance `tag="Test"` or `name="etl-*"`
+        """
+        summary = self._bulk(_api.disable_task, self.select_tasks(**selector), max_workers)
+        success("%d tasks disabled, %d failed", len(summary.succeeded), len(summary.failed))
+        return summary
+
+    def delete_task(self, task_id: int):
+        """
+        Delete a task by a `task id`
+
+        Params
+        ----
+        task_id: task id
+        """
+        self._call(_api.remove_task(task_id))
+        if self.task_index is not None:
+            self.task_index.discard(task_id)
+        success("Task deleted: %s", task_id)
+
+    def get_nodes(self, typed: bool = False) -> List[Union[dict, Node]]:
+        """
+        Get all nodes(server adddress info), as `Node` objects if `typed`
+        """
+        nodes = self._call(_api.list_nodes())
+        return [Node.from_dict(node) for node in nodes] if typed else nodes
 
     def add_new_node(self, ip:str, port:int, alias:str, remark:str):
         """
-        Add a new node to gocron. To make sure the node you added will work well, you need to check its accesibility by run `check_node` method 
+        Add a new node to gocron. To make sure the node you added will work well, you need to check its accesibility by run `check_node` method
 
         Params
         -----
-        ip: ip address for the node 
+        ip: ip address for the node
         port: port
         alias: alias for node
         remark: comment or tag for the node
         """
-        url = urljoin(
-            self._base_url, f"api/host/store"
-        )  
-        payload = {
-           "id":"",
-           "name": ip, 
-           "port": port,
-           "alias": alias,
-           "remark": remark,
-        }
-        headers = deepcopy(self._headers)
-        headers["Content-Type"] = "application/x-www-form-urlencoded"
-        response = requests.post(url, headers=headers, params=payload)  
-
-        print(response.request.url)
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "保存成功":
-                logger_print("Node added successfully", LogLevel.SUCCESS)
-            else:
-                raise PyGocronException(
-                    f"Can not add node, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not add node, details: {response.text}")
-    
+        self._call(_api.store_node(ip, port, alias, remark))
+        success("Node added: %s", alias)
+
     def check_node(self, node_id):
         """
         Check if a node is accessible or not
         """
-        url = urljoin(
-            self._base_url, f"api/host/ping/{node_id}"
-        )  
+        self._call(_api.ping_node(node_id))
+        success("Node is running: %s", node_id)
 
-        response = requests.get(url, headers=self._headers)  
+    def _ping_nodes(self, nodes: List[dict], timeout: float, max_workers: int) -> Dict[int, NodeHealth]:
+        def ping(node):
+            start = time.monotonic()
+            try:
+                self._call(_api.ping_node(node["id"], timeout=timeout))
+                error = None
+            except Exception as e:
+                error = str(e)
+            return NodeHealth(node["id"], node.get("alias", ""), error is None, time.monotonic() - start, error)
 
-        if response.status_code == 200:
-            data = json.loads(response.text)
-            if data["message"] == "连接成功":
-                logger_print("Node is running Successfully", LogLevel.SUCCESS)
-            else:
-                raise PyGocronException(
-                    f"Can not connect to node, details: {response.text}"
-                )
-        else:
-            raise PyGocronException(f"Can not connect to node, details: {response.text}")
-    
+        settled = map_settled(ping, nodes, max_workers)
+        return {node["id"]: health for node, (health, _) in zip(nodes, settled)}
+
+    def check_nodes(self, timeout: float = 5, max_workers: int = 10) -> Dict[int, NodeHealth]:
+        """
+        Ping all nodes concurrently, return `{node_id: NodeHealth(node_id, alias, healthy, latency, error)}`,
+        a node that fails or doesn't answer in time is unhealthy instead of raising
+
+        Params
+        -----
+        timeout: max seconds to wait for the ping of one node
+        max_workers: max number of concurrent pings
+        """
+        health = self._ping_nodes(self.get_nodes(), timeout, max_workers)
+        unhealthy = [node_id for node_id, node in health.items() if not node.healthy]
+        if unhealthy:
+            logger.warning("Unhealthy nodes: %s", unhealthy)
+        return health
+
+    def host_placement(self, running_weight: float = 1, timeout: float = 5, max_workers: int = 10) -> HostPlacement:
+        """
+        Snapshot the load of the healthy nodes(enabled tasks plus `running_weight` times running runs),
+        return a `HostPlacement` whose `pick()` gives the least loaded node, pass it as `host_id` of `create_task`
+
+        Params
+        -----
+        running_weight: load of one running run, relative to one enabled task
+        timeout: max seconds to wait for the ping of one node
+        max_workers: max number of concurrent pings
+        """
+        nodes = self.get_nodes()
+        health = self._ping_nodes(nodes, timeout, max_workers)
+        loads = host_loads(
+            nodes,
+            self.iter_tasks(page_size=_api.LIST_PAGE_SIZE, status=1),
+            self.iter_task_logs(page_size=_api.LIST_PAGE_SIZE, status=RunStatus.RUNNING),
+            running_weight,
+        )
+        return HostPlacement({node_id: load for node_id, load in loads.items() if health[node_id].healthy})
+
+    def _resolve_host(self, host_id, placement: HostPlacement = None) -> int:
+        if isinstance(host_id, HostPlacement):
+            return host_id.pick()
+        if host_id == AUTO_HOST:
+            return (placement or self.host_placement()).pick()
+        return host_id
 
     def get_all_methods(self):
         all_methods = dir(self)
@@ -523,4 +950,3 @@ class PyGoCron:
             if not method.startswith("_") and method != "get_all_methods"
         ]
         print("\n".join(sorted(methods)))
-   
@@ -0,0 +1,204 @@
+"""
+Declarative management of gocron tasks: diff the wanted tasks against the server and apply the difference.
+
+```python
+plan = pgc.plan(load_specs("tasks.json"), tag="etl", prune=True)
+pgc.apply(plan, dry_run=True)  # print the diff only
+pgc.apply(plan)
+```
+
+A spec is a dict of `create_task` params, plus an optional `enabled`(default `True`).
+Tasks are matched by name.
+"""
+import json
+from typing import Iterable, List, NamedTuple, Optional
+
+from pygocron import _api
+from pygocron._api import PyGocronException
+from pygocron._concurrent import map_settled
+
+CREATE = "create"
+UPDATE = "update"
+ENABLE = "enable"
+DISABLE = "disable"
+DELETE = "delete"
+
+_SIGNS = {CREATE: "+", UPDATE: "~", ENABLE: "~", DISABLE: "~", DELETE: "-"}
+
+
+class Change(NamedTuple):
+    """
+    One operation of a plan
+
+    action: `create`, `update`, `enable`, `disable` or `delete`
+    name: task name
+    task_id: task id, `None` for a task to create
+    spec: the wanted spec, `None` for a task to delete
+    diff: `{field: (server value, wanted value)}` of an update
+    """
+
+    action: str
+    name: str
+    task_id: Optional[int] = None
+    spec: Optional[dict] = None
+    diff: Optional[dict] = None
+
+
+class ChangeResult(NamedTuple):
+    change: Change
+    task_id: Optional[int] = None
+    error: Optional[Exception] = None
+
+
+class Plan:
+    def __init__(self, changes: List[Change]):
+        self.changes = changes
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def of(self, action: str) -> List[Change]:
+        return [change for change in self.changes if change.action == action]
+
+    def __str__(self):
+        if not self.changes:
+            return "No changes, tasks are up to date"
+        lines = []
+        for change in self.changes:
+            lines.append(f"{_SIGNS[change.action]} {change.action} `{change.name}`")
+            for field, (old, new) in (change.diff or {}).items():
+                lines.append(f"    {field}: {old!r} -> {new!r}")
+        counts = ", ".join(
+            f"{len(self.of(action))} to {action}"
+            for action in (CREATE, UPDATE, ENABLE, DISABLE, DELETE)
+        )
+        lines.append(f"Plan: {counts}")
+        return "\n".join(lines)
+
+
+def load_specs(path: str) -> List[dict]:
+    """
+    Load task specs from a JSON file(a list of specs) or a JSON lines file(one spec per line)
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def task_fields(task: dict) -> dict:
+    """
+    The `/api/task/store` fields of a task record from `get_tasks`
+    """
+    fields = {key: task.get(key) for key in _api.task_payload("", "", "") if key != "id"}
+    if task.get("host_id") is None and task.get("hosts"):
+        fields["host_id"] = task["hosts"][0]["host_id"]
+    return fields
+
+
+def _diff(current: dict, wanted: dict) -> dict:
+    return {
+        field: (current.get(field), value)
+        for field, value in wanted.items()
+        if str(current.get(field)) != str(value)
+    }
+
+
+def plan(client, specs: Iterable[dict], tag: str = None, prune: bool = False) -> Plan:
+    """
+    Diff the wanted tasks against the server, the server state is loaded by one paginated listing
+
+    Params
+    -----
+    client: a `PyGoCron` object
+    specs: wanted tasks, each one is a dict of `create_task` params plus an optional `enabled`
+    tag: only look at the tasks of this tag on the server
+    prune: delete the server tasks(within `tag`) that are not in `specs`
+    """
+    existing = {
+        task["name"]: task
+        for task in client.iter_tasks(page_size=_api.LIST_PAGE_SIZE, tag=tag)
+    }
+    changes, seen = [], set()
+    for spec in specs:
+        spec = dict(spec)
+        name = spec["name"]
+        if name in seen:
+            raise PyGocronException(f"Duplicated task name `{name}` in specs")
+        seen.add(name)
+        enabled = spec.pop("enabled", True)
+        wanted = _api.task_payload(**spec)
+        del wanted["id"]
+        task = existing.get(name)
+        if task is None:
+            changes.append(Change(CREATE, name, spec=dict(spec, enabled=enabled)))
+            continue
+        diff = _diff(task_fields(task), wanted)
+        if diff:
+            changes.append(Change(UPDATE, name, task["id"], spec, diff))
+        if bool(task.get("status")) != bool(enabled):
+            changes.append(Change(ENABLE if enabled else DISABLE, name, task["id"], spec))
+    if prune:
+        for name, task in existing.items():
+            if name not in seen:
+                changes.append(Change(DELETE, name, task["id"]))
+    return Plan(changes)
+
+
+def _run(client, change: Change) -> Optional[int]:
+    if change.action == UPDATE:
+        client._call(_api.store_task(_api.task_payload(task_id=change.task_id, **change.spec)))
+    elif change.action == ENABLE:
+        client._call(_api.enable_task(change.task_id))
+    elif change.action == DISABLE:
+        client._call(_api.disable_task(change.task_id))
+    elif change.action == DELETE:
+        client._call(_api.remove_task(change.task_id))
+    return change.task_id
+
+
+def apply(client, plan: Plan, max_workers: int = 10, dry_run: bool = False) -> List[ChangeResult]:
+    """
+    Run the operations of a plan concurrently, return a `ChangeResult` for every change in plan order
+
+    Params
+    -----
+    client: a `PyGoCron` object
+    plan: a `Plan` returned by `plan`
+    max_workers: max number of concurrent requests
+    dry_run: only print the plan
+    """
+    if dry_run:
+        print(plan)
+        return []
+    changes = list(plan)
+    results = [None] * len(changes)
+    creates = [i for i, change in enumerate(changes) if change.action == CREATE]
+    if creates:
+        specs = [
+            {k: v for k, v in changes[i].spec.items() if k != "enabled"} for i in creates
+        ]
+        for i, result in zip(creates, client.create_tasks(specs, max_workers=max_workers)):
+            results[i] = ChangeResult(changes[i], result.task_id, result.error)
+
+    operations = [(i, change) for i, change in enumerate(changes) if change.action != CREATE]
+    for i in creates:  # tasks wanted disabled are created enabled, then disabled
+        change, result = changes[i], results[i]
+        if result.error is None and not change.spec["enabled"]:
+            operations.append((i, Change(DISABLE, change.name, result.task_id, change.spec)))
+    settled = map_settled(lambda operation: _run(client, operation[1]), operations, max_workers)
+    for (i, change), (_, error) in zip(operations, settled):
+        if results[i] is None:
+            results[i] = ChangeResult(change, change.task_id, error)
+        elif error is not None:
+            results[i] = results[i]._replace(error=error)
+
+    if client.task_index is not None:
+        for result in results:
+            if result.change.action == DELETE and result.error is None:
+                client.task_index.discard(result.task_id)
+    return results
@@ -0,0 +1,286 @@
+"""
+Trigger runs and wait for them through futures, all outstanding runs of a client
+are resolved and polled together by one background thread.
+
+```python
+futures = [pgc.run_task_async(task_id) for task_id in task_ids]
+for future in as_completed(futures, timeout=600):
+    update = future.result()  # a `RunUpdate(task_id, run_id, status, record)`
+    print(update.task_id, update.run_id, update.status)
+```
+
+gocron's `api/task/run` doesn't return the id of the run it starts, so the id is
+the first new log record of the task. Triggers of one task are serialized, and
+when a task is triggered several times before its runs show up, the new records
+are matched to the triggers in order.
+"""
+import threading
+from concurrent import futures as _futures
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pygocron import _api
+from pygocron._api import UNFINISHED, PyGocronTimeout
+from pygocron.log import logger
+from pygocron.polling import backoff_delays
+from pygocron.tracker import RunTracker, RunUpdate
+
+
+class RunFuture(_futures.Future):
+    """
+    A `concurrent.futures.Future` of one triggered run, its result is the final `RunUpdate`,
+    a failed run is a result too(`status` is `RunStatus.FAILED`)
+    """
+
+    def __init__(self, task_id: int, poller: "RunPoller" = None):
+        super().__init__()
+        self.task_id = task_id
+        self._poller = poller
+        self._run_id = None
+        self._resolved = threading.Event()
+
+    def run_id(self, timeout: float = None) -> int:
+        """
+        Wait until the run shows up in the task logs and return its id, when it doesn't show up
+        within `timeout` seconds the future fails with `PyGocronTimeout` and the run is not looked for any more
+        """
+        if not self._resolved.wait(timeout):
+            error = PyGocronTimeout(f"Timeout waiting for a run of task `{self.task_id}` after {timeout} seconds")
+            if self._poller is None or self._poller._abandon(self, error):
+                raise error
+        if self.cancelled():
+            raise _futures.CancelledError()
+        if self._run_id is None:  # abandoned by an earlier timeout
+            raise self.exception()
+        return self._run_id
+
+    def wait(self, timeout: float = None) -> RunUpdate:
+        """
+        Like `result`, but raise `PyGocronTimeout` when the run is still not finished after `timeout` seconds
+        """
+        try:
+            return self.result(timeout)
+        except _futures.TimeoutError:
+            raise PyGocronTimeout(
+                f"Run of task `{self.task_id}` not finished after {timeout} seconds"
+            ) from None
+
+    def _resolve(self, run_id: int):
+        self._run_id = run_id
+        self._resolved.set()
+
+    def cancel(self) -> bool:
+        cancelled = super().cancel()
+        if cancelled:
+            self._resolved.set()
+        return cancelled
+
+    def __repr__(self):
+        return f"<RunFuture task_id={self.task_id} run_id={self._run_id} state={self._state}>"
+
+
+class _Trigger:
+    __slots__ = ("future", "after_id", "track")
+
+    def __init__(self, future: RunFuture, after_id: Optional[int], track: bool):
+        self.future = future
+        self.after_id = after_id
+        self.track = track
+
+
+class RunPoller:
+    """
+    Resolve and poll all outstanding runs of a client in one background thread.
+    The polling interval starts at `min_interval`, and doubles up to `max_interval`
+    while nothing changes, it goes back to `min_interval` on every new run or status change.
+
+    Params
+    -----
+    client: a `PyGoCron` object
+    min_interval: shortest seconds between two polls
+    max_interval: longest seconds between two polls
+    page_size: page size of the `api/task/log` sweeps
+    """
+
+    def __init__(self, client, min_interval: float = 0.05, max_interval: float = 1, page_size: int = 100):
+        self._client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._tracker = RunTracker(client, page_size=page_size)
+        self._waiting: Dict[int, List[_Trigger]] = {}  # {task_id: triggers in trigger order, run id unknown yet}
+        self._tracked: Dict[tuple, RunFuture] = {}  # {(task_id, run_id): future}, only used by the thread
+        self._task_locks: Dict[int, threading.Lock] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def _task_lock(self, task_id: int) -> threading.Lock:
+        with self._cond:
+            return self._task_locks.setdefault(task_id, threading.Lock())
+
+    def trigger(self, task_id: int, track: bool = True) -> RunFuture:
+        """
+        Trigger a run of `task_id` now, and return its future
+
+        Params
+        -----
+        task_id: task id
+        track: poll the run until it finishes, else the future completes as soon as the run id is known
+        """
+        future = RunFuture(task_id, self)
+        with self._task_lock(task_id):
+            with self._cond:
+                chained = bool(self._waiting.get(task_id))
+            after_id = None
+            if not chained:  # the runs of earlier triggers still to resolve already mark the position
+                after_id = _api.latest_run_id(self._client.get_task_logs(task_id=task_id, page_size=1))
+            self._client._call(_api.run_task(task_id))
+            with self._cond:
+                self._waiting.setdefault(task_id, []).append(_Trigger(future, after_id, track))
+                self._start()
+                self._cond.notify()
+        return future
+
+    def _start(self):
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._loop, name="pygocron-run-poller", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """
+        Stop polling, outstanding futures are cancelled
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _loop(self):
+        delays = backoff_delays(self.min_interval, self.max_interval)
+        while True:
+            with self._cond:
+                if self._closed or (not self._waiting and not self._tracked):
+                    self._thread = None
+                    if self._closed:
+                        self._cancel_all()
+                    return
+            try:
+                changed = self._resolve() + self._poll()
+            except Exception:  # a failed poll is retried by the next one, futures time out on their own
+                logger.warning("Polling task runs failed", exc_info=True)
+                changed = 0
+            if changed:
+                delays = backoff_delays(self.min_interval, self.max_interval)
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(next(delays))
+
+    def _cancel_all(self):
+        for triggers in self._waiting.values():
+            for trigger in triggers:
+                trigger.future.cancel()
+        for future in self._tracked.values():
+            future.cancel()
+        self._waiting.clear()
+        self._tracked.clear()
+
+    def _abandon(self, future: RunFuture, error: Exception) -> bool:
+        """
+        Fail a future whose run id is still unknown, `False` if it was resolved meanwhile
+        """
+        with self._cond:
+            triggers = self._waiting.get(future.task_id, [])
+            if not any(trigger.future is future for trigger in triggers):
+                return False
+            if not future.done():
+                future.set_exception(error)
+            future._resolved.set()
+            # an abandoned trigger before live ones still marks their position, so it is only dropped with them
+            if all(trigger.future.done() for trigger in triggers):
+                del self._waiting[future.task_id]
+            return True
+
+    def _resolve(self) -> int:
+        with self._cond:
+            waiting = {task_id: list(triggers) for task_id, triggers in self._waiting.items() if triggers}
+        resolved = 0
+        for task_id, triggers in waiting.items():
+            after_id = triggers[0].after_id
+            records = self._new_runs(task_id, after_id, len(triggers))
+            matched = list(zip(triggers, records))
+            for trigger, record in matched:
+                if trigger.future.done():  # abandoned or cancelled while waiting for its run
+                    continue
+                trigger.future._resolve(record["id"])
+                status = _api.run_status(record["status"])
+                if trigger.track and status in UNFINISHED:
+                    self._tracked[(task_id, record["id"])] = trigger.future
+                    self._tracker.add(task_id, record["id"])
+                elif not trigger.future.cancelled():
+                    trigger.future.set_result(RunUpdate(task_id, record["id"], status, record))
+            if matched:
+                resolved += len(matched)
+                with self._cond:
+                    if task_id not in self._waiting:  # all abandoned meanwhile
+                        continue
+                    remaining = self._waiting[task_id][len(matched):]
+                    if remaining and remaining[0].after_id is None:
+                        remaining[0].after_id = matched[-1][1]["id"]
+                    if remaining and not all(trigger.future.done() for trigger in remaining):
+                        self._waiting[task_id] = remaining
+                    else:
+                        del self._waiting[task_id]
+        return resolved
+
+    def _new_runs(self, task_id: int, after_id: Optional[int], limit: int) -> List[dict]:
+        """
+        The oldest `limit` log records of `task_id` newer than `after_id`, oldest first
+        """
+        records = []
+        for record in self._client.iter_task_logs(task_id=task_id, page_size=max(limit, 20), prefetch=False):
+            if after_id is not None and record["id"] <= after_id:
+                break
+            records.append(record)
+        records.reverse()
+        return records[:limit]
+
+    def _poll(self) -> int:
+        if not self._tracked:
+            return 0
+        updates = self._tracker.tick()
+        for update in updates:
+            if update.status in UNFINISHED:
+                continue
+            run = (update.task_id, update.run_id)
+            self._tracker.discard(*run)
+            future = self._tracked.pop(run)
+            if not future.cancelled():
+                future.set_result(update)
+        return len(updates)
+
+
+def wait_all(futures: Iterable[RunFuture], timeout: float = None) -> List[RunUpdate]:
+    """
+    Wait for all runs to finish, return their `RunUpdate`s in input order
+
+    Params
+    -----
+    futures: futures returned by `run_task_async`
+    timeout: max seconds to wait, raise `PyGocronTimeout` when some runs are still not finished
+    """
+    futures = list(futures)
+    _, not_done = _futures.wait(futures, timeout)
+    if not_done:
+        raise PyGocronTimeout(f"{len(not_done)} runs are still not finished after {timeout} seconds")
+    return [future.result() for future in futures]
+
+
+def as_completed(futures: Iterable[RunFuture], timeout: float = None) -> Iterator[RunFuture]:
+    """
+    Yield the futures as their runs finish, raise `PyGocronTimeout` when `timeout` passes first
+    """
+    try:
+        yield from _futures.as_completed(list(futures), timeout)
+    except _futures.TimeoutError as e:
+        raise PyGocronTimeout(str(e)) from None
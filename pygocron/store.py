@@ -0,0 +1,234 @@
+"""
+Incremental copy of gocron task logs into a local SQLite file.
+
+```python
+store = LogStore("gocron_logs.db")
+store.sync(pgc)  # the first sync downloads all logs, later ones only the new pages
+failed = store.logs(status=RunStatus.FAILED, since="2022-11-25")
+```
+"""
+import sqlite3
+from typing import Iterator, List, NamedTuple, Optional
+
+from pygocron._api import RunStatus
+from pygocron.tracker import sweep_running_logs, sweep_task_logs
+
+COLUMNS = (
+    "id",
+    "task_id",
+    "name",
+    "spec",
+    "protocol",
+    "command",
+    "timeout",
+    "retry_times",
+    "hostname",
+    "start_time",
+    "end_time",
+    "status",
+    "result",
+    "total_time",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_logs (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER,
+    name TEXT,
+    spec TEXT,
+    protocol INTEGER,
+    command TEXT,
+    timeout INTEGER,
+    retry_times INTEGER,
+    hostname TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    status INTEGER,
+    result TEXT,
+    total_time INTEGER
+);
+CREATE INDEX IF NOT EXISTS task_logs_task_id ON task_logs (task_id);
+CREATE INDEX IF NOT EXISTS task_logs_status ON task_logs (status);
+CREATE INDEX IF NOT EXISTS task_logs_start_time ON task_logs (start_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+_INSERT = f"INSERT OR REPLACE INTO task_logs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+class SyncResult(NamedTuple):
+    """
+    inserted: number of new log records
+    updated: number of records which were running in the store, and finished since then
+    high_water_mark: the biggest log id synced so far
+    """
+
+    inserted: int
+    updated: int
+    high_water_mark: int
+
+
+class LogStore:
+    """
+    A local SQLite copy of gocron task logs
+
+    Params
+    -----
+    path: SQLite file path, `:memory:` for an in-memory store
+    batch_size: number of rows written per transaction
+    """
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def high_water_mark(self) -> int:
+        """
+        The biggest log id of the last completed sync, 0 if never synced
+        """
+        row = self._conn.execute(
+            "SELECT value FROM sync_state WHERE key = 'high_water_mark'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _write(self, records: List[dict]):
+        with self._conn:
+            self._conn.executemany(
+                _INSERT, [tuple(record.get(column) for column in COLUMNS) for record in records]
+            )
+
+    def sync(self, client, page_size: int = 100) -> SyncResult:
+        """
+        Copy the logs newer than the high water mark, then refresh the rows still marked as running
+
+        Params
+        -----
+        client: a `PyGoCron` object
+        page_size: page size of the `api/task/log` requests
+        """
+        high_water_mark = self.high_water_mark
+        newest, inserted, batch = high_water_mark, 0, []
+        for record in client.iter_task_logs(page_size=page_size):  # newest first
+            if record["id"] <= high_water_mark:
+                break
+            newest = max(newest, record["id"])
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                inserted += len(batch)
+                batch = []
+        self._write(batch)
+        inserted += len(batch)
+
+        updated = self._refresh_running(client, high_water_mark, page_size)
+        # only move the mark after a complete walk, so an interrupted sync is simply redone
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('high_water_mark', ?)",
+                (newest,),
+            )
+        return SyncResult(inserted, updated, newest)
+
+    def _refresh_running(self, client, high_water_mark: int, page_size: int) -> int:
+        stale = self._conn.execute(
+            "SELECT id, task_id FROM task_logs WHERE status = ? AND id <= ?",
+            (RunStatus.RUNNING.value, high_water_mark),
+        ).fetchall()
+        if not stale:
+            return 0
+        running = sweep_running_logs(client, page_size)
+        run_ids_by_task = {}
+        for run_id, task_id in stale:
+            if run_id not in running:
+                run_ids_by_task.setdefault(task_id, set()).add(run_id)
+        records = []
+        for task_id, run_ids in run_ids_by_task.items():
+            records.extend(sweep_task_logs(client, task_id, run_ids, page_size).values())
+        for start in range(0, len(records), self.batch_size):
+            self._write(records[start:start + self.batch_size])
+        return len(records)
+
+    def _where(self, task_id, status, since, until):
+        clauses, params = [], []
+        if task_id is not None:
+            clauses.append("task_id = ?")
+            params.append(task_id)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value if isinstance(status, RunStatus) else status)
+        if since is not None:
+            clauses.append("start_time >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("start_time < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_logs(
+        self,
+        task_id: int = None,
+        status: RunStatus = None,
+        since: str = None,
+        until: str = None,
+        limit: int = None,
+        offset: int = 0,
+    ) -> Iterator[dict]:
+        """
+        Yield stored log records(newest first)
+
+        Params
+        -----
+        task_id: task id
+        status: a `RunStatus`, note it is the status of the record itself, unlike the `status` param of `get_task_logs`
+        since: only logs started at or after this time, for instance `2022-11-25` or `2022-11-25T10:00:00`
+        until: only logs started before this time
+        limit: max number of records
+        offset: number of records to skip
+        """
+        where, params = self._where(task_id, status, since, until)
+        sql = f"SELECT * FROM task_logs{where} ORDER BY id DESC LIMIT ? OFFSET ?"
+        cursor = self._conn.execute(sql, params + [-1 if limit is None else limit, offset])
+        for row in cursor:
+            yield dict(row)
+
+    def logs(self, **filters) -> List[dict]:
+        """
+        Same as `iter_logs`, but return a list
+        """
+        return list(self.iter_logs(**filters))
+
+    def count(self, task_id: int = None, status: RunStatus = None, since: str = None, until: str = None) -> int:
+        where, params = self._where(task_id, status, since, until)
+        return self._conn.execute(f"SELECT COUNT(*) FROM task_logs{where}", params).fetchone()[0]
+
+    def summary(self, since: str = None, until: str = None) -> List[dict]:
+        """
+        Per task run counts: `[{"task_id", "name", "runs", "failed", "running", "succeeded", "last_start_time"}, ...]`
+        """
+        where, params = self._where(None, None, since, until)
+        sql = (
+            "SELECT task_id, MAX(name) AS name, COUNT(*) AS runs,"
+            " SUM(status = 0) AS failed, SUM(status = 1) AS running, SUM(status = 2) AS succeeded,"
+            f" MAX(start_time) AS last_start_time FROM task_logs{where} GROUP BY task_id ORDER BY task_id"
+        )
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def get(self, run_id: int) -> Optional[dict]:
+        row = self._conn.execute("SELECT * FROM task_logs WHERE id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
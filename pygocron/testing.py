@@ -0,0 +1,467 @@
+"""
+A local stand-in for the gocron web server, useful for tests and benchmarks.
+
+```python
+from pygocron.testing import FakeGocronServer
+
+with FakeGocronServer() as server:
+    pgc = PyGoCron(server.address, server.username, server.password)
+```
+"""
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):  # `http.server` only has it since python 3.7
+    daemon_threads = True
+
+
+SUCCESS_MESSAGE = "操作成功"
+SAVE_SUCCESS_MESSAGE = "保存成功"
+RUN_MESSAGE = "任务已开始运行, 请到任务日志中查看结果"
+PING_MESSAGE = "连接成功"
+
+_TASK_INT_FIELDS = (
+    "level",
+    "dependency_status",
+    "protocol",
+    "http_method",
+    "timeout",
+    "multi",
+    "notify_status",
+    "notify_type",
+    "retry_times",
+    "retry_interval",
+)
+_TASK_STR_FIELDS = (
+    "name",
+    "spec",
+    "command",
+    "tag",
+    "dependency_task_id",
+    "notify_keyword",
+    "notify_receiver_id",
+    "remark",
+)
+
+
+class FakeGocronState:
+    """
+    In-memory data behind `FakeGocronServer`
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        run_duration: float = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        visibility_delay: float = 0,
+        result_size: int = 0,
+        capacity: int = 0,
+    ):
+        self.username = username
+        self.password = password
+        self.run_duration = run_duration
+        self.latency = latency
+        self.jitter = jitter
+        self.visibility_delay = visibility_delay
+        self.result_size = result_size
+        self.capacity = capacity
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+        self.token = "fake-token"
+        self.logins = 0
+        self.tasks = {}
+        self.logs = {}
+        self.hosts = {1: {"id": 1, "name": "127.0.0.1", "port": 5921, "alias": "local", "remark": ""}}
+        self.unreachable_hosts = set()  # ids of the hosts whose ping fails
+        self.requests = 0
+        self.connections = 0
+        self._next_task_id = 1
+        self._next_log_id = 1
+        self._last_runs = {}  # {task_id: its last run that was not cancelled}
+        self._lock = threading.Lock()
+
+    def expire_token(self):
+        """
+        Invalidate the current `Auth-Token`, as if it expired
+        """
+        self.token = f"fake-token-{self.logins + 1}"
+
+    def delay(self):
+        """
+        Sleep like a request to a remote server would take
+        """
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    def enter(self) -> bool:
+        """
+        Count a request in, `False` when more than `capacity` requests are in flight(the request is rejected)
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.capacity and self.in_flight > self.capacity:
+                self.rejected += 1
+                return False
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _output(self, command):
+        # a successful run replies the command output, repeat the command to get `result_size` bytes
+        if not self.result_size:
+            return ""
+        line = f"{command}\n"
+        return (line * (self.result_size // len(line) + 1))[:self.result_size]
+
+    def _task_record(self, task):
+        record = {k: v for k, v in task.items() if not k.startswith("_")}
+        host = self.hosts.get(task["host_id"], {})
+        record["hosts"] = [
+            {
+                "host_id": task["host_id"],
+                "alias": host.get("alias", ""),
+                "name": host.get("name", ""),
+                "port": host.get("port", 0),
+            }
+        ]
+        return record
+
+    def _hostname(self, host_id):
+        host = self.hosts.get(host_id, {})
+        return f"{host.get('alias', '')} - {host.get('name', '')}:{host.get('port', 0)}"
+
+    def _log_record(self, log):
+        return {k: v for k, v in log.items() if not k.startswith("_")}
+
+    def _finish_runs(self):
+        # finish the runs whose time is up, a finished main task starts its sub tasks(`dependency_task_id`),
+        # unless it failed and the dependency is strong(`dependency_status` 1)
+        now = time.time()
+        due = [log for log in self.logs.values() if log["status"] == 1 and now >= log["_finish_at"]]
+        while due:
+            started = []
+            for log in due:
+                log["status"] = 0 if log["command"].startswith("exit 1") else 2
+                log["end_time"] = time.strftime("%Y-%m-%dT%H:%M:%S+08:00")
+                log["result"] = self._output(log["command"]) if log["status"] == 2 else "exit status 1"
+                log["total_time"] = int(now - log["_started_at"])
+                task = self.tasks.get(log["task_id"])
+                if task is None or task["level"] != 1 or not task["dependency_task_id"]:
+                    continue
+                if log["status"] == 2 or task["dependency_status"] == 2:
+                    for sub_id in task["dependency_task_id"].split(","):
+                        if int(sub_id) in self.tasks:
+                            started.append(self._start_run(self.tasks[int(sub_id)]))
+            due = [log for log in started if now >= log["_finish_at"]]
+
+    def store_task(self, params):
+        with self._lock:
+            task_id = int(params.get("id") or 0)
+            name = params.get("name", "")
+            for other in self.tasks.values():
+                if other["name"] == name and other["id"] != task_id:
+                    return None, "任务名称已存在"
+            if task_id and task_id not in self.tasks:
+                return None, "任务不存在"
+            if not task_id:
+                task_id = self._next_task_id
+                self._next_task_id += 1
+                task = {
+                    "id": task_id,
+                    "status": 1,
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S+08:00"),
+                    "deleted": "",
+                    "next_run_time": "0001-01-01T00:00:00Z",
+                    "_visible_at": time.time() + self.visibility_delay,
+                }
+            else:
+                task = self.tasks[task_id]
+            for field in _TASK_STR_FIELDS:
+                task[field] = params.get(field, "")
+            for field in _TASK_INT_FIELDS:
+                task[field] = int(params.get(field) or 0)
+            task["host_id"] = int(params.get("host_id") or 0)
+            self.tasks[task_id] = task
+            return task_id, None
+
+    def list_tasks(self, params):
+        with self._lock:
+            now = time.time()
+            tasks = sorted(
+                (t for t in self.tasks.values() if t["_visible_at"] <= now), key=lambda t: t["id"], reverse=True
+            )
+            if params.get("id"):
+                tasks = [t for t in tasks if t["id"] == int(params["id"])]
+            if params.get("name"):
+                tasks = [t for t in tasks if params["name"] in t["name"]]
+            if params.get("tag"):
+                tasks = [t for t in tasks if t["tag"] == params["tag"]]
+            for field in ("protocol", "host_id"):
+                if params.get(field):
+                    tasks = [t for t in tasks if t[field] == int(params[field])]
+            if params.get("status") not in (None, ""):
+                tasks = [t for t in tasks if t["status"] == int(params["status"])]
+            return _page(params, [self._task_record(t) for t in tasks])
+
+    def _start_run(self, task):
+        log_id = self._next_log_id
+        self._next_log_id += 1
+        now = time.time()
+        # like gocron, a single instance task(`multi` 2) still running cancels the new run, status 3
+        last = self._last_runs.get(task["id"])
+        cancelled = task["multi"] == 2 and last is not None and last["status"] == 1 and now < last["_finish_at"]
+        log = self.logs[log_id] = {
+            "id": log_id,
+            "task_id": task["id"],
+            "name": task["name"],
+            "spec": task["spec"],
+            "protocol": task["protocol"],
+            "command": task["command"],
+            "timeout": task["timeout"],
+            "retry_times": task["retry_times"],
+            "hostname": self._hostname(task["host_id"]),
+            "start_time": time.strftime("%Y-%m-%dT%H:%M:%S+08:00"),
+            "end_time": time.strftime("%Y-%m-%dT%H:%M:%S+08:00") if cancelled else "",
+            "status": 3 if cancelled else 1,
+            "result": "",
+            "total_time": 0,
+            "_started_at": now,
+            "_finish_at": now if cancelled else now + self.run_duration,
+            "_visible_at": now + self.visibility_delay,
+        }
+        if not cancelled:
+            self._last_runs[task["id"]] = log
+        return log
+
+    def run_task(self, task_id):
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return False
+            self._start_run(task)
+            return True
+
+    def list_logs(self, params):
+        with self._lock:
+            self._finish_runs()
+            now = time.time()
+            logs = sorted(
+                (log for log in self.logs.values() if log["_visible_at"] <= now),
+                key=lambda log: log["id"],
+                reverse=True,
+            )
+            logs = [self._log_record(log) for log in logs]
+            if params.get("task_id"):
+                logs = [log for log in logs if log["task_id"] == int(params["task_id"])]
+            if params.get("protocol"):
+                logs = [log for log in logs if log["protocol"] == int(params["protocol"])]
+            if params.get("status"):  # the query status is the record status plus one
+                logs = [log for log in logs if log["status"] == int(params["status"]) - 1]
+            return _page(params, logs)
+
+    def set_task_status(self, task_id, status):
+        with self._lock:
+            if task_id in self.tasks:
+                self.tasks[task_id]["status"] = status
+
+    def remove_task(self, task_id):
+        with self._lock:
+            self.tasks.pop(task_id, None)
+
+    def store_host(self, params):
+        with self._lock:
+            host_id = max(self.hosts) + 1 if self.hosts else 1
+            self.hosts[host_id] = {
+                "id": host_id,
+                "name": params.get("name", ""),
+                "port": int(params.get("port") or 0),
+                "alias": params.get("alias", ""),
+                "remark": params.get("remark", ""),
+            }
+            return host_id
+
+
+def _page(params, records):
+    page = int(params.get("page") or 1)
+    page_size = int(params.get("page_size") or 20)
+    start = (page - 1) * page_size
+    return {"total": len(records), "data": records[start:start + page_size]}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _reply(self, message, data=None, code=0):
+        body = json.dumps({"code": code, "message": message, "data": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        state = self.server.state
+        state.requests += 1
+        accepted = state.enter()
+        try:
+            state.delay()
+            if accepted:
+                return self._handle(state)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            state.leave()
+
+    def _handle(self, state):
+        parts = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length).decode("utf-8")
+            params.update({k: v[-1] for k, v in parse_qs(body, keep_blank_values=True).items()})
+        path = parts.path.rstrip("/")
+
+        if path == "/api/user/login":
+            if params.get("username") == state.username and params.get("password") == state.password:
+                state.logins += 1
+                return self._reply(SUCCESS_MESSAGE, {"token": state.token, "uid": 1, "username": state.username})
+            return self._reply("用户名或密码错误", code=1)
+        if self.headers.get("Auth-Token") != state.token:
+            return self._reply("认证失败", code=401)
+
+        match = re.fullmatch(r"/api/task/(run|enable|disable|remove)/(\d+)", path)
+        if match:
+            action, task_id = match.group(1), int(match.group(2))
+            if action == "run":
+                if state.run_task(task_id):
+                    return self._reply(RUN_MESSAGE)
+                return self._reply("任务不存在", code=1)
+            if action == "remove":
+                state.remove_task(task_id)
+            else:
+                state.set_task_status(task_id, 1 if action == "enable" else 0)
+            return self._reply(SUCCESS_MESSAGE)
+        match = re.fullmatch(r"/api/host/ping/(\d+)", path)
+        if match:
+            host_id = int(match.group(1))
+            if host_id in state.hosts and host_id not in state.unreachable_hosts:
+                return self._reply(PING_MESSAGE)
+            return self._reply("连接失败", code=1)
+        if path == "/api/task/store":
+            task_id, error = state.store_task(params)
+            if error:
+                return self._reply(error, code=1)
+            return self._reply(SAVE_SUCCESS_MESSAGE)
+        if path == "/api/task":
+            return self._reply(SUCCESS_MESSAGE, state.list_tasks(params))
+        if path == "/api/task/log":
+            return self._reply(SUCCESS_MESSAGE, state.list_logs(params))
+        if path == "/api/host/all":
+            return self._reply(SUCCESS_MESSAGE, list(state.hosts.values()))
+        if path == "/api/host/store":
+            state.store_host(params)
+            return self._reply(SAVE_SUCCESS_MESSAGE)
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class FakeGocronServer:
+    """
+    Run a fake gocron web server in a background thread
+
+    Params
+    -----
+    username: admin user accepted by `/api/user/login`
+    password: admin password accepted by `/api/user/login`
+    run_duration: seconds a triggered run stays in the `running` state
+    latency: seconds every request takes before being handled
+    jitter: a random extra latency between 0 and `jitter` seconds
+    visibility_delay: seconds before a new task or a new run log shows up in the listings,
+        like a gocron behind a lagging database replica
+    result_size: size(chars) of the `result` of successful runs
+    capacity: max number of requests handled at once, the requests above it get a 503, `0` for no limit
+    """
+
+    def __init__(
+        self,
+        username: str = "admin",
+        password: str = "admin",
+        run_duration: float = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        visibility_delay: float = 0,
+        result_size: int = 0,
+        capacity: int = 0,
+    ):
+        self.username = username
+        self.password = password
+        self.state = FakeGocronState(
+            username,
+            password,
+            run_duration=run_duration,
+            latency=latency,
+            jitter=jitter,
+            visibility_delay=visibility_delay,
+            result_size=result_size,
+            capacity=capacity,
+        )
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.state = self.state
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,151 @@
+"""
+Track the status of many task runs with as few `api/task/log` requests as possible.
+
+```python
+tracker = RunTracker(pgc, [(task_id, run_id), ...])
+for update in tracker.watch(interval=1):
+    print(update.task_id, update.run_id, update.status)
+```
+"""
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from pygocron import _api
+from pygocron._api import PyGocronTimeout, RunStatus
+
+RUNNING_LOGS = 2  # the `status` query param of `api/task/log` for running runs
+
+
+class RunUpdate(NamedTuple):
+    """
+    A status transition of one run, `record` is the task log record it was read from
+    """
+
+    task_id: int
+    run_id: int
+    status: RunStatus
+    record: dict
+
+
+def sweep_task_logs(client, task_id: int, run_ids: Set[int], page_size: int = 100) -> Dict[int, dict]:
+    """
+    Page through the logs of one task(newest first) until all `run_ids` are found,
+    or the pages are already older than the oldest wanted run, return `{run_id: record}`
+    """
+    found, page, oldest = {}, 1, min(run_ids)
+    while True:
+        logs = client.get_task_logs(task_id=task_id, page=page, page_size=page_size)
+        for record in logs["data"]:
+            if record["id"] in run_ids:
+                found[record["id"]] = record
+        if (
+            len(found) == len(run_ids)
+            or not logs["data"]
+            or logs["data"][-1]["id"] <= oldest
+            or _api.is_last_page(logs, page, page_size)
+        ):
+            return found
+        page += 1
+
+
+def sweep_running_logs(client, page_size: int = 100) -> Dict[int, dict]:
+    """
+    Fetch the log records of all running runs, return `{run_id: record}`
+    """
+    return {
+        record["id"]: record
+        for record in client.iter_task_logs(status=RUNNING_LOGS, page_size=page_size)
+    }
+
+
+class RunTracker:
+    """
+    Track many `(task_id, run_id)` pairs of a `PyGoCron` client.
+
+    Every `tick` first does one sweep over all running logs(when the runs span more than one task),
+    runs that are not running any more are then looked up by one early-stopping sweep per task.
+    """
+
+    def __init__(self, client, runs: Iterable[Tuple[int, int]] = (), page_size: int = 100):
+        """
+        Params
+        -----
+        client: a `PyGoCron` object
+        runs: `(task_id, run_id)` pairs to track
+        page_size: page size of the `api/task/log` sweeps
+        """
+        self._client = client
+        self._page_size = page_size
+        self._status = {}  # {(task_id, run_id): RunStatus or None if not seen yet}
+        for task_id, run_id in runs:
+            self.add(task_id, run_id)
+
+    def add(self, task_id: int, run_id: int):
+        self._status.setdefault((task_id, run_id), None)
+
+    def discard(self, task_id: int, run_id: int):
+        """
+        Stop tracking a run
+        """
+        self._status.pop((task_id, run_id), None)
+
+    def status(self, task_id: int, run_id: int) -> Optional[RunStatus]:
+        return self._status[(task_id, run_id)]
+
+    @property
+    def pending(self) -> List[Tuple[int, int]]:
+        """
+        Runs not finished yet(never seen or running)
+        """
+        return [
+            run for run, status in self._status.items() if status is None or status in _api.UNFINISHED
+        ]
+
+    def _update(self, run, record, updates):
+        status = _api.run_status(record["status"])
+        if self._status[run] != status:
+            self._status[run] = status
+            updates.append(RunUpdate(run[0], run[1], status, record))
+
+    def tick(self) -> List[RunUpdate]:
+        """
+        Refresh all pending runs, return the status transitions since the last tick
+        """
+        pending = self.pending
+        updates = []
+        if len({task_id for task_id, _ in pending}) > 1:
+            running = sweep_running_logs(self._client, self._page_size)
+            unresolved = []
+            for run in pending:
+                if run[1] in running:
+                    self._update(run, running[run[1]], updates)
+                else:
+                    unresolved.append(run)
+            pending = unresolved
+
+        run_ids_by_task = {}
+        for task_id, run_id in pending:
+            run_ids_by_task.setdefault(task_id, set()).add(run_id)
+        for task_id, run_ids in run_ids_by_task.items():
+            records = sweep_task_logs(self._client, task_id, run_ids, self._page_size)
+            for run_id, record in records.items():
+                self._update((task_id, run_id), record, updates)
+        return updates
+
+    def watch(self, interval: float = 1, timeout: float = None) -> Iterator[RunUpdate]:
+        """
+        Yield status transitions as they happen, until every run is finished
+
+        Params
+        -----
+        interval: seconds between two ticks
+        timeout: max seconds to watch, raise `PyGocronTimeout` when some runs are still pending
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            yield from self.tick()
+            if not self.pending:
+                return
+            if deadline is not None and time.monotonic() + interval > deadline:
+                raise PyGocronTimeout(f"{len(self.pending)} runs are still pending after {timeout} seconds")
+            time.sleep(interval)
@@ -0,0 +1,260 @@
+"""
+Build a workflow of gocron tasks as a DAG, create it wave by wave, and track its runs.
+
+```python
+wf = Workflow(tag="etl")
+wf.task("extract", command="python extract.py", spec="0 0 1 * * *")
+wf.task("load", command="python load.py", after=["extract"])
+wf.task("report", command="python report.py", after=["extract"])
+result = wf.submit(pgc)  # WorkflowResult(task_ids={"extract": 3, ...}, errors={})
+statuses = wf.run(pgc).wait(timeout=600)  # {"extract": RunStatus.SUCCESS, "load": ..., "report": ...}
+```
+
+gocron runs dependencies as main tasks(`level` 1) starting their sub tasks(`level` 2,
+listed in the `dependency_task_id` of the main task) when they finish, so a workflow has
+two levels: a task with `after` is a sub task, and can't be the `after` of another task.
+A sub task can be shared by several main tasks. The `dependency_status` of a main task
+decides whether its sub tasks also run when it fails(2, weak) or not(1, strong, the default).
+"""
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from pygocron import _api
+from pygocron._api import PyGocronException, PyGocronTimeout, RunStatus
+from pygocron._concurrent import map_settled
+from pygocron.polling import backoff_delays
+
+MAIN = 1
+SUB = 2
+STRONG = 1
+WEAK = 2
+
+
+class WorkflowResult(NamedTuple):
+    """
+    task_ids: `{name: task_id}` of the tasks created
+    errors: `{name: error}` of the tasks that could not be created
+    """
+
+    task_ids: Dict[str, int]
+    errors: Dict[str, Exception]
+
+
+class Workflow:
+    """
+    A DAG of task specs
+
+    Params
+    -----
+    tag: default tag of the tasks
+    """
+
+    def __init__(self, tag: str = ""):
+        self.tag = tag
+        self.task_ids: Dict[str, int] = {}  # filled by `submit`
+        self._specs: Dict[str, dict] = {}
+        self._parents: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self._specs)
+
+    def task(self, name: str, command: str, spec: str = "", after: Iterable[str] = (), **kwargs) -> str:
+        """
+        Add a task, return its name
+
+        Params
+        -----
+        name: task name
+        command: task command
+        spec: cron spec, required by the tasks without `after`
+        after: names of the main tasks this task runs after, it makes the task a sub task,
+            which allows several instances(`multi=1`) when it has several main tasks
+        kwargs: other params of `create_task`, for instance `dependency_status=2` or `host_id=2`
+        """
+        if name in self._specs:
+            raise PyGocronException(f"Duplicated task name `{name}` in workflow")
+        after = list(after)
+        if len(after) > 1:  # its main tasks may start it at once, a single instance task would cancel a run
+            kwargs.setdefault("multi", 1)
+        self._specs[name] = dict(kwargs, name=name, command=command, spec=spec, tag=kwargs.get("tag", self.tag))
+        self._parents[name] = after
+        return name
+
+    def children(self, name: str) -> List[str]:
+        return [child for child, parents in self._parents.items() if name in parents]
+
+    def waves(self) -> List[List[str]]:
+        """
+        Task names grouped in creation order: a task comes after all the tasks it depends on(its sub tasks)
+        """
+        self.validate()
+        pending = {name: set(self.children(name)) for name in self._specs}
+        waves = []
+        while pending:
+            wave = [name for name, children in pending.items() if not children]
+            if not wave:
+                raise PyGocronException(f"Workflow has a cycle between {sorted(pending)}")
+            waves.append(wave)
+            for name in wave:
+                del pending[name]
+            for children in pending.values():
+                children.difference_update(wave)
+        return waves
+
+    def validate(self):
+        """
+        Raise `PyGocronException` if gocron can't run the workflow
+        """
+        for name, parents in self._parents.items():
+            for parent in parents:
+                if parent not in self._specs:
+                    raise PyGocronException(f"`{name}` runs after unknown task `{parent}`")
+                if self._parents[parent]:
+                    raise PyGocronException(
+                        f"`{name}` can't run after `{parent}`, which is a sub task itself: "
+                        "gocron only runs sub tasks of main tasks"
+                    )
+            if not parents and not self._specs[name]["spec"]:
+                raise PyGocronException(f"Main task `{name}` needs a `spec`")
+
+    def submit(self, client, max_workers: int = 10, wait: float = 10) -> WorkflowResult:
+        """
+        Create the tasks wave by wave, the tasks of a wave are created concurrently by `create_tasks`
+        (their ids are resolved in bulk), so every main task is created with the ids of its sub tasks.
+        A main task is not created when one of its sub tasks failed.
+
+        Params
+        -----
+        client: a `PyGoCron` object
+        max_workers: max number of concurrent requests
+        wait: max seconds to wait for the new tasks to show up
+        """
+        errors = {}
+        for wave in self.waves():
+            specs = []
+            for name in wave:
+                spec = dict(self._specs[name])
+                children = self.children(name)
+                failed = [child for child in children if child not in self.task_ids]
+                if failed:
+                    errors[name] = PyGocronException(f"Sub tasks of `{name}` were not created: {failed}")
+                    continue
+                spec["level"] = SUB if self._parents[name] else MAIN
+                if children:
+                    spec["dependency_task_id"] = ",".join(str(self.task_ids[child]) for child in children)
+                    spec.setdefault("dependency_status", STRONG)
+                specs.append(spec)
+            for result in client.create_tasks(specs, max_workers=max_workers, wait=wait):
+                if result.error is None:
+                    self.task_ids[result.name] = result.task_id
+                else:
+                    errors[result.name] = result.error
+        return WorkflowResult(dict(self.task_ids), errors)
+
+    def run(self, client, max_workers: int = 10) -> "WorkflowRun":
+        """
+        Trigger all main tasks now, gocron then starts their sub tasks, return a `WorkflowRun` to track them.
+        Tasks not created by `submit` are looked up by name.
+
+        Params
+        -----
+        client: a `PyGoCron` object
+        max_workers: max number of concurrent trigger requests
+        """
+        for name in self._specs:
+            if name not in self.task_ids:
+                self.task_ids[name] = client.get_task_id_by_name(name)
+        return WorkflowRun(self, client, max_workers)
+
+
+class WorkflowRun:
+    """
+    One run of a whole workflow, created by `Workflow.run`
+    """
+
+    def __init__(self, workflow: Workflow, client, max_workers: int = 10):
+        self.workflow = workflow
+        self._client = client
+        self._names = {task_id: name for name, task_id in workflow.task_ids.items()}
+        self._runs: Dict[str, Dict[int, RunStatus]] = {name: {} for name in workflow.task_ids}
+        # every log newer than this belongs to this run(or to a concurrent run of the same tasks)
+        self._after_id = _api.latest_run_id(client.get_task_logs(page_size=1)) or 0
+        mains = [name for name, parents in workflow._parents.items() if not parents]
+        settled = map_settled(
+            lambda name: client._call(_api.run_task(workflow.task_ids[name])), mains, max_workers
+        )
+        errors = {name: error for name, (_, error) in zip(mains, settled) if error is not None}
+        if errors:
+            raise PyGocronException(f"Can not trigger main tasks: {errors}")
+
+    def _refresh(self):
+        for record in self._client.iter_task_logs(page_size=_api.LIST_PAGE_SIZE, prefetch=False):
+            if record["id"] <= self._after_id:
+                break
+            name = self._names.get(record["task_id"])
+            if name is not None:
+                self._runs[name][record["id"]] = _api.run_status(record["status"])
+
+    def _expected_runs(self, name: str, statuses: Dict[str, Optional[RunStatus]]) -> Optional[int]:
+        parents = self.workflow._parents[name]
+        if not parents:
+            return 1
+        expected = 0
+        for parent in parents:
+            status = statuses[parent]
+            if status is None or status is RunStatus.RUNNING:
+                return None  # still unknown
+            weak = self.workflow._specs[parent].get("dependency_status") == WEAK
+            if status is RunStatus.SUCCESS or weak and status is RunStatus.FAILED:  # a cancelled run starts nothing
+                expected += 1
+        return expected
+
+    def status(self, refresh: bool = True) -> Dict[str, Optional[RunStatus]]:
+        """
+        `{name: status}` of every task: `None` while not started yet(or skipped because a main task failed),
+        `RunStatus.RUNNING` while some of its runs are not finished, `RunStatus.FAILED` if any of its runs failed,
+        `RunStatus.CANCELLED` if gocron skipped one because the task was still running
+        """
+        if refresh:
+            self._refresh()
+        statuses = {}
+        for name, runs in self._runs.items():
+            if not runs:
+                statuses[name] = None
+            elif any(status in _api.UNFINISHED for status in runs.values()):
+                statuses[name] = RunStatus.RUNNING
+            elif RunStatus.FAILED in runs.values():
+                statuses[name] = RunStatus.FAILED
+            elif RunStatus.CANCELLED in runs.values():
+                statuses[name] = RunStatus.CANCELLED
+            else:
+                statuses[name] = RunStatus.SUCCESS
+        return statuses
+
+    def finished(self, statuses: Dict[str, Optional[RunStatus]]) -> bool:
+        for name, status in statuses.items():
+            if status is RunStatus.RUNNING:
+                return False
+            expected = self._expected_runs(name, statuses)
+            if expected is None or len(self._runs[name]) < expected:
+                return False
+        return True
+
+    def wait(self, timeout: float = None, max_interval: float = 2) -> Dict[str, Optional[RunStatus]]:
+        """
+        Poll until every task finished(or was skipped), return the final `status()`,
+        every poll is one walk over the logs created since the run started
+
+        Params
+        -----
+        timeout: max seconds to wait, raise `PyGocronTimeout` when the workflow is still running
+        max_interval: longest seconds between two polls
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for delay in backoff_delays(max_delay=max_interval):
+            statuses = self.status()
+            if self.finished(statuses):
+                return statuses
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise PyGocronTimeout(f"Workflow still running after {timeout} seconds: {statuses}")
+            time.sleep(delay)
@@ -14,6 +14,11 @@ requirements = [
     "requests",
 ]
 
+extras_requirements = {
+    "async": ["aiohttp"],
+    "fast": ["orjson"],
+}
+
 test_requirements = []
 
 setup(
@@ -32,6 +37,12 @@ setup(
     ],
     description="python sdk for gocron",
     install_requires=requirements,
+    extras_require=extras_requirements,
+    entry_points={
+        "console_scripts": [
+            "pygocron=pygocron.cli:main",
+        ],
+    },
     license="MIT license",
     # long_description=readme + "\n\n" + history,
     include_package_data=True,
@@ -1,8 +0,0 @@
-from pygocron.pygocron import PyGoCron
-
-
-pgc = PyGoCron()
-
-
-
-pgc.add_new_node()
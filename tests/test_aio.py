@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.aio` module."""
+
+
+import asyncio
+import unittest
+
+from pygocron import _api
+from pygocron._api import PyGocronException, RunStatus
+from pygocron.aio import AsyncPyGoCron
+from pygocron.testing import FakeGocronServer
+
+
+class TestAsyncPyGoCron(unittest.TestCase):
+    """Tests for `AsyncPyGoCron`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _client(self):
+        return AsyncPyGoCron(
+            self.server.address, self.server.username, self.server.password
+        )
+
+    def test_task_lifecycle(self):
+        async def scenario():
+            async with self._client() as pgc:
+                task_id = await pgc.create_task(name="job", spec="* * * * * *", command="echo 1")
+                await pgc.disable_task(task_id)
+                tasks = await pgc.get_tasks(task_id=task_id)
+                self.assertEqual(tasks["data"][0]["status"], 0)
+                run_id = await pgc.run_task(task_id)
+                self.assertEqual(await pgc.check_run_status(task_id, run_id), RunStatus.SUCCESS)
+                await pgc.delete_task(task_id)
+                self.assertEqual((await pgc.get_tasks())["total"], 0)
+
+        asyncio.run(scenario())
+
+    def test_concurrent_calls_share_pool(self):
+        async def scenario():
+            async with self._client() as pgc:
+                await asyncio.gather(*(pgc.get_nodes() for _ in range(20)))
+
+        asyncio.run(scenario())
+        self.assertLessEqual(self.server.state.connections, 10)
+
+    def test_failed_call_raises(self):
+        async def scenario():
+            async with self._client() as pgc:
+                await pgc.check_node(404)
+
+        with self.assertRaises(PyGocronException):
+            asyncio.run(scenario())
+
+    def test_run_triggers_are_not_retried(self):
+        self.server.state.latency = 0.2
+
+        async def scenario():
+            async with AsyncPyGoCron(
+                self.server.address, self.server.username, self.server.password, backoff_factor=0
+            ) as pgc:
+                task_id = await pgc.create_task(name="job", spec="* * * * * *", command="echo 1")
+                self.server.state.capacity = 1
+                slow = asyncio.ensure_future(pgc.get_nodes())
+                await asyncio.sleep(0.1)
+                with self.assertRaises(PyGocronException):
+                    await pgc._call(_api.run_task(task_id))  # rejected with a 503 while `get_nodes` is handled
+                await slow
+
+        asyncio.run(scenario())
+        self.assertEqual(self.server.state.rejected, 1)
+
+    def test_create_tasks(self):
+        specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1"} for i in range(10)]
+        specs.append({"name": "job-0", "spec": "0 0 0 * * *", "command": "echo 1"})
+
+        async def scenario():
+            async with self._client() as pgc:
+                return await pgc.create_tasks(specs, limit=4)
+
+        results = asyncio.run(scenario())
+        self.assertEqual([r.name for r in results], [s["name"] for s in specs])
+        failed = [r for r in results if r.error is not None]
+        self.assertEqual([r.name for r in failed], ["job-0"])
+        self.assertIsInstance(failed[0].error, PyGocronException)
+        self.assertEqual(len({r.task_id for r in results if r.error is None}), 10)
+
+    def test_delete_task_by_tag(self):
+        for i in range(_api.LIST_PAGE_SIZE + 5):  # more than one page
+            self.server.state.store_task({"name": f"job-{i}", "tag": "t"})
+        self.server.state.store_task({"name": "other", "tag": "u"})
+
+        async def scenario():
+            async with self._client() as pgc:
+                return await pgc.delete_task_by_tag("t", limit=4)
+
+        summary = asyncio.run(scenario())
+        self.assertEqual((len(summary.succeeded), summary.failed), (_api.LIST_PAGE_SIZE + 5, {}))
+        self.assertEqual([task["name"] for task in self.server.state.tasks.values()], ["other"])
+
+    def test_expired_token_is_refreshed_once(self):
+        async def scenario():
+            async with self._client() as pgc:
+                await pgc.get_nodes()
+                self.server.state.expire_token()
+                await asyncio.gather(*(pgc.get_nodes() for _ in range(10)))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.server.state.logins, 2)
+
+    def test_metrics(self):
+        async def scenario():
+            async with AsyncPyGoCron(
+                self.server.address, self.server.username, self.server.password, metrics=True
+            ) as pgc:
+                await asyncio.gather(*(pgc.get_nodes() for _ in range(5)))
+                return pgc.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["endpoints"]["GET /api/host/all"]["count"], 5)
+        self.assertEqual(stats["errors"], {})
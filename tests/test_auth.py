@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.auth` module and the authentication of `PyGoCron`."""
+
+
+import os
+import tempfile
+import unittest
+
+from pygocron.auth import TokenCache
+from pygocron.pygocron import PyGoCron, PyGocronException
+from pygocron.testing import FakeGocronServer
+
+
+class TestAuthentication(unittest.TestCase):
+    """Tests for lazy login, token refresh and the token cache."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "tokens.json")
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def client(self, password=None, **kwargs):
+        return PyGoCron(
+            self.server.address,
+            self.server.username,
+            password or self.server.password,
+            **kwargs,
+        )
+
+    def test_login_is_lazy(self):
+        pgc = self.client(password="wrong")
+        self.assertEqual(self.server.state.requests, 0)
+        with self.assertRaises(PyGocronException):
+            pgc.get_nodes()
+
+    def test_expired_token_is_refreshed(self):
+        pgc = self.client()
+        pgc.get_nodes()
+        self.server.state.expire_token()
+        pgc.get_nodes()
+        self.assertEqual(self.server.state.logins, 2)
+
+    def test_processes_share_one_login(self):
+        first = self.client(token_cache=self.cache_path)
+        second = self.client(token_cache=self.cache_path)
+        first.get_nodes()
+        second.get_nodes()
+        self.assertEqual(self.server.state.logins, 1)
+
+        self.server.state.expire_token()
+        first.get_nodes()
+        second.get_nodes()  # picks up the token refreshed by `first`
+        self.assertEqual(self.server.state.logins, 2)
+        self.assertEqual(os.stat(self.cache_path).st_mode & 0o777, 0o600)
+
+    def test_cache_keys(self):
+        cache = TokenCache(self.cache_path)
+        self.assertEqual(cache.fetch("a", lambda: "token-a"), "token-a")
+        self.assertEqual(cache.fetch("a", lambda: "other"), "token-a")
+        self.assertEqual(cache.fetch("a", lambda: "token-b", stale_token="token-a"), "token-b")
+        cache.discard("a")
+        self.assertIsNone(cache.get("a"))
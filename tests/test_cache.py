@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.cache` module."""
+
+
+import time
+import unittest
+
+from pygocron.cache import TaskIndex
+from pygocron.pygocron import PyGoCron
+from pygocron.testing import FakeGocronServer
+
+
+class TestTaskIndex(unittest.TestCase):
+    """Tests for `TaskIndex`."""
+
+    def test_lru_eviction(self):
+        index = TaskIndex(maxsize=2)
+        index.put("a", 1)
+        index.put("b", 2)
+        index.get("a")
+        index.put("c", 3)
+        self.assertEqual(index.get("b"), None)
+        self.assertEqual(index.get("a"), 1)
+        self.assertEqual(index.stats()["hits"], 2)
+        self.assertEqual(index.stats()["misses"], 1)
+
+    def test_ttl(self):
+        index = TaskIndex(ttl=0.05)
+        index.load([{"id": 1, "name": "a", "tag": "t"}])
+        self.assertEqual(index.ids_by_tag("t"), {1})
+        time.sleep(0.1)
+        self.assertTrue(index.stale)
+        self.assertEqual(index.get("a"), None)
+        self.assertEqual(index.ids_by_tag("t"), None)
+
+    def test_eviction_makes_tags_incomplete(self):
+        index = TaskIndex(maxsize=1)
+        index.load([{"id": 1, "name": "a", "tag": "t"}, {"id": 2, "name": "b", "tag": "t"}])
+        self.assertEqual(index.ids_by_tag("t"), None)
+
+
+class TestClientIndex(unittest.TestCase):
+    """Tests for the task index of `PyGoCron`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = PyGoCron(
+            self.server.address,
+            self.server.username,
+            self.server.password,
+            task_index=TaskIndex(),
+        )
+        specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "tag": "t"} for i in range(20)]
+        self.pgc.get_nodes()  # log in
+        self.server.state.requests = 0
+        for spec in specs:
+            self.server.state.store_task(spec)
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_lookups_are_served_from_one_listing(self):
+        ids = [self.pgc.get_task_id_by_name(f"job-{i}") for i in range(20) for _ in range(5)]
+        self.assertEqual(len(set(ids)), 20)
+        self.assertEqual(self.server.state.requests, 1)
+        self.assertEqual(self.pgc.task_index.stats()["hits"], 99)
+        self.assertEqual(self.pgc.get_task_ids_by_tag("t"), set(ids))
+
+    def test_write_through(self):
+        task_id = self.pgc.create_task(name="new", spec="0 0 0 * * *", command="echo 1")
+        self.assertEqual(self.pgc.task_index.peek("new"), task_id)
+        self.pgc.delete_task(task_id)
+        self.assertEqual(self.pgc.task_index.peek("new"), None)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.cli` module."""
+
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from pygocron.cli import main
+from pygocron.testing import FakeGocronServer
+
+
+class TestCli(unittest.TestCase):
+    """Tests for the `pygocron` commands against a fake server."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.stop()
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        base = ["--address", self.server.address, "--user", "admin", "--password", "admin"]
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = main(base + list(argv))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def write(self, name, text):
+        with open(self.path(name), "w", encoding="utf-8") as f:
+            f.write(text)
+        return self.path(name)
+
+    def test_import_export_round_trip(self):
+        rows = ["name,spec,command,tag,enabled"] + [f"job-{i},0 0 0 * * *,echo {i},etl,{i % 2}" for i in range(25)]
+        code, _, stderr = self.cli("--workers", "4", "import", self.write("tasks.csv", "\n".join(rows)), "--batch", "10")
+        self.assertEqual(code, 0, stderr)
+        self.assertIn("25 imported, 0 failed", stderr)
+        tasks = self.server.state.tasks.values()
+        self.assertEqual(sum(task["status"] for task in tasks), 12)
+
+        code, _, _ = self.cli("export", "--tag", "etl", "-o", self.path("out.jsonl"))
+        self.assertEqual(code, 0)
+        with open(self.path("out.jsonl"), encoding="utf-8") as f:
+            specs = [json.loads(line) for line in f]
+        self.assertEqual(len(specs), 25)
+        first = next(spec for spec in specs if spec["name"] == "job-0")
+        self.assertEqual((first["command"], first["host_id"], first["enabled"]), ("echo 0", 1, False))
+
+        code, _, _ = self.cli("export", "--format", "csv", "-o", self.path("out.csv"))
+        self.assertEqual(code, 0)
+        for name in [f"job-{i}" for i in range(25)]:
+            self.assertEqual(self.cli("delete", "--name", name, "--yes")[0], 0)
+        code, _, stderr = self.cli("import", self.path("out.csv"))
+        self.assertEqual(code, 0, stderr)
+        self.assertEqual(sum(task["status"] for task in self.server.state.tasks.values()), 12)
+
+    def test_import_errors(self):
+        lines = [json.dumps({"name": "dup", "spec": "* * * * * *", "command": "echo 1"})] * 2
+        code, _, stderr = self.cli("import", self.write("tasks.jsonl", "\n".join(lines) + "\n"))
+        self.assertEqual(code, 1)
+        self.assertIn("1 imported, 1 failed", stderr)
+
+    def test_run_and_tail(self):
+        self.cli("import", self.write("t.jsonl", "".join(
+            json.dumps({"name": name, "spec": "* * * * * *", "command": command, "tag": "t"}) + "\n"
+            for name, command in (("ok", "echo 1"), ("bad", "exit 1"))
+        )))
+        code, stdout, _ = self.cli("run", "--tag", "t", "--wait", "--timeout", "10")
+        self.assertEqual(code, 1)  # a failed run is a failure
+        runs = sorted(json.loads(line)["status"] for line in stdout.splitlines())
+        self.assertEqual(runs, ["failed", "success"])
+        self.assertEqual(self.cli("run", "--name", "o*")[0], 0)
+
+        code, stdout, _ = self.cli("tail", "-n", "2")
+        self.assertEqual(code, 0)
+        lines = stdout.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("#3  ok", lines[-1])
+        code, stdout, _ = self.cli("tail", "--status", "failed", "--json")
+        self.assertEqual([json.loads(line)["name"] for line in stdout.splitlines()], ["bad"])
+
+    def test_schedule(self):
+        self.cli("import", self.write("t.jsonl", "".join(
+            json.dumps({"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1"}) + "\n" for i in range(3)
+        )))
+        code, stdout, _ = self.cli("schedule", "--top", "1")
+        self.assertEqual(code, 0)
+        self.assertIn("00:00:00  3", stdout)
+        code, stdout, _ = self.cli("schedule", "--suggest", "--max-shift", "10")
+        self.assertEqual(code, 0)
+        suggested = [json.loads(line)["suggested"] for line in stdout.splitlines()]
+        self.assertEqual(len(set(suggested)), 2)  # one task stays, the others spread apart
+
+    def test_delete_needs_selector_and_yes(self):
+        self.cli("import", self.write("t.jsonl", json.dumps({"name": "a", "spec": "* * * * * *", "command": "x"})))
+        self.assertEqual(self.cli("delete", "--yes")[0], 2)
+        code, _, stderr = self.cli("delete", "--name", "a")
+        self.assertEqual(code, 1)
+        self.assertIn("1 tasks would be deleted", stderr)
+        self.assertEqual(len(self.server.state.tasks), 1)
+        self.assertEqual(self.cli("--quiet", "delete", "--name", "a", "--yes"), (0, "", ""))
+        self.assertEqual(len(self.server.state.tasks), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.cluster` module."""
+
+
+import collections
+import unittest
+
+import requests
+
+from pygocron.cluster import HashRing, PyGoCronCluster, ShardedId, _timestamp
+from pygocron.pygocron import PyGoCron, PyGocronException, RunStatus
+from pygocron.testing import FakeGocronServer
+
+
+class TestHashRing(unittest.TestCase):
+    """Tests for `HashRing`."""
+
+    def test_spread_and_stability(self):
+        ring = HashRing(["a", "b", "c"])
+        keys = [f"task-{i}" for i in range(3000)]
+        before = {key: ring.get(key) for key in keys}
+        counts = collections.Counter(before.values())
+        self.assertEqual(set(counts), {"a", "b", "c"})
+        self.assertGreater(min(counts.values()), 500)
+        ring.add("d")
+        moved = [key for key in keys if ring.get(key) != before[key]]
+        self.assertTrue(all(ring.get(key) == "d" for key in moved))
+        self.assertLess(len(moved), 1500)
+        ring.remove("d")
+        self.assertEqual({key: ring.get(key) for key in keys}, before)
+
+
+class TestTimestamp(unittest.TestCase):
+    """Tests for the parsing of gocron times, which must not need python 3.7."""
+
+    def test_formats(self):
+        self.assertEqual(_timestamp("2022-11-25T10:00:00+08:00"), 1669341600)
+        self.assertEqual(_timestamp("2022-11-25T02:00:00Z"), 1669341600)
+        self.assertEqual(_timestamp("2022-11-25T02:00:00.5+00:00"), 1669341600.5)
+        self.assertEqual(_timestamp(""), 0.0)
+        self.assertEqual(_timestamp(None), 0.0)
+
+
+class TestCluster(unittest.TestCase):
+    """Tests for `PyGoCronCluster`."""
+
+    def setUp(self):
+        self.servers = {name: FakeGocronServer().start() for name in ("a", "b", "c")}
+        self.cluster = PyGoCronCluster(
+            {
+                name: PyGoCron(server.address, server.username, server.password)
+                for name, server in self.servers.items()
+            }
+        )
+
+    def tearDown(self):
+        self.cluster.close()
+        for server in self.servers.values():
+            server.stop()
+
+    def test_placement_and_routing(self):
+        specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1"} for i in range(12)]
+        results = self.cluster.create_tasks(specs)
+        self.assertEqual([r.name for r in results], [s["name"] for s in specs])
+        self.assertTrue(all(r.error is None for r in results))
+        for result in results:
+            shard = self.cluster.shard_for(result.name)
+            self.assertEqual(result.task_id.shard, shard)
+            self.assertEqual(self.cluster.get_task_id_by_name(result.name), result.task_id)
+            self.assertIn(result.name, [t["name"] for t in self.cluster.get_tasks(name=result.name)["data"]])
+        self.assertEqual(sum(len(s.state.tasks) for s in self.servers.values()), 12)
+        self.assertGreater(len({r.task_id.shard for r in results}), 1)
+
+        task = self.cluster.create_task("single", "0 0 0 * * *", "echo 1")
+        self.assertIsInstance(task, ShardedId)
+        self.cluster.run_task(task)
+        logs = self.cluster.get_task_logs(task)["data"]
+        self.assertEqual(RunStatus(logs[0]["status"]), RunStatus.SUCCESS)
+        with self.assertRaises(PyGocronException):
+            self.cluster.get_tasks(tag="x")
+
+    def test_merged_listings(self):
+        tasks = [self.cluster.create_task(f"job-{i}", "0 0 0 * * *", "echo 1") for i in range(9)]
+        for task in tasks:
+            self.cluster.run_task(task)
+        listed = list(self.cluster.iter_tasks(page_size=2))
+        self.assertEqual(sorted(t["name"] for t in listed), sorted(f"job-{i}" for i in range(9)))
+        logs = list(self.cluster.iter_task_logs(page_size=2))
+        self.assertEqual(len(logs), 9)
+        self.assertEqual({log["shard"] for log in logs}, {task.shard for task in tasks})
+        starts = [log["start_time"] for log in logs]
+        self.assertEqual(starts, sorted(starts, reverse=True))
+        for shard in self.cluster.shards:
+            ids = [log["id"] for log in logs if log["shard"] == shard]
+            self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_shard_by_tag(self):
+        cluster = PyGoCronCluster(self.cluster.clients, shard_by="tag")
+        first = cluster.create_task("one", "0 0 0 * * *", "echo 1", tag="etl")
+        second = cluster.create_task("two", "0 0 0 * * *", "echo 1", tag="etl")
+        self.assertEqual(first.shard, second.shard)
+        self.assertEqual(cluster.get_task_id_by_name("two"), second)  # fans out without the tag
+        self.assertEqual({t["name"] for t in cluster.iter_tasks(tag="etl")}, {"one", "two"})
+        with self.assertRaises(PyGocronException):
+            cluster.get_task_id_by_name("missing")
+
+    def test_fan_out_with_an_unreachable_shard(self):
+        server = self.servers["a"]
+        dead = PyGoCron("http://127.0.0.1:1", server.username, server.password, max_retries=0)
+        cluster = PyGoCronCluster({"dead": dead, "a": self.cluster.clients["a"]}, shard_by="tag")
+        task_id, _ = server.state.store_task({"name": "job", "tag": "etl"})
+        self.assertEqual(cluster.get_task_id_by_name("job"), ShardedId("a", task_id))
+        with self.assertRaises(requests.ConnectionError):  # not reported as missing, the dead shard may hold it
+            cluster.get_task_id_by_name("missing")
+        dead.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.cronspec` module."""
+
+
+import datetime
+import unittest
+
+from pygocron.cronspec import CronSpec, analyze, parse_duration
+from pygocron.pygocron import PyGoCron
+from pygocron.testing import FakeGocronServer
+
+MONDAY = datetime.datetime(2024, 1, 8)
+
+
+def task(task_id, spec, host_id=1, **fields):
+    return dict({"id": task_id, "spec": spec, "status": 1, "level": 1, "hosts": [{"host_id": host_id}]}, **fields)
+
+
+class TestCronSpec(unittest.TestCase):
+    """Tests for parsing and fire times."""
+
+    def test_fields(self):
+        spec = CronSpec.parse("0 */15 9-17/4 * JAN,jul MON-FRI")
+        self.assertEqual(spec.minutes, 1 << 0 | 1 << 15 | 1 << 30 | 1 << 45)
+        self.assertEqual(spec.hours, 1 << 9 | 1 << 13 | 1 << 17)
+        self.assertEqual(spec.months, 1 << 1 | 1 << 7)
+        self.assertEqual(spec.weekdays, 0b0111110)
+        self.assertEqual(CronSpec.parse("0 0 0 * *").weekdays, 0b1111111)  # 5 fields: any day of week
+        self.assertEqual(CronSpec.parse("5/20 * * * * ?").seconds, 1 << 5 | 1 << 25 | 1 << 45)
+
+    def test_invalid(self):
+        for spec in ("", "* * *", "60 * * * * *", "* * 24 * * *", "* * * 0 * *", "* * * * 13 *",
+                     "* * * * * 7", "*/0 * * * * *", "5-1 * * * * *", "a * * * * *", "@often", "@every 1x"):
+            with self.assertRaises(ValueError, msg=spec):
+                CronSpec.parse(spec)
+
+    def test_next(self):
+        now = datetime.datetime(2024, 1, 5, 17, 58, 3)  # a Friday
+        self.assertEqual(CronSpec.parse("0 */5 9-17 * * MON-FRI").next(now), datetime.datetime(2024, 1, 8, 9))
+        self.assertEqual(CronSpec.parse("@daily").next(now), datetime.datetime(2024, 1, 6))
+        self.assertEqual(CronSpec.parse("30 * * * * *").next(now), datetime.datetime(2024, 1, 5, 17, 58, 30))
+        self.assertIsNone(CronSpec.parse("0 0 0 30 2 *").next(now))
+        # both day fields restricted: the 1st of the month or a Monday
+        self.assertEqual(CronSpec.parse("0 0 0 1 * MON").next(now), MONDAY)
+        self.assertEqual(CronSpec.parse("0 0 0 1 * *").next(now), datetime.datetime(2024, 2, 1))
+
+    def test_fires(self):
+        spec = CronSpec.parse("0 0 */6 * * *")
+        fires = list(spec.fires(MONDAY + datetime.timedelta(hours=1), MONDAY + datetime.timedelta(days=1, hours=1)))
+        self.assertEqual([moment.hour for moment in fires], [6, 12, 18, 0])
+        self.assertEqual(len(list(CronSpec.parse("* * * * * *").offsets(MONDAY, MONDAY + datetime.timedelta(days=2)))),
+                         2 * 86400)
+        self.assertEqual(list(CronSpec.parse("@every 1h30m").offsets(MONDAY, MONDAY + datetime.timedelta(hours=4))),
+                         [0, 5400, 10800])
+        self.assertEqual(parse_duration("1m30s"), 90)
+
+    def test_every_like_robfig(self):
+        self.assertEqual(CronSpec.parse("@every 500ms").every, 1)  # rounded up to one second
+        self.assertEqual(CronSpec.parse("@every 1.9s").every, 1)  # truncated to whole seconds
+        self.assertEqual(CronSpec.parse("@every 3000ms").every, 3)
+        for text, seconds in (("1h2m3s4ms5us6ns", 3723.004005006), ("1\u00b5s", 1e-6), ("1\u03bcs", 1e-6),
+                              ("-1.5h", -5400), ("+.5m", 30), ("0", 0)):
+            self.assertAlmostEqual(parse_duration(text), seconds, msg=text)
+        for text in ("", "1", "1d", "h", "-", "1.2.3s"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_duration(text)
+
+    def test_shifted(self):
+        self.assertEqual(CronSpec.parse("0 0 3 * * *").shifted(75), "15 1 3 * * *")
+        self.assertEqual(CronSpec.parse("10 * * * * *").shifted(5), "15 * * * * *")
+        self.assertEqual(CronSpec.parse("@daily").shifted(1), "1 0 0 * * *")
+        with self.assertRaises(ValueError):
+            CronSpec.parse("*/2 * * * * *").shifted(1)
+        with self.assertRaises(ValueError):
+            CronSpec.parse("0 59 * * * *").shifted(60)
+
+
+class TestAnalyze(unittest.TestCase):
+    """Tests for the density report and the jitter suggestions."""
+
+    def test_report(self):
+        tasks = [task(i, "0 0 0 * * *", host_id=1 + i % 2) for i in range(1, 41)]
+        tasks += [task(41, "0 * * * * *"), task(42, "bad"), task(43, "0 0 0 * * *", status=0), task(44, "", level=2)]
+        report = analyze(tasks, MONDAY)
+        self.assertEqual(report.peaks(1), [(MONDAY, 41)])
+        self.assertEqual(report.peaks(1, host_id=2), [(MONDAY, 20)])
+        self.assertEqual(sum(report.per_second), 40 + 1440)
+        self.assertEqual(report.histogram(3600)[:2], [100, 60])
+        self.assertEqual(list(report.invalid), [42])
+
+        suggestions = report.suggest_jitter(max_shift=60)
+        self.assertEqual(len(suggestions), 40)  # the every-minute task stays, it is the costliest to move
+        self.assertNotIn(41, suggestions)
+        moved = analyze([task(i, suggestions.get(i, t["spec"])) for i, t in enumerate(tasks[:41], 1)], MONDAY)
+        self.assertEqual(moved.peaks(1)[0][1], 1)
+
+    def test_client(self):
+        with FakeGocronServer() as server:
+            with PyGoCron(server.address, server.username, server.password) as pgc:
+                pgc.create_task("a", "0 0 1 * * *", "echo 1")
+                pgc.create_task("b", "0 0 1 * * *", "echo 1")
+                with self.assertRaisesRegex(ValueError, "Invalid spec of task `c`"):
+                    pgc.create_task("c", "0 0 25 * * *", "echo 1")
+                results = pgc.create_tasks([{"name": "d", "spec": "bad", "command": "echo 1"}])
+                self.assertIsInstance(results[0].error, ValueError)
+                report = pgc.analyze_schedule(start=MONDAY)
+                self.assertEqual(report.peaks(), [(MONDAY + datetime.timedelta(hours=1), 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.governor` module."""
+
+
+import time
+import unittest
+
+from pygocron import _api
+from pygocron._concurrent import map_settled
+from pygocron.governor import Governor
+from pygocron.pygocron import PyGoCron, PyGocronException
+from pygocron.testing import FakeGocronServer
+
+
+class TestGovernor(unittest.TestCase):
+    """Tests for the token bucket and the AIMD limit."""
+
+    def test_additive_increase_when_saturated(self):
+        governor = Governor(initial_limit=2, max_limit=3)
+        for _ in range(20):
+            tokens = [governor.acquire() for _ in range(int(governor.limit))]
+            for token in tokens:
+                governor.release(token)
+        self.assertEqual(governor.limit, 3)
+
+    def test_no_increase_when_idle(self):
+        governor = Governor(initial_limit=4)
+        for _ in range(20):
+            governor.release(governor.acquire())
+        self.assertEqual(governor.limit, 4)
+
+    def test_one_cut_per_round_trip(self):
+        governor = Governor(initial_limit=8, backoff=0.5)
+        tokens = [governor.acquire() for _ in range(8)]
+        for token in tokens:
+            governor.release(token, overloaded=True)
+        self.assertEqual(governor.limit, 4)
+        governor.release(governor.acquire(), overloaded=True)
+        self.assertEqual(governor.limit, 2)
+        for _ in range(5):
+            governor.release(governor.acquire(), overloaded=True)
+        self.assertEqual(governor.limit, 1)
+        self.assertEqual(governor.snapshot()["cuts"], 7)
+
+    def test_slow_call_is_congestion(self):
+        governor = Governor(initial_limit=4)
+        governor.release(governor.acquire())
+        token = governor.acquire()
+        time.sleep(0.05)
+        governor.release(token)
+        self.assertLess(governor.limit, 4)
+        self.assertEqual(governor.snapshot()["congested"], 1)
+
+    def test_rate(self):
+        governor = Governor(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(11):
+            governor.release(governor.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        self.assertEqual(governor.snapshot()["throttled"], 10)
+
+
+class TestGovernedClient(unittest.TestCase):
+    """Tests for a `PyGoCron` with a governor against an overloaded server."""
+
+    def test_bulk_under_capacity(self):
+        with FakeGocronServer(latency=0.01) as server:
+            pgc = PyGoCron(server.address, server.username, server.password, governor=True)
+            specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "tag": "t"} for i in range(80)]
+            pgc.create_tasks(specs)
+            server.state.capacity = 6
+            task_ids = sorted(pgc.get_task_ids_by_tag("t"))
+            settled = map_settled(pgc.get_task_logs, task_ids, pgc._workers(None))  # rejected reads are sent again
+            self.assertEqual([error for _, error in settled], [None] * 80)
+            stats = pgc.stats()["governor"]
+            self.assertGreater(stats["cuts"], 0)
+            self.assertLessEqual(stats["limit"], 12)
+            self.assertEqual(stats["in_flight"], 0)
+            self.assertEqual(pgc._get_session().get_adapter(server.address)._pool_maxsize, 64)  # one per thread
+            pgc.close()
+
+    def test_rejected_call_is_sent_max_retries_plus_one_times(self):
+        with FakeGocronServer(capacity=1) as server:
+            governor = Governor(initial_limit=4, min_limit=4)  # never throttled, so the retries are rejected too
+            pgc = PyGoCron(server.address, server.username, server.password, governor=governor, backoff_factor=0)
+            pgc.get_nodes()
+            server.state.in_flight += 1  # as if another client kept the server busy
+            before = server.state.requests
+            with self.assertRaises(PyGocronException):
+                pgc.get_nodes()
+            self.assertEqual(server.state.requests - before, 4)
+            pgc.close()
+
+    def test_rejected_run_trigger_is_sent_once(self):
+        with FakeGocronServer(capacity=1) as server:
+            governor = Governor(initial_limit=4, min_limit=4)
+            pgc = PyGoCron(server.address, server.username, server.password, governor=governor, backoff_factor=0)
+            task_id = pgc.create_task("job", "0 0 0 * * *", "echo 1")
+            server.state.in_flight += 1
+            before = server.state.requests
+            with self.assertRaises(PyGocronException):
+                pgc._call(_api.run_task(task_id))  # a `503` may still have triggered the run
+            self.assertEqual(server.state.requests - before, 1)
+            self.assertEqual(server.state.logs, {})
+            pgc.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.log` module."""
+
+
+import logging
+import logging.handlers
+import unittest
+
+from pygocron import log
+from pygocron.pygocron import LogLevel, PyGoCron, logger_print
+from pygocron.testing import FakeGocronServer
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class _Loud:
+    formatted = 0
+
+    def __str__(self):
+        _Loud.formatted += 1
+        return "loud"
+
+
+class TestLogging(unittest.TestCase):
+    """Tests for the `pygocron` logger."""
+
+    def setUp(self):
+        self.handler = _Collect()
+
+    def tearDown(self):
+        log.unconfigure_logging()
+        log.logger.setLevel(logging.NOTSET)
+
+    def messages(self):
+        return [(record.levelname, record.getMessage()) for record in self.handler.records]
+
+    def test_disabled_level_is_not_formatted(self):
+        log.configure_logging(logging.WARNING, handler=self.handler)
+        _Loud.formatted = 0
+        log.success("created %s", _Loud())
+        log.unconfigure_logging()
+        self.assertEqual(_Loud.formatted, 0)
+        self.assertEqual(self.handler.records, [])
+
+    def test_records_go_through_the_queue(self):
+        listener = log.configure_logging("SUCCESS", handler=self.handler)
+        log.success("created %s", "job")
+        log.logger.info("hidden")
+        log.unconfigure_logging()
+        self.assertIsNone(listener._thread)
+        self.assertEqual(self.messages(), [("SUCCESS", "created job")])
+
+    def test_reconfigure_replaces_the_handler(self):
+        log.configure_logging(handler=_Collect())
+        log.configure_logging(handler=self.handler)
+        self.assertEqual(sum(isinstance(h, logging.handlers.QueueHandler) for h in log.logger.handlers), 1)
+
+    def test_logger_print_compat(self):
+        log.configure_logging(logging.DEBUG, handler=self.handler)
+        logger_print("old style", LogLevel.WARN)
+        log.unconfigure_logging()
+        self.assertEqual(self.messages(), [("WARNING", "old style")])
+
+    def test_client_messages(self):
+        log.configure_logging(handler=self.handler)
+        with FakeGocronServer() as server:
+            with PyGoCron(server.address, server.username, server.password) as pgc:
+                task_id = pgc.create_task("job", "* * * * * *", "echo 1")
+                pgc.disable_task(task_id)
+        log.unconfigure_logging()
+        self.assertEqual(
+            self.messages(),
+            [("SUCCESS", "Task created: `job`"), ("SUCCESS", f"Task disabled: {task_id}")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.logexport` module."""
+
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from pygocron.cli import main
+from pygocron.logexport import chunk_path, in_time_range
+from pygocron.pygocron import PyGoCron, RunStatus
+from pygocron.testing import FakeGocronServer
+
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLogExport(unittest.TestCase):
+    """Tests for `export_task_logs` against a fake server."""
+
+    def setUp(self):
+        self.server = FakeGocronServer(result_size=1000).start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        self.dir = tempfile.TemporaryDirectory()
+        task_id = self.pgc.create_task("job", "0 0 0 * * *", "echo 1")
+        for _ in range(25):
+            self.server.state.run_task(task_id)
+        for log in self.server.state.logs.values():  # one run a day, from 2022-11-01
+            log["start_time"] = f"2022-11-{log['id']:02d}T10:00:00+08:00"
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_helpers(self):
+        records = [{"start_time": f"2022-11-{day:02d}T10:00:00+08:00"} for day in (5, 4, 3, 2, 1)]
+        days = [r["start_time"][8:10] for r in in_time_range(iter(records), since="2022-11-02", until="2022-11-04")]
+        self.assertEqual(days, ["03", "02"])
+        self.assertEqual(chunk_path("out/logs.jsonl.gz", 3), "out/logs-00003.jsonl.gz")
+        self.assertEqual(chunk_path("logs", 1), "logs-00001")
+
+    def test_export(self):
+        export = self.pgc.export_task_logs(self.path("logs.jsonl"), page_size=10)
+        self.assertEqual((export.records, export.files), (25, [self.path("logs.jsonl")]))
+        records = read_lines(self.path("logs.jsonl"))
+        self.assertEqual([r["id"] for r in records], list(range(25, 0, -1)))
+        self.assertEqual(len(records[0]["result"]), 1000)
+
+    def test_range_truncated_gzip_chunks(self):
+        before = self.server.state.requests
+        export = self.pgc.export_task_logs(
+            self.path("logs.jsonl.gz"), since="2022-11-10", until="2022-11-20", result_limit=5,
+            chunk_records=4, page_size=5,
+        )
+        self.assertEqual(export.records, 10)
+        self.assertEqual([os.path.basename(f) for f in export.files], [f"logs-0000{i}.jsonl.gz" for i in (1, 2, 3)])
+        records = [r for path in export.files for r in read_lines(path)]
+        self.assertEqual([r["id"] for r in records], list(range(19, 9, -1)))
+        self.assertEqual({r["result"] for r in records}, {"echo "})
+        self.assertEqual(self.server.state.requests - before, 4)  # the walk stops at the first older page
+        self.assertEqual(sorted(os.listdir(self.dir.name)), [os.path.basename(f) for f in export.files])
+
+    def test_cli(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        argv = ["--address", self.server.address, "--user", "admin", "--password", "admin",
+                "logs", "--no-result", "--status", "success", "--since", "2022-11-21"]
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self.assertEqual(main(argv), 0)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([r["id"] for r in records], [25, 24, 23, 22, 21])
+        self.assertTrue(all(r["result"] is None and r["status"] == RunStatus.SUCCESS.value for r in records))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.metrics` module."""
+
+
+import unittest
+
+from pygocron import _api
+from pygocron.metrics import Histogram, Metrics, endpoint
+from pygocron.pygocron import PyGoCron, PyGocronException
+from pygocron.testing import FakeGocronServer
+
+
+class TestHistogram(unittest.TestCase):
+    """Tests for `Histogram`."""
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for ms in range(1, 101):
+            histogram.add(ms / 1000)
+        self.assertEqual(histogram.count, 100)
+        # buckets are ~19% wide
+        self.assertAlmostEqual(histogram.percentile(50), 0.050, delta=0.050 * 0.2)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.099 * 0.2)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(95), 0.0)
+
+    def test_endpoint_template(self):
+        self.assertEqual(endpoint(_api.run_task(42)), "GET /api/task/run/{id}")
+        self.assertEqual(endpoint(_api.login("a", "b")), "POST /api/user/login")
+
+
+class TestClientMetrics(unittest.TestCase):
+    """Tests for the instrumentation of `PyGoCron`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.metrics = Metrics()
+        self.pgc = PyGoCron(
+            self.server.address, self.server.username, self.server.password, metrics=self.metrics
+        )
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_counts_and_errors(self):
+        for _ in range(3):
+            self.pgc.get_tasks()
+        with self.assertRaises(PyGocronException):
+            self.pgc._call(_api.run_task(404))
+        stats = self.pgc.stats()
+        self.assertEqual(stats["endpoints"]["GET /api/task"]["count"], 3)
+        self.assertEqual(stats["endpoints"]["POST /api/user/login"]["count"], 1)
+        run = stats["endpoints"]["GET /api/task/run/{id}"]
+        self.assertEqual(run["count"], 1)
+        self.assertEqual(run["errors"], {"任务不存在": 1})
+        self.assertEqual(stats["errors"], {"任务不存在": 1})
+        self.assertGreater(stats["endpoints"]["GET /api/task"]["p99"], 0)
+
+    def test_hooks(self):
+        requests, samples = [], []
+        self.metrics.add_request_hook(lambda name, call: requests.append(name))
+        self.metrics.add_response_hook(samples.append)
+        self.metrics.add_response_hook(lambda sample: 1 / 0)  # broken hooks are logged and skipped
+        self.pgc.get_nodes()
+        self.assertEqual(requests, ["POST /api/user/login", "GET /api/host/all"])
+        self.assertEqual([(s.endpoint, s.status_code, s.error) for s in samples][-1], ("GET /api/host/all", 200, None))
+
+    def test_disabled(self):
+        pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        pgc.get_nodes()
+        self.assertIsNone(pgc.metrics)
+        self.assertEqual(pgc.stats(), {})
+        pgc.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
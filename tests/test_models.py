@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.models` module."""
+
+
+import unittest
+
+from pygocron import _api
+from pygocron.models import Node, Task, TaskLog, trim_result
+from pygocron.pygocron import PyGoCron, RunStatus
+from pygocron.testing import FakeGocronServer
+
+
+class TestModels(unittest.TestCase):
+    """Tests for the typed records."""
+
+    def test_round_trip(self):
+        record = {"id": 3, "task_id": 1, "name": "job", "status": 0, "result": "boom", "unknown": 1}
+        log = TaskLog.from_dict(dict(record))
+        self.assertIs(log.status, RunStatus.FAILED)
+        self.assertEqual(log.extra, {"unknown": 1})
+        self.assertEqual({k: v for k, v in log.to_dict().items() if v is not None}, record)
+        self.assertFalse(hasattr(log, "__dict__"))
+
+    def test_trim_result(self):
+        self.assertEqual(trim_result({"result": "abcdef"}, 3), {"result": "abc"})
+        self.assertEqual(trim_result({"result": "abcdef"}, 0), {"result": None})
+        self.assertEqual(trim_result({"result": "abcdef"}, None), {"result": "abcdef"})
+
+    def test_run_status_filter(self):
+        self.assertEqual(_api.list_task_logs(status=RunStatus.RUNNING).params["status"], 2)
+        self.assertEqual(_api.list_task_logs(status=1).params["status"], 1)
+
+    def test_parse_bytes(self):
+        body = '{"code": 0, "message": "操作成功", "data": [1]}'.encode("utf-8")
+        self.assertEqual(_api.parse(_api.list_nodes(), 200, body), [1])
+        with self.assertRaisesRegex(_api.PyGocronException, "认证失败"):
+            _api.parse(_api.list_nodes(), 200, '{"code": 401, "message": "认证失败"}'.encode("utf-8"))
+
+
+class TestTypedClient(unittest.TestCase):
+    """Tests for the `typed` listings of `PyGoCron`."""
+
+    def test_typed_listings(self):
+        with FakeGocronServer(result_size=100) as server:
+            with PyGoCron(server.address, server.username, server.password) as pgc:
+                task_id = pgc.create_task("job", "* * * * * *", "echo 1")
+                pgc.run_task(task_id)
+                pgc.run_task(task_id)
+                tasks = list(pgc.iter_tasks(typed=True))
+                self.assertIsInstance(tasks[0], Task)
+                self.assertTrue(tasks[0].enabled)
+                self.assertEqual(tasks[0].host_ids, [1])
+                logs = list(pgc.iter_task_logs(typed=True, result_limit=10, task_id=task_id))
+                self.assertEqual([log.status for log in logs], [RunStatus.SUCCESS] * 2)
+                self.assertEqual(len(logs[0].result), 10)
+                self.assertEqual(len(list(pgc.iter_task_logs(status=RunStatus.RUNNING))), 0)
+                self.assertEqual(pgc.get_nodes(typed=True)[0], Node(**pgc.get_nodes()[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
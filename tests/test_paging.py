@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.paging` module."""
+
+
+import unittest
+
+from pygocron.paging import iter_pages, iter_records
+from pygocron.pygocron import PyGoCron
+from pygocron.testing import FakeGocronServer
+
+
+def listing(total):
+    requests = []
+
+    def fetch(page, page_size):
+        requests.append((page, page_size))
+        start = (page - 1) * page_size
+        return {"total": total, "data": list(range(start, min(start + page_size, total)))}
+
+    return fetch, requests
+
+
+class TestIterPages(unittest.TestCase):
+    """Tests for `iter_pages`."""
+
+    def test_yields_every_record_once(self):
+        for prefetch in (True, False):
+            fetch, _ = listing(1234)
+            self.assertEqual(list(iter_records(fetch, page_size=10, prefetch=prefetch)), list(range(1234)))
+
+    def test_page_size_grows_on_fast_pages(self):
+        fetch, requests = listing(1000)
+        list(iter_records(fetch, page_size=10, max_page_size=80))
+        sizes = [size for _, size in requests]
+        self.assertEqual(sizes[0], 10)
+        self.assertEqual(max(sizes), 80)
+        self.assertEqual(sizes, sorted(sizes))
+
+    def test_prefetch_stays_one_page_ahead(self):
+        fetch, requests = listing(100)
+        pages = iter_pages(fetch, page_size=10, max_page_size=10)
+        next(pages)
+        next(pages)
+        self.assertLessEqual(len(requests), 3)
+        pages.close()
+
+
+class TestClientIterators(unittest.TestCase):
+    """Tests for `PyGoCron.iter_tasks` and `PyGoCron.iter_task_logs`."""
+
+    def test_iter_tasks_and_logs(self):
+        with FakeGocronServer() as server:
+            with PyGoCron(server.address, server.username, server.password) as pgc:
+                specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "tag": "t"} for i in range(120)]
+                results = pgc.create_tasks(specs)
+                self.assertEqual(len({t["id"] for t in pgc.iter_tasks(page_size=7, tag="t")}), 120)
+                for result in results[:30]:
+                    server.state.run_task(result.task_id)
+                logs = list(pgc.iter_task_logs(page_size=4))
+                self.assertEqual(len(logs), 30)
+                self.assertEqual([log["id"] for log in logs], sorted((log["id"] for log in logs), reverse=True))
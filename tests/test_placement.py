@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.placement` module."""
+
+
+import collections
+import unittest
+
+from pygocron.placement import AUTO_HOST, HostPlacement, host_loads
+from pygocron.pygocron import PyGoCron, PyGocronException
+from pygocron.testing import FakeGocronServer
+
+
+class TestPlacement(unittest.TestCase):
+    """Tests for the load computation and the picks."""
+
+    def test_host_loads(self):
+        nodes = [{"id": 1, "name": "10.0.0.1", "port": 5921}, {"id": 2, "name": "10.0.0.2", "port": 5921}]
+        tasks = [{"hosts": [{"host_id": 1}]}, {"hosts": [{"host_id": 1}, {"host_id": 2}]}, {"hosts": [{"host_id": 9}]}]
+        logs = [{"hostname": "b - 10.0.0.2:5921"}, {"hostname": "10.0.0.2:5921"}, {"hostname": "gone:1"}]
+        self.assertEqual(host_loads(nodes, tasks, logs, running_weight=0.5), {1: 2, 2: 2})
+
+    def test_host_loads_match_exact_addresses(self):
+        nodes = [{"id": 1, "name": "10.0.0.1", "port": 80}, {"id": 2, "name": "0.0.0.1", "port": 5921}]
+        logs = [{"hostname": "a - 10.0.0.1:8080"}, {"hostname": "10.0.0.1:5921"}, {"hostname": "a - 10.0.0.1:80"}]
+        self.assertEqual(host_loads(nodes, [], logs), {1: 1, 2: 0})
+
+    def test_pick_spreads(self):
+        placement = HostPlacement({1: 3, 2: 0, 3: 1})
+        picks = [placement.pick() for _ in range(6)]
+        self.assertEqual(picks, [2, 2, 3, 2, 3, 1])
+        self.assertEqual(placement.loads, {1: 4, 2: 3, 3: 3})
+        with self.assertRaises(PyGocronException):
+            HostPlacement({}).pick()
+
+
+class TestNodes(unittest.TestCase):
+    """Tests for `check_nodes` and the `host_id` placement of `PyGoCron`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        for i in (2, 3):
+            self.pgc.add_new_node(f"10.0.0.{i}", 5921, f"node-{i}", "")
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_check_nodes(self):
+        self.server.state.unreachable_hosts.add(3)
+        health = self.pgc.check_nodes(timeout=2)
+        self.assertEqual({node_id: node.healthy for node_id, node in health.items()}, {1: True, 2: True, 3: False})
+        self.assertEqual(health[2].alias, "node-2")
+        self.assertIn("Can not connect to node", health[3].error)
+
+    def test_ping_timeout_bounds_each_node(self):
+        self.pgc.get_nodes()
+        self.server.state.latency = 0.5
+        before = self.server.state.requests
+        health = self.pgc._ping_nodes([{"id": i} for i in (1, 2, 3)], timeout=0.2, max_workers=3)
+        self.assertFalse(any(node.healthy for node in health.values()))
+        self.assertLess(max(node.latency for node in health.values()), 0.45)
+        self.server.state.latency = 0
+        self.pgc.get_nodes()  # waits for the pings still being handled
+        self.assertEqual(self.server.state.requests - before, 3 + 1)  # one ping per node, never retried
+
+    def test_auto_host(self):
+        self.pgc.create_task("busy", "0 0 0 * * *", "echo 1", host_id=1)
+        self.server.state.unreachable_hosts.add(3)
+        task_id = self.pgc.create_task("single", "0 0 0 * * *", "echo 1", host_id=AUTO_HOST)
+        self.assertEqual(self.server.state.tasks[task_id]["host_id"], 2)
+        specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "host_id": AUTO_HOST} for i in range(4)]
+        results = self.pgc.create_tasks(specs)
+        hosts = collections.Counter(self.server.state.tasks[r.task_id]["host_id"] for r in results)
+        self.assertEqual(hosts, {1: 2, 2: 2})
+
+    def test_placement_in_specs(self):
+        placement = HostPlacement({2: 0, 3: 1})
+        specs = [{"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "host_id": placement} for i in range(3)]
+        results = self.pgc.create_tasks(specs)
+        self.assertEqual([r.error for r in results], [None] * 3)
+        self.assertEqual(sorted(self.server.state.tasks[r.task_id]["host_id"] for r in results), [2, 2, 3])
+
+    def test_running_runs_count(self):
+        self.server.state.run_duration = 60
+        task_id = self.pgc.create_task("long", "0 0 0 * * *", "sleep", host_id=2)
+        self.pgc.disable_task(task_id)
+        self.pgc.run_task(task_id)
+        placement = self.pgc.host_placement(running_weight=2)
+        self.assertEqual(placement.loads, {1: 0, 2: 2, 3: 0})
+        next_id = self.pgc.create_task("next", "0 0 0 * * *", "echo 1", host_id=placement)
+        self.assertEqual(self.server.state.tasks[next_id]["host_id"], 1)
+        self.assertEqual(placement.loads, {1: 1, 2: 2, 3: 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.polling` module."""
+
+
+import itertools
+import time
+import unittest
+
+from pygocron.pygocron import PyGoCron, PyGocronTimeout
+from pygocron.polling import backoff_delays, wait_until
+from pygocron.testing import FakeGocronServer
+
+
+class TestWaitUntil(unittest.TestCase):
+    """Tests for `wait_until`."""
+
+    def test_backoff_is_capped(self):
+        delays = list(itertools.islice(backoff_delays(0.1, 0.4, 2, jitter=0), 5))
+        self.assertEqual(delays, [0.1, 0.2, 0.4, 0.4, 0.4])
+
+    def test_returns_once_visible(self):
+        calls = iter([None, None, 42])
+        self.assertEqual(wait_until(lambda: next(calls), initial_delay=0.01), 42)
+
+    def test_timeout(self):
+        start = time.monotonic()
+        with self.assertRaises(PyGocronTimeout):
+            wait_until(lambda: None, timeout=0.2, initial_delay=0.01)
+        self.assertLess(time.monotonic() - start, 1)
+
+
+class TestVisibilityLookups(unittest.TestCase):
+    """Tests for the id lookups polling the gocron server."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_run_task_returns_the_new_run(self):
+        start = time.monotonic()
+        task_id = self.pgc.create_task(name="job", spec="0 0 0 * * *", command="echo 1")
+        first = self.pgc.run_task(task_id)
+        second = self.pgc.run_task(task_id)
+        self.assertGreater(second, first)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_missing_task_times_out(self):
+        with self.assertRaises(PyGocronTimeout):
+            self.pgc.get_task_id_lagged("missing", wait=0.2)
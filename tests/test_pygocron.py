@@ -3,9 +3,14 @@
 """Tests for `pygocron` package."""
 
 
+import itertools
+import subprocess
+import sys
+import threading
 import unittest
 
 from pygocron import pygocron
+from pygocron.testing import FakeGocronServer
 
 
 class TestPygocron(unittest.TestCase):
@@ -19,3 +24,208 @@ class TestPygocron(unittest.TestCase):
 
     def test_000_something(self):
         """Test something."""
+
+
+class TestColdStart(unittest.TestCase):
+    """Tests for the cheap import and construction of `PyGoCron`."""
+
+    def test_import_skips_heavy_modules(self):
+        code = (
+            "import sys, pygocron.pygocron;"
+            "print(' '.join(m for m in ('requests', 'rich', 'asyncio', 'concurrent.futures') if m in sys.modules))"
+        )
+        loaded = subprocess.run(
+            [sys.executable, "-c", code], stdout=subprocess.PIPE, universal_newlines=True, check=True
+        ).stdout.split()
+        self.assertEqual(loaded, [])
+
+    def test_construct_does_no_io(self):
+        with FakeGocronServer() as server:
+            pgc = pygocron.PyGoCron(server.address, server.username, server.password)
+            self.assertEqual(server.state.requests, 0)
+            pgc.get_nodes()
+            self.assertEqual(server.state.logins, 1)
+            pgc.close()
+
+
+class TestTransport(unittest.TestCase):
+    """Tests for the pooled http transport of `PyGoCron`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = pygocron.PyGoCron(
+            self.server.address, self.server.username, self.server.password
+        )
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_calls_share_one_connection(self):
+        for _ in range(5):
+            self.pgc.get_tasks()
+        self.pgc.get_nodes()
+        self.pgc.check_node(1)
+        self.assertEqual(self.server.state.connections, 1)
+
+    def test_failed_call_raises(self):
+        with self.assertRaises(pygocron.PyGocronException):
+            self.pgc.check_node(404)
+
+    def test_only_idempotent_calls_are_retried(self):
+        import requests
+
+        task_id = self.pgc.create_task("job", "0 0 0 * * *", "echo 1")
+        self.server.state.latency = 0.3
+        with pygocron.PyGoCron(
+            self.server.address, self.server.username, self.server.password, timeout=0.1, backoff_factor=0
+        ) as pgc:
+            pgc._headers = self.pgc._headers
+            before = self.server.state.requests
+            with self.assertRaises(requests.RequestException):
+                pgc._call(pygocron._api.run_task(task_id))
+            with self.assertRaises(requests.RequestException):
+                pgc.get_nodes()
+        self.server.state.latency = 0
+        self.pgc.get_nodes()  # waits for the requests still being handled
+        self.assertEqual(len(self.server.state.logs), 1)  # the trigger was sent once
+        self.assertEqual(self.server.state.requests - before, 1 + 4 + 1)
+
+
+class TestConcurrentUse(unittest.TestCase):
+    """Tests for sharing one `PyGoCron` between threads."""
+
+    def setUp(self):
+        self.server = FakeGocronServer(latency=0.05).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _hammer(self, pgc, fn, threads=20):
+        barrier = threading.Barrier(threads)
+        results = [None] * threads
+
+        def work(i):
+            barrier.wait()
+            results[i] = fn()
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def _client(self, **kwargs):
+        return pygocron.PyGoCron(self.server.address, self.server.username, self.server.password, **kwargs)
+
+    def test_identical_reads_are_coalesced(self):
+        with self._client() as pgc:
+            results = self._hammer(pgc, pgc.get_nodes)
+        self.assertEqual(self.server.state.logins, 1)
+        self.assertLess(self.server.state.requests, 10)
+        self.assertEqual(pgc._flights.shared, 20 - (self.server.state.requests - 1))
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(len({id(r) for r in results}), 20)  # every caller gets its own copy
+
+    def test_reads_with_other_tokens_are_not_coalesced(self):
+        tokens = itertools.cycle(["stale", "fresh"])
+        with self._client() as pgc:
+            before = self.server.state.requests
+            self._hammer(pgc, lambda: pgc._send(pygocron._api.list_nodes(), {"Auth-Token": next(tokens)}), threads=2)
+        self.assertEqual(self.server.state.requests - before, 2)
+
+    def test_run_triggers_are_not_coalesced(self):
+        with self._client() as pgc:
+            task_id = pgc.create_task("job", "0 0 0 * * *", "echo 1")
+            self._hammer(pgc, lambda: pgc._call(pygocron._api.run_task(task_id)), threads=5)
+        self.assertEqual(len(self.server.state.logs), 5)
+
+    def test_token_refresh_under_load(self):
+        with self._client(coalesce_reads=False) as pgc:
+            pgc.get_nodes()
+            self.server.state.expire_token()
+            self._hammer(pgc, pgc.get_nodes)
+        self.assertEqual(self.server.state.logins, 2)
+
+    def test_without_coalescing(self):
+        with self._client(coalesce_reads=False) as pgc:
+            self._hammer(pgc, pgc.get_nodes)
+        self.assertEqual(self.server.state.requests, 21)
+
+
+class TestBulkCreate(unittest.TestCase):
+    """Tests for `PyGoCron.create_tasks`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = pygocron.PyGoCron(
+            self.server.address, self.server.username, self.server.password
+        )
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_results_in_input_order(self):
+        specs = [
+            {"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "tag": f"tag-{i % 3}"}
+            for i in range(30)
+        ]
+        specs.insert(5, {"name": "job-1", "spec": "0 0 0 * * *", "command": "echo 1"})
+        results = self.pgc.create_tasks(specs, max_workers=5)
+
+        self.assertEqual([r.name for r in results], [s["name"] for s in specs])
+        failed = [r for r in results if r.error is not None]
+        self.assertEqual([r.name for r in failed], ["job-1"])
+        self.assertIsInstance(failed[0].error, pygocron.PyGocronException)
+        ok = [r for r in results if r.error is None]
+        tasks = {t["name"]: t["id"] for t in self.pgc.get_tasks(page_size=100)["data"]}
+        self.assertEqual({r.name: r.task_id for r in ok}, tasks)
+
+    def test_lookups_are_batched(self):
+        specs = [
+            {"name": f"job-{i}", "spec": "0 0 0 * * *", "command": "echo 1", "tag": "bulk"}
+            for i in range(50)
+        ]
+        self.pgc.get_nodes()  # log in
+        before = self.server.state.requests
+        self.pgc.create_tasks(specs)
+        self.assertEqual(self.server.state.requests - before, len(specs) + 1)
+
+
+class TestBulkOperations(unittest.TestCase):
+    """Tests for the selector based bulk operations."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = pygocron.PyGoCron(
+            self.server.address, self.server.username, self.server.password
+        )
+        for i in range(120):
+            self.server.state.store_task({"name": f"etl-{i}", "tag": "etl", "host_id": 1 + i % 2})
+        self.server.state.store_task({"name": "report", "tag": "etl", "host_id": 1})
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_delete_walks_every_page(self):
+        summary = self.pgc.delete_task_by_tag("etl")
+        self.assertEqual(len(summary.succeeded), 121)
+        self.assertEqual(summary.failed, {})
+        self.assertEqual(self.pgc.get_tasks()["total"], 0)
+
+    def test_selectors(self):
+        self.assertEqual(len(self.pgc.select_tasks(name="etl-1*")), 31)
+        self.assertEqual(len(self.pgc.select_tasks(name="etl-1")), 1)
+        summary = self.pgc.disable_tasks(name="etl-*", host_id=2)
+        self.assertEqual(len(summary.succeeded), 60)
+        self.assertEqual(len(self.pgc.select_tasks(status=0)), 60)
+        self.pgc.enable_tasks(status=0)
+        self.assertEqual(self.pgc.select_tasks(status=0), [])
+
+    def test_failures_are_collected(self):
+        summary = self.pgc._bulk(pygocron._api.ping_node, [1, 404], 2)
+        self.assertEqual(summary.succeeded, [1])
+        self.assertIsInstance(summary.failed[404], pygocron.PyGocronException)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.reconcile` module."""
+
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from pygocron.pygocron import PyGoCron
+from pygocron.reconcile import CREATE, DELETE, DISABLE, UPDATE, load_specs
+from pygocron.testing import FakeGocronServer
+
+
+def spec(name, **kwargs):
+    return dict({"name": name, "spec": "0 0 0 * * *", "command": "echo 1", "tag": "etl"}, **kwargs)
+
+
+class TestReconcile(unittest.TestCase):
+    """Tests for `PyGoCron.plan` and `PyGoCron.apply`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        self.pgc.create_tasks([spec("keep"), spec("change"), spec("stop"), spec("gone")])
+        self.pgc.create_tasks([spec("other", tag="misc")])
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def desired(self):
+        return [
+            spec("keep"),
+            spec("change", command="echo 2"),
+            spec("stop", enabled=False),
+            spec("new"),
+            spec("new-disabled", enabled=False),
+        ]
+
+    def test_plan_is_minimal(self):
+        plan = self.pgc.plan(self.desired(), tag="etl", prune=True)
+        actions = {(change.action, change.name) for change in plan}
+        self.assertEqual(
+            actions,
+            {
+                (UPDATE, "change"),
+                (DISABLE, "stop"),
+                (CREATE, "new"),
+                (CREATE, "new-disabled"),
+                (DELETE, "gone"),
+            },
+        )
+        self.assertEqual(plan.of(UPDATE)[0].diff, {"command": ("echo 1", "echo 2")})
+
+    def test_apply_converges(self):
+        results = self.pgc.apply(self.pgc.plan(self.desired(), tag="etl", prune=True))
+        self.assertTrue(all(result.error is None for result in results))
+        self.assertEqual(len(self.pgc.plan(self.desired(), tag="etl", prune=True)), 0)
+        names = {task["name"]: task for task in self.pgc.iter_tasks()}
+        self.assertNotIn("gone", names)
+        self.assertIn("other", names)
+        self.assertEqual(names["new-disabled"]["status"], 0)
+        self.assertEqual(names["change"]["command"], "echo 2")
+
+    def test_dry_run_prints_diff(self):
+        plan = self.pgc.plan(self.desired(), tag="etl")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(self.pgc.apply(plan, dry_run=True), [])
+        self.assertIn("+ create `new`", out.getvalue())
+        self.assertIn("command: 'echo 1' -> 'echo 2'", out.getvalue())
+        self.assertEqual(len(self.pgc.plan(self.desired(), tag="etl")), len(plan))
+
+    def test_load_specs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tasks.jsonl")
+            with open(path, "w") as f:
+                f.write("\n".join(json.dumps(s) for s in self.desired()))
+            self.assertEqual(load_specs(path), self.desired())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.runs` module."""
+
+
+import threading
+import time
+import unittest
+
+from pygocron.pygocron import PyGoCron, PyGocronTimeout, RunStatus
+from pygocron.runs import as_completed, wait_all
+from pygocron.testing import FakeGocronServer
+
+
+class TestRunFutures(unittest.TestCase):
+    """Tests for `run_task_async` and friends."""
+
+    def setUp(self):
+        self.server = FakeGocronServer(run_duration=0.3, visibility_delay=0.1).start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        self.ok = self.pgc.create_task("ok", "0 0 0 * * *", "echo 1", multi=1)  # runs may overlap
+        self.bad = self.pgc.create_task("bad", "0 0 0 * * *", "exit 1")
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_wait_all(self):
+        futures = [self.pgc.run_task_async(task_id) for task_id in (self.ok, self.bad, self.ok)]
+        updates = wait_all(futures, timeout=10)
+        self.assertEqual([u.task_id for u in updates], [self.ok, self.bad, self.ok])
+        self.assertEqual([u.status for u in updates], [RunStatus.SUCCESS, RunStatus.FAILED, RunStatus.SUCCESS])
+        self.assertEqual(len({u.run_id for u in updates}), 3)
+        self.assertEqual([f.run_id() for f in futures], [u.run_id for u in updates])
+
+    def test_concurrent_triggers_get_their_own_run(self):
+        futures = []
+        lock = threading.Lock()
+
+        def trigger():
+            future = self.pgc.run_task_async(self.ok)
+            with lock:
+                futures.append(future)
+
+        threads = [threading.Thread(target=trigger) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        run_ids = [update.run_id for update in wait_all(futures, timeout=10)]
+        self.assertEqual(sorted(run_ids), sorted(self.server.state.logs))
+
+    def test_as_completed(self):
+        slow = self.pgc.create_task("slow", "0 0 0 * * *", "sleep")
+        futures = [self.pgc.run_task_async(self.ok), self.pgc.run_task_async(slow)]
+        self.assertEqual(len(list(as_completed(futures, timeout=10))), 2)
+
+    def test_timeout(self):
+        self.server.state.run_duration = 5
+        future = self.pgc.run_task_async(self.ok)
+        with self.assertRaises(PyGocronTimeout):
+            wait_all([future], timeout=0.2)
+        with self.assertRaises(PyGocronTimeout):
+            next(as_completed([future], timeout=0.2))
+        with self.assertRaises(PyGocronTimeout):
+            future.wait(0.2)
+
+    def test_run_id_timeout_stops_polling(self):
+        self.server.state.visibility_delay = 5
+        future = self.pgc.run_task_async(self.ok)
+        with self.assertRaises(PyGocronTimeout):
+            future.run_id(timeout=0.2)
+        self.assertNotIn(self.ok, self.pgc._run_poller._waiting)
+        self.assertIsInstance(future.exception(0), PyGocronTimeout)
+        with self.assertRaises(PyGocronTimeout):
+            future.run_id(timeout=0)
+
+    def test_cancelled_run_is_final(self):
+        single = self.pgc.create_task("single", "0 0 0 * * *", "echo 1", multi=2)
+        first = self.pgc.run_task_async(single)
+        first.run_id(timeout=10)
+        # a single instance task still running, so gocron cancels the second run
+        update = self.pgc.run_task_async(single).wait(10)
+        self.assertEqual(update.status, RunStatus.CANCELLED)
+        self.assertIs(RunStatus.PENDING, RunStatus.CANCELLED)
+        self.assertEqual(first.wait(10).status, RunStatus.SUCCESS)
+        self.assertEqual(self.pgc._run_poller._tracker.pending, [])
+
+    def test_run_and_wait(self):
+        start = time.monotonic()
+        run_id = self.pgc.run_task(self.ok)  # returns once the run shows up, doesn't wait for it
+        self.assertLess(time.monotonic() - start, 0.3)
+        update = self.pgc.run_and_wait(self.ok, timeout=10)
+        self.assertGreater(update.run_id, run_id)
+        self.assertEqual(update.status, RunStatus.SUCCESS)
+
+    def test_one_poller_thread(self):
+        futures = [self.pgc.run_task_async(task_id) for task_id in (self.ok, self.bad) * 3]
+        pollers = [t for t in threading.enumerate() if t.name == "pygocron-run-poller"]
+        self.assertEqual(len(pollers), 1)
+        wait_all(futures, timeout=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.store` module."""
+
+
+import time
+import unittest
+
+from pygocron.pygocron import PyGoCron, RunStatus
+from pygocron.store import LogStore
+from pygocron.testing import FakeGocronServer
+
+
+class TestLogStore(unittest.TestCase):
+    """Tests for `LogStore`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer().start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        specs = [
+            {"name": "ok", "spec": "0 0 0 * * *", "command": "echo 1"},
+            {"name": "bad", "spec": "0 0 0 * * *", "command": "exit 1"},
+        ]
+        self.ok_id, self.bad_id = [r.task_id for r in self.pgc.create_tasks(specs)]
+        self.store = LogStore(":memory:", batch_size=7)
+
+    def tearDown(self):
+        self.store.close()
+        self.pgc.close()
+        self.server.stop()
+
+    def test_incremental_sync(self):
+        for _ in range(25):
+            self.server.state.run_task(self.ok_id)
+        result = self.store.sync(self.pgc, page_size=10)
+        self.assertEqual((result.inserted, result.updated, result.high_water_mark), (25, 0, 25))
+
+        self.server.state.run_task(self.bad_id)
+        before = self.server.state.requests
+        result = self.store.sync(self.pgc, page_size=10)
+        self.assertEqual(result.inserted, 1)
+        self.assertEqual(self.server.state.requests - before, 1)
+        self.assertEqual(self.store.count(), 26)
+        self.assertEqual(self.store.count(status=RunStatus.FAILED), 1)
+        self.assertEqual(self.store.logs(task_id=self.bad_id)[0]["result"], "exit status 1")
+
+    def test_running_rows_are_refreshed(self):
+        self.server.state.run_duration = 0.2
+        self.server.state.run_task(self.ok_id)
+        self.store.sync(self.pgc)
+        self.assertEqual(self.store.count(status=RunStatus.RUNNING), 1)
+
+        time.sleep(0.3)
+        result = self.store.sync(self.pgc)
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual(self.store.count(status=RunStatus.SUCCESS), 1)
+        summary = self.store.summary()
+        self.assertEqual(summary[0]["succeeded"], 1)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.testing` module."""
+
+
+import time
+import unittest
+
+from pygocron import _api
+from pygocron.pygocron import PyGoCron, RunStatus
+from pygocron.testing import FakeGocronServer
+
+
+class TestFakeGocronServer(unittest.TestCase):
+    """Tests for the knobs of `FakeGocronServer`."""
+
+    def _client(self, server):
+        return PyGoCron(server.address, server.username, server.password)
+
+    def test_latency(self):
+        with FakeGocronServer(latency=0.05) as server, self._client(server) as pgc:
+            pgc.get_nodes()
+            start = time.monotonic()
+            for _ in range(3):
+                pgc.get_nodes()
+            self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_visibility_delay(self):
+        with FakeGocronServer(visibility_delay=0.3) as server, self._client(server) as pgc:
+            task_id = pgc.create_task("job", "* * * * * *", "echo 1")  # waits until the task is listed
+            self.assertEqual(pgc.get_tasks()["data"][0]["id"], task_id)
+            pgc._call(_api.run_task(task_id))  # trigger only, `run_task` would wait for the log
+            self.assertEqual(pgc.get_task_logs(task_id=task_id)["total"], 0)
+            time.sleep(0.35)
+            self.assertEqual(pgc.get_task_logs(task_id=task_id)["total"], 1)
+
+    def test_realistic_payloads(self):
+        with FakeGocronServer(result_size=1000) as server, self._client(server) as pgc:
+            task_id = pgc.create_task("job", "* * * * * *", "echo 1")
+            task = pgc.get_tasks(task_id=task_id)["data"][0]
+            self.assertEqual(task["hosts"][0]["host_id"], 1)
+            self.assertIn("next_run_time", task)
+            self.assertFalse([key for key in task if key.startswith("_")])
+            run_id = pgc.run_task(task_id)
+            self.assertEqual(pgc.check_run_status(task_id, run_id), RunStatus.SUCCESS)
+            log = pgc.get_task_logs(task_id=task_id)["data"][0]
+            self.assertEqual(len(log["result"]), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.tracker` module."""
+
+
+import unittest
+
+from pygocron.pygocron import PyGoCron, RunStatus
+from pygocron.testing import FakeGocronServer
+from pygocron.tracker import RunTracker, sweep_task_logs
+
+
+class TestRunTracker(unittest.TestCase):
+    """Tests for `RunTracker`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer(run_duration=0.3).start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+        specs = [
+            {"name": "ok", "spec": "0 0 0 * * *", "command": "echo 1", "multi": 1},
+            {"name": "bad", "spec": "0 0 0 * * *", "command": "exit 1"},
+        ]
+        self.ok_id, self.bad_id = [r.task_id for r in self.pgc.create_tasks(specs)]
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def test_watch_yields_transitions(self):
+        runs = [(self.ok_id, self.pgc.run_task(self.ok_id)) for _ in range(3)]
+        runs.append((self.bad_id, self.pgc.run_task(self.bad_id)))
+        tracker = RunTracker(self.pgc, runs)
+
+        updates = list(tracker.watch(interval=0.1, timeout=5))
+
+        self.assertEqual(tracker.pending, [])
+        final = {(u.task_id, u.run_id): u.status for u in updates}
+        self.assertEqual(final[runs[-1]], RunStatus.FAILED)
+        self.assertTrue(all(final[run] == RunStatus.SUCCESS for run in runs[:-1]))
+
+    def test_cancelled_run_is_final(self):
+        first = self.pgc.run_task(self.bad_id)
+        cancelled = self.pgc.run_task(self.bad_id)  # `bad` is a single instance task, still running
+        tracker = RunTracker(self.pgc, [(self.bad_id, first), (self.bad_id, cancelled)])
+        final = {u.run_id: u.status for u in tracker.watch(interval=0.1, timeout=5)}
+        self.assertEqual(final, {first: RunStatus.FAILED, cancelled: RunStatus.CANCELLED})
+
+    def test_running_runs_cost_one_sweep(self):
+        runs = [(self.ok_id, self.pgc.run_task(self.ok_id)), (self.bad_id, self.pgc.run_task(self.bad_id))]
+        tracker = RunTracker(self.pgc, runs)
+        before = self.server.state.requests
+        updates = tracker.tick()
+        self.assertEqual(self.server.state.requests - before, 1)
+        self.assertEqual({u.status for u in updates}, {RunStatus.RUNNING})
+
+    def test_sweep_reaches_older_pages(self):
+        self.server.state.run_duration = 0
+        run_ids = [self.pgc.run_task(self.ok_id) for _ in range(5)]
+        records = sweep_task_logs(self.pgc, self.ok_id, {run_ids[0]}, page_size=2)
+        self.assertEqual(list(records), [run_ids[0]])
+        self.assertEqual(self.pgc.check_run_status(self.ok_id, run_ids[0]), RunStatus.SUCCESS)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""Tests for `pygocron.workflow` module."""
+
+
+import unittest
+
+from pygocron.pygocron import PyGoCron, PyGocronException, RunStatus
+from pygocron.testing import FakeGocronServer
+from pygocron.workflow import WEAK, Workflow
+
+
+class TestWorkflow(unittest.TestCase):
+    """Tests for `Workflow`."""
+
+    def setUp(self):
+        self.server = FakeGocronServer(run_duration=0.1).start()
+        self.pgc = PyGoCron(self.server.address, self.server.username, self.server.password)
+
+    def tearDown(self):
+        self.pgc.close()
+        self.server.stop()
+
+    def _etl(self, extract_command="echo extract", **extract_kwargs):
+        wf = Workflow(tag="etl")
+        wf.task("extract", command=extract_command, spec="0 0 1 * * *", **extract_kwargs)
+        wf.task("audit", command="echo audit", spec="0 0 2 * * *")
+        wf.task("load", command="echo load", after=["extract"])
+        wf.task("report", command="echo report", after=["extract", "audit"])
+        return wf
+
+    def test_waves(self):
+        waves = self._etl().waves()
+        self.assertEqual([sorted(wave) for wave in waves], [["load", "report"], ["audit", "extract"]])
+
+    def test_validation(self):
+        wf = Workflow()
+        wf.task("a", command="echo", spec="* * * * * *")
+        wf.task("b", command="echo", after=["a"])
+        wf.task("c", command="echo", after=["b"])
+        with self.assertRaisesRegex(PyGocronException, "sub task"):
+            wf.validate()
+        wf = Workflow()
+        wf.task("a", command="echo", after=["missing"])
+        with self.assertRaisesRegex(PyGocronException, "unknown"):
+            wf.validate()
+        wf = Workflow()
+        wf.task("a", command="echo")
+        with self.assertRaisesRegex(PyGocronException, "spec"):
+            wf.validate()
+
+    def test_submit(self):
+        result = self._etl().submit(self.pgc)
+        self.assertEqual(result.errors, {})
+        tasks = {t["name"]: t for t in self.pgc.iter_tasks(tag="etl")}
+        ids = result.task_ids
+        self.assertEqual(tasks["load"]["level"], 2)
+        self.assertEqual(tasks["extract"]["level"], 1)
+        self.assertEqual(tasks["extract"]["dependency_task_id"], f"{ids['load']},{ids['report']}")
+        self.assertEqual(tasks["audit"]["dependency_task_id"], str(ids["report"]))
+
+    def test_main_is_skipped_when_a_sub_task_fails(self):
+        self.pgc.create_task("load", "", "echo taken")
+        result = self._etl().submit(self.pgc)
+        self.assertEqual(sorted(result.errors), ["extract", "load"])
+        self.assertEqual(sorted(result.task_ids), ["audit", "report"])
+
+    def test_run(self):
+        wf = self._etl()
+        wf.submit(self.pgc)
+        statuses = wf.run(self.pgc).wait(timeout=10)
+        self.assertEqual(set(statuses.values()), {RunStatus.SUCCESS})
+        # `report` runs once after each of its two main tasks
+        report_runs = [log for log in self.server.state.logs.values() if log["name"] == "report"]
+        self.assertEqual(len(report_runs), 2)
+
+    def test_run_with_failed_main(self):
+        wf = self._etl(extract_command="exit 1")
+        wf.submit(self.pgc)
+        statuses = wf.run(self.pgc).wait(timeout=10)
+        self.assertEqual(statuses["extract"], RunStatus.FAILED)
+        self.assertIsNone(statuses["load"])  # strong dependency, skipped
+        self.assertEqual(statuses["report"], RunStatus.SUCCESS)  # still started by `audit`
+
+        wf = Workflow(tag="weak")
+        wf.task("main", command="exit 1", spec="* * * * * *", dependency_status=WEAK)
+        wf.task("sub", command="echo sub", after=["main"])
+        wf.submit(self.pgc)
+        statuses = wf.run(self.pgc).wait(timeout=10)
+        self.assertEqual(statuses, {"main": RunStatus.FAILED, "sub": RunStatus.SUCCESS})
+
+    def test_run_with_cancelled_main(self):
+        wf = self._etl()
+        wf.submit(self.pgc)
+        self.server.state.run_duration = 5
+        self.server.state.run_task(wf.task_ids["extract"])  # still running, so the workflow run is cancelled
+        self.server.state.run_duration = 0.1
+        statuses = wf.run(self.pgc).wait(timeout=10)
+        self.assertEqual(statuses["extract"], RunStatus.CANCELLED)
+        self.assertIsNone(statuses["load"])
+        self.assertEqual((statuses["audit"], statuses["report"]), (RunStatus.SUCCESS, RunStatus.SUCCESS))
+
+
+if __name__ == "__main__":
+    unittest.main()